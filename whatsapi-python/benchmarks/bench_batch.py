@@ -0,0 +1,78 @@
+"""
+Analytics over parsed messages: list of WhatsAppMessage objects vs columnar MessageBatch.
+
+After `pip install -e .`, run from the whatsapi-python directory (MessageBatch uses
+NumPy when installed, the array module otherwise):
+
+    python benchmarks/bench_batch.py [count]
+"""
+
+import sys
+import timeit
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+
+from corpus import generate_corpus
+from whatsapi.models import MessageBatch, MessageType
+from whatsapi.models import batch as batch_module
+from whatsapi.webhook import WebhookHandler
+
+
+def _retained(build):
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    corpus = generate_corpus(count)
+    messages, objects_size = _retained(
+        lambda: [WebhookHandler._build_message(webhook["data"]) for webhook in corpus]
+    )
+    # Release the webhook envelopes; the messages keep their data dicts
+    corpus.clear()
+    batch, batch_size = _retained(lambda: MessageBatch.from_messages(messages, keep_rows=False))
+    since = messages[len(messages) // 4].timestamp
+    until = since + timedelta(hours=1)
+    print(f"{len(messages)} messages, NumPy {'on' if batch_module.numpy is not None else 'off'}")
+    print(f"objects: {objects_size / len(messages):6.0f} B/message (raw payloads not counted)")
+    print(f"batch:   {batch_size / len(messages):6.0f} B/message (chat dictionary included)")
+    
+    cases = {
+        "count by type": (
+            lambda: Counter(message.message_type for message in messages),
+            lambda: batch.count_by("message_type"),
+        ),
+        "count by hour, type": (
+            lambda: Counter(
+                (message.timestamp.replace(minute=0, second=0), message.message_type)
+                for message in messages
+            ),
+            lambda: batch.count_by("hour", "message_type"),
+        ),
+        "filter group images": (
+            lambda: [
+                message for message in messages
+                if message.is_group and message.message_type == MessageType.IMAGE
+                and since <= message.timestamp < until
+            ],
+            lambda: batch.filter(
+                message_type=MessageType.IMAGE, is_group=True, since=since, until=until
+            ),
+        ),
+    }
+    for name, (objects, columns) in cases.items():
+        objects_time = min(timeit.repeat(objects, number=1, repeat=3))
+        columns_time = min(timeit.repeat(columns, number=1, repeat=3))
+        print(
+            f"{name:20} objects {objects_time * 1e3:8.1f} ms   batch {columns_time * 1e3:8.1f} ms"
+            f"   ({objects_time / columns_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
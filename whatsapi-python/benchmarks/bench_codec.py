@@ -0,0 +1,47 @@
+"""
+JSON codec comparison: webhook decoding and request body encoding per installed backend.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_codec.py [count]
+"""
+
+import json
+import sys
+import timeit
+
+from corpus import generate_corpus
+from whatsapi.codec import available_codecs, load_codec
+from whatsapi.webhook import WebhookHandler
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    corpus = generate_corpus(count)
+    bodies = [json.dumps(webhook).encode() for webhook in corpus]
+    payloads = [
+        {"number": f"1555{i:07d}", "text": webhook["data"]["pushName"] + " hello"}
+        for i, webhook in enumerate(corpus)
+    ]
+    print(f"{count} webhooks, {sum(map(len, bodies)) / count:.0f} bytes on average")
+    
+    # Speedups are relative to the standard library
+    baseline = {}
+    names = ["json"] + [name for name in available_codecs() if name != "json"]
+    for name in names:
+        codec = load_codec(name)
+        cases = {
+            "decode": lambda: [codec.loads(body) for body in bodies],
+            "parse_bytes": lambda: [
+                WebhookHandler.parse_bytes(body, codec=codec) for body in bodies
+            ],
+            "encode body": lambda: [codec.dumpb(payload) for payload in payloads],
+        }
+        for case, run in cases.items():
+            per_call = min(timeit.repeat(run, number=1, repeat=5)) / count * 1e6
+            speedup = baseline.setdefault(case, per_call) / per_call
+            print(f"{name:8} {case:12} {per_call:7.2f} us/op  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
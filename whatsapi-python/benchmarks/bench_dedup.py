@@ -0,0 +1,79 @@
+"""
+Footprint and speed of the webhook deduplicators at millions of message IDs.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+    
+    python benchmarks/bench_dedup.py [ids]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from whatsapi.webhook.dedup import Deduplicator, LRUDeduplicator, BloomDeduplicator
+
+
+def _message_ids(count: int, offset: int = 0) -> List[str]:
+    """Evolution-style message IDs"""
+    return [f"3EB0{i + offset:016X}" for i in range(count)]
+
+
+def _footprint(factory: Callable[[], Deduplicator], ids: List[str]) -> int:
+    """Traced bytes held by a deduplicator after seeing ids"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    deduplicator = factory()
+    for message_id in ids:
+        deduplicator.seen(message_id)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+def _speed(factory: Callable[[], Deduplicator], ids: List[str]) -> Tuple[Deduplicator, float]:
+    """Feed ids into a fresh deduplicator untraced, returning (instance, ns per check)"""
+    deduplicator = factory()
+    start = time.perf_counter()
+    for message_id in ids:
+        deduplicator.seen(message_id)
+    return deduplicator, (time.perf_counter() - start) / len(ids) * 1e9
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    ids = _message_ids(count)
+    fresh = _message_ids(100_000, offset=count)
+    # IDs are shared with the caller, so the LRU figure is its own overhead;
+    # add ~70 bytes per ID if the deduplicator is the only one holding them
+    print(f"ids: {count}")
+    
+    lru_bytes = _footprint(lambda: LRUDeduplicator(capacity=count), ids)
+    lru, lru_ns = _speed(lambda: LRUDeduplicator(capacity=count), ids)
+    print(
+        f"LRUDeduplicator(capacity={count}): "
+        f"{lru_bytes / 2**20:8.1f} MiB, {lru_bytes / count:6.1f} B/id, {lru_ns:6.0f} ns/check"
+    )
+    del lru
+    
+    for error_rate in (0.01, 0.001, 0.0001):
+        bloom, bloom_ns = _speed(
+            lambda: BloomDeduplicator(capacity=count, error_rate=error_rate), ids
+        )
+        # Fixed-size bit arrays: no need to trace millions of checks
+        bloom_bytes = bloom.memory_bytes
+        assert all(bloom.seen(message_id) for message_id in ids[-1000:])
+        false_positives = sum(bloom.seen(message_id) for message_id in fresh)
+        print(
+            f"BloomDeduplicator(error_rate={error_rate}): "
+            f"{bloom_bytes / 2**20:8.1f} MiB, {bloom_bytes / count:6.1f} B/id, "
+            f"{bloom_ns:6.0f} ns/check, "
+            f"false positives {false_positives / len(fresh):.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Micro-benchmark: if/elif message type dispatch vs the extractor table.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_dispatch.py
+"""
+
+import random
+import timeit
+from typing import Dict, Any, List, Tuple
+
+from whatsapi.models.message import MessageType
+from whatsapi.webhook.extractors import extract_content, extract_text
+
+
+def _legacy_detect_type(message: Dict[str, Any]) -> MessageType:
+    """Linear type detection as implemented before the extractor table"""
+    if "conversation" in message:
+        return MessageType.TEXT
+    elif "extendedTextMessage" in message:
+        return MessageType.TEXT
+    elif "imageMessage" in message:
+        return MessageType.IMAGE
+    elif "videoMessage" in message:
+        return MessageType.VIDEO
+    elif "audioMessage" in message:
+        return MessageType.AUDIO
+    elif "documentMessage" in message:
+        return MessageType.DOCUMENT
+    elif "stickerMessage" in message:
+        return MessageType.STICKER
+    elif "locationMessage" in message:
+        return MessageType.LOCATION
+    elif "contactMessage" in message:
+        return MessageType.CONTACT
+    return MessageType.UNKNOWN
+
+
+def _legacy_extract(message: Dict[str, Any]) -> Tuple[MessageType, Dict[str, Any]]:
+    """Type detection followed by the old per-type if/elif extraction"""
+    message_type = _legacy_detect_type(message)
+    fields: Dict[str, Any] = {}
+    
+    if message_type == MessageType.TEXT:
+        fields["text"] = extract_text(message)
+        if "extendedTextMessage" in message:
+            context_info = message["extendedTextMessage"].get("contextInfo", {})
+            if context_info:
+                fields["quoted_message_id"] = context_info.get("stanzaId")
+                quoted_msg = context_info.get("quotedMessage", {})
+                if quoted_msg:
+                    fields["quoted_message_text"] = extract_text(quoted_msg)
+    elif message_type in (MessageType.IMAGE, MessageType.VIDEO):
+        key = "imageMessage" if message_type == MessageType.IMAGE else "videoMessage"
+        media = message.get(key, {})
+        fields["media_url"] = media.get("url")
+        fields["media_mime_type"] = media.get("mimetype")
+        fields["media_size"] = media.get("fileLength")
+        fields["caption"] = media.get("caption")
+    elif message_type in (MessageType.AUDIO, MessageType.STICKER):
+        key = "audioMessage" if message_type == MessageType.AUDIO else "stickerMessage"
+        media = message.get(key, {})
+        fields["media_url"] = media.get("url")
+        fields["media_mime_type"] = media.get("mimetype")
+        fields["media_size"] = media.get("fileLength")
+    elif message_type == MessageType.DOCUMENT:
+        media = message.get("documentMessage", {})
+        fields["media_url"] = media.get("url")
+        fields["media_mime_type"] = media.get("mimetype")
+        fields["media_size"] = media.get("fileLength")
+        fields["media_filename"] = media.get("fileName")
+        fields["caption"] = media.get("caption")
+    elif message_type == MessageType.LOCATION:
+        loc = message.get("locationMessage", {})
+        fields["latitude"] = loc.get("degreesLatitude")
+        fields["longitude"] = loc.get("degreesLongitude")
+        fields["location_name"] = loc.get("name")
+        fields["location_address"] = loc.get("address")
+    elif message_type == MessageType.CONTACT:
+        cont = message.get("contactMessage", {})
+        fields["contact_vcard"] = cont.get("vcard")
+        fields["contact_name"] = cont.get("displayName")
+    return message_type, fields
+
+
+def _media(mime: str, **extra: Any) -> Dict[str, Any]:
+    content = {"url": "https://mmg.whatsapp.net/x.enc", "mimetype": mime, "fileLength": 12345}
+    content.update(extra)
+    return content
+
+
+SAMPLES: List[Dict[str, Any]] = [
+    {"conversation": "hello"},
+    {"extendedTextMessage": {"text": "see https://example.com"}},
+    {"extendedTextMessage": {
+        "text": "reply",
+        "contextInfo": {"stanzaId": "Q1", "quotedMessage": {"conversation": "original"}},
+    }},
+    {"imageMessage": _media("image/jpeg", caption="pic")},
+    {"videoMessage": _media("video/mp4", caption="clip")},
+    {"audioMessage": _media("audio/ogg")},
+    {"documentMessage": _media("application/pdf", fileName="a.pdf", caption="doc")},
+    {"stickerMessage": _media("image/webp")},
+    {"locationMessage": {"degreesLatitude": 32.1, "degreesLongitude": 34.8, "name": "TLV"}},
+    {"contactMessage": {"displayName": "Bob", "vcard": "BEGIN:VCARD\nEND:VCARD"}},
+]
+
+
+def build_corpus(size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Build a mixed-type corpus of message objects"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        message = dict(rng.choice(SAMPLES))
+        message["messageContextInfo"] = {"deviceListMetadataVersion": 2}
+        corpus.append(message)
+    return corpus
+
+
+def main() -> None:
+    corpus = build_corpus(10_000)
+    
+    # Both paths must agree before timing them
+    for message in corpus:
+        assert _legacy_extract(message) == extract_content(message), message
+    
+    def run_legacy() -> None:
+        for message in corpus:
+            _legacy_extract(message)
+    
+    def run_table() -> None:
+        for message in corpus:
+            extract_content(message)
+    
+    legacy = min(timeit.repeat(run_legacy, number=5, repeat=5)) / (5 * len(corpus))
+    table = min(timeit.repeat(run_table, number=5, repeat=5)) / (5 * len(corpus))
+    
+    print(f"corpus: {len(corpus)} messages, {len(SAMPLES)} shapes")
+    print(f"if/elif chain:   {legacy * 1e9:8.1f} ns/message")
+    print(f"extractor table: {table * 1e9:8.1f} ns/message")
+    print(f"speedup:         {legacy / table:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
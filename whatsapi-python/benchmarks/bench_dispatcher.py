@@ -0,0 +1,147 @@
+"""
+Per-chat ordered dispatch: sequential vs unordered concurrent vs ChatDispatcher.
+
+The callback simulates I/O (e.g. sending a reply). Sequential handling keeps
+order but is slow; an unordered worker pool is fast but lets messages of one
+chat overtake each other; ChatDispatcher should be both fast and ordered.
+A second pass submits one message for each of many distinct chats and checks
+that no lanes (or their memory) remain afterwards.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_dispatcher.py [messages] [chats] [distinct_chats]
+"""
+
+import asyncio
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+from whatsapi.models import WhatsAppMessage, MessageType, MessageDirection
+from whatsapi.webhook.dispatcher import ChatDispatcher
+
+CONCURRENCY = 64
+LATENCY = 0.002
+
+
+def build_messages(count: int, chats: int, seed: int = 7) -> List[WhatsAppMessage]:
+    """Messages over chats with skewed popularity, numbered per chat"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(chats)]
+    numbers = [f"+97250{index:07d}" for index in range(chats)]
+    sequence: Dict[str, int] = {}
+    timestamp = datetime(2025, 1, 1)
+    messages = []
+    for number in rng.choices(numbers, weights=weights, k=count):
+        sequence[number] = sequence.get(number, -1) + 1
+        messages.append(WhatsAppMessage(
+            message_id=str(sequence[number]),
+            from_number=number,
+            to_number=None,
+            message_type=MessageType.TEXT,
+            direction=MessageDirection.INCOMING,
+            timestamp=timestamp,
+            text="hi",
+        ))
+    return messages
+
+
+class Recorder:
+    """Callback recording handling order per chat"""
+    
+    def __init__(self):
+        self.order: Dict[str, List[int]] = {}
+    
+    async def __call__(self, message: WhatsAppMessage) -> None:
+        await asyncio.sleep(LATENCY * random.random() * 2)
+        self.order.setdefault(message.from_number, []).append(int(message.message_id))
+    
+    def out_of_order(self) -> int:
+        return sum(
+            1 for handled in self.order.values()
+            for previous, current in zip(handled, handled[1:]) if current < previous
+        )
+
+
+async def sequential(messages: List[WhatsAppMessage], recorder: Recorder) -> None:
+    for message in messages:
+        await recorder(message)
+
+
+async def unordered(messages: List[WhatsAppMessage], recorder: Recorder) -> None:
+    queue: "asyncio.Queue[WhatsAppMessage]" = asyncio.Queue()
+    for message in messages:
+        queue.put_nowait(message)
+    
+    async def worker() -> None:
+        while not queue.empty():
+            await recorder(queue.get_nowait())
+    
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+
+
+async def dispatched(messages: List[WhatsAppMessage], recorder: Recorder) -> None:
+    async with ChatDispatcher(recorder, concurrency=CONCURRENCY) as dispatcher:
+        for message in messages:
+            await dispatcher.submit(message)
+
+
+async def distinct_chats(count: int) -> None:
+    """One message per chat for many chats; lanes must not outlive their messages"""
+    messages = build_messages(count, count)
+    
+    async def handle(message: WhatsAppMessage) -> None:
+        await asyncio.sleep(0)
+    
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    dispatcher = ChatDispatcher(handle, concurrency=CONCURRENCY, max_pending=CONCURRENCY * 4)
+    started = time.perf_counter()
+    async with dispatcher:
+        for message in messages:
+            await dispatcher.submit(message)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"\n{count} distinct chats: {count / elapsed:,.0f} messages/s (traced), "
+        f"max lanes {dispatcher.stats.max_lanes}, lanes left {dispatcher.lanes}, "
+        f"memory left {(after - before) / 1024:,.0f} KiB"
+    )
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    chats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    distinct = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+    messages = build_messages(count, chats)
+    print(f"{count} messages over {chats} chats, {LATENCY * 1000:.0f} ms mean callback, "
+          f"concurrency {CONCURRENCY}")
+    # Ordering serializes each chat, so the busiest chat bounds any ordered dispatcher
+    busiest = max(int(message.message_id) for message in messages) + 1
+    print(f"busiest chat has {busiest} messages: ordered dispatch is bounded at "
+          f"{count / (busiest * LATENCY):,.0f} messages/s")
+    
+    for name, run in (
+        ("sequential", sequential),
+        ("unordered pool", unordered),
+        ("ChatDispatcher", dispatched),
+    ):
+        recorder = Recorder()
+        started = time.perf_counter()
+        await run(messages, recorder)
+        elapsed = time.perf_counter() - started
+        print(f"{name:15} {count / elapsed:10,.0f} messages/s  "
+              f"{recorder.out_of_order():6} out of order")
+    
+    await distinct_chats(distinct)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
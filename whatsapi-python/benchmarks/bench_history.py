@@ -0,0 +1,85 @@
+"""
+History-sync floods: one messages.upsert webhook carrying thousands of messages.
+
+Reports parse throughput and the memory used on top of the decoded payload,
+per message, while consuming WebhookHandler.parse_events() without keeping
+the messages. The overhead should stay flat as the burst grows.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_history.py [sizes...]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from corpus import CorpusGenerator
+from whatsapi.codec import get_json_codec
+from whatsapi.webhook import WebhookHandler
+
+
+def history_webhook(count: int, seed: int = 0) -> Dict[str, Any]:
+    """A messages.upsert webhook whose data is a list of count messages"""
+    generator = CorpusGenerator(seed=seed)
+    return {
+        "event": "messages.upsert",
+        "instance": "bench",
+        "data": [generator.webhook()["data"] for _ in range(count)],
+    }
+
+
+def measure(body: bytes, count: int) -> Dict[str, float]:
+    """Decode and parse one body, tracking allocations beyond the decoded payload"""
+    loads = get_json_codec().loads
+    webhook = loads(body)
+    started = time.perf_counter()
+    for _ in WebhookHandler.parse_events(webhook):
+        pass
+    elapsed = time.perf_counter() - started
+    del webhook
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        webhook = loads(body)
+        payload = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        parsed = 0
+        for _ in WebhookHandler.parse_events(webhook):
+            parsed += 1
+        streaming_peak = tracemalloc.get_traced_memory()[1] - payload
+        kept: List[Any] = list(WebhookHandler.parse_events(webhook))
+        retained = tracemalloc.get_traced_memory()[0] - payload
+    finally:
+        tracemalloc.stop()
+    assert parsed == len(kept) == count
+    return {
+        "messages_per_s": count / elapsed,
+        "payload_bytes_per_message": payload / count,
+        "streaming_peak_bytes_per_message": streaming_peak / count,
+        "retained_bytes_per_message": retained / count,
+    }
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    print(f"codec: {get_json_codec().name}")
+    print(f"{'messages':>9} {'msg/s':>10} {'payload B/msg':>14} "
+          f"{'streaming B/msg':>16} {'kept B/msg':>11}")
+    for size in sizes:
+        body = json.dumps(history_webhook(size)).encode()
+        result = measure(body, size)
+        print(
+            f"{size:>9} {result['messages_per_s']:>10,.0f} "
+            f"{result['payload_bytes_per_message']:>14,.0f} "
+            f"{result['streaming_peak_bytes_per_message']:>16,.1f} "
+            f"{result['retained_bytes_per_message']:>11,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
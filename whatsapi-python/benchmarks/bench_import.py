@@ -0,0 +1,83 @@
+"""
+Import time of whatsapi for parse-only and provider workloads, in fresh interpreters.
+
+Exits with status 1 if a parse-only import loads a module it should not
+(aiohttp, asyncio) or exceeds the time budget, so it can guard CI.
+
+Run from the whatsapi-python directory:
+
+    python benchmarks/bench_import.py [runs] [budget_ms]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modules each scenario must not load
+FORBIDDEN = {
+    "parse-only": ["aiohttp", "asyncio"],
+    "provider": [],
+}
+
+SCENARIOS = {
+    "parse-only": "import whatsapi; whatsapi.WebhookHandler; whatsapi.WhatsAppMessage",
+    "provider": "import whatsapi; whatsapi.EvolutionAPIProvider",
+}
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1e3, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(statement: str, runs: int = 10) -> Dict[str, object]:
+    """
+    Time a statement in fresh interpreters.
+    
+    Args:
+        statement: Python statement importing whatsapi
+        runs: Number of interpreters to start
+    
+    Returns:
+        Dict with the median and minimum milliseconds and the modules loaded
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    times: List[float] = []
+    modules: List[str] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(statement=statement)],
+            capture_output=True, text=True, check=True, env=env
+        ).stdout
+        result = json.loads(output)
+        times.append(result["ms"])
+        modules = result["modules"]
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "modules": modules}
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    failures = []
+    for name, statement in SCENARIOS.items():
+        result = measure(statement, runs)
+        print(f"{name:11} median {result['median_ms']:7.1f} ms   min {result['min_ms']:7.1f} ms")
+        loaded = [module for module in FORBIDDEN[name] if module in result["modules"]]
+        if loaded:
+            failures.append(f"{name} imports {', '.join(loaded)}")
+        if budget is not None and name == "parse-only" and result["median_ms"] > budget:
+            failures.append(f"{name} takes {result['median_ms']:.1f} ms, budget {budget:g} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
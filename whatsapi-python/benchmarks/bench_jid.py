@@ -0,0 +1,81 @@
+"""
+Micro-benchmark: split + f-string phone extraction vs cached Jid parsing.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_jid.py [messages] [chats]
+"""
+
+import json
+import random
+import sys
+import timeit
+from collections import Counter
+from typing import Dict, List
+
+from whatsapi.models.jid import Jid
+
+
+def _legacy_extract_phone(jid: str) -> str:
+    """Phone extraction as implemented before Jid"""
+    if not jid:
+        return ""
+    phone = jid.split("@")[0]
+    if not phone.startswith("+"):
+        phone = f"+{phone}"
+    return phone
+
+
+def build_corpus(messages: int, chats: int, seed: int = 7) -> List[str]:
+    """
+    Build remote JIDs as a webhook stream delivers them.
+    
+    Chat popularity is skewed (a few hot chats get most messages) and every
+    JID is a fresh string, as decoded from a separate JSON body.
+    """
+    rng = random.Random(seed)
+    addresses = [
+        f"120363{rng.randrange(10**12):012d}@g.us" if rng.random() < 0.3
+        else f"9725{rng.randrange(10**8):08d}@s.whatsapp.net"
+        for _ in range(chats)
+    ]
+    weights = [1 / (rank + 1) for rank in range(chats)]
+    picks = rng.choices(addresses, weights=weights, k=messages)
+    return [json.loads(json.dumps(address)) for address in picks]
+
+
+def main() -> None:
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    chats = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    corpus = build_corpus(messages, chats)
+    
+    def run_legacy() -> Dict[str, int]:
+        counts: Counter = Counter()
+        for remote_jid in corpus:
+            counts[_legacy_extract_phone(remote_jid)] += 1
+        return counts
+    
+    def run_jid() -> Dict[str, int]:
+        counts: Counter = Counter()
+        for remote_jid in corpus:
+            counts[Jid.parse(remote_jid).jid] += 1
+        return counts
+    
+    run_jid()  # warm the cache, as a long-running process would be
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=5)) / len(corpus)
+    cached = min(timeit.repeat(run_jid, number=1, repeat=5)) / len(corpus)
+    
+    # Distinct string objects behind the keys (kept alive so ids are not reused)
+    legacy_strings = [_legacy_extract_phone(remote_jid) for remote_jid in corpus]
+    cached_strings = [Jid.parse(remote_jid).jid for remote_jid in corpus]
+    legacy_keys = len({id(key) for key in legacy_strings})
+    cached_keys = len({id(key) for key in cached_strings})
+    
+    print(f"corpus: {len(corpus)} messages over {chats} chats")
+    print(f"split + f-string: {legacy * 1e9:8.1f} ns/message  {legacy_keys:>8} key strings")
+    print(f"Jid.parse:        {cached * 1e9:8.1f} ns/message  {cached_keys:>8} key strings")
+    print(f"speedup:          {legacy / cached:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
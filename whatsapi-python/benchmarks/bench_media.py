@@ -0,0 +1,93 @@
+"""
+Peak RSS while streaming media through EvolutionAPIProvider against a local server.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_media.py [megabytes]
+"""
+
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+
+from whatsapi.providers import EvolutionAPIProvider
+
+CHUNK = 1024 * 1024
+
+
+def _peak_rss_mib() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _make_file(path: str, megabytes: int) -> None:
+    """Write a file of random bytes one chunk at a time"""
+    with open(path, "wb") as file:
+        for _ in range(megabytes):
+            file.write(os.urandom(CHUNK))
+
+
+def _app(path: str) -> web.Application:
+    """Stub API that consumes uploads and serves downloads without buffering"""
+    async def send_media(request: web.Request) -> web.Response:
+        received = 0
+        async for chunk in request.content.iter_chunked(CHUNK):
+            received += len(chunk)
+        return web.json_response({"received": received})
+    
+    async def media(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK), b""):
+                await response.write(chunk)
+        return response
+    
+    app = web.Application()
+    app.router.add_post("/message/sendMedia/bench", send_media)
+    app.router.add_get("/media", media)
+    return app
+
+
+async def main() -> None:
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source.bin")
+        target = os.path.join(directory, "target.bin")
+        _make_file(source, megabytes)
+        
+        runner = web.AppRunner(_app(source))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        
+        async with EvolutionAPIProvider(f"http://127.0.0.1:{port}", "key", "bench") as provider:
+            print(f"file: {megabytes} MiB, baseline peak RSS {_peak_rss_mib():.1f} MiB")
+            
+            start = time.perf_counter()
+            result = await provider.send_media_file("+15550000000", source, "document")
+            elapsed = time.perf_counter() - start
+            print(
+                f"send_media_file: {result['received'] / CHUNK:.1f} MiB of JSON in "
+                f"{elapsed:.2f}s, peak RSS {_peak_rss_mib():.1f} MiB"
+            )
+            
+            start = time.perf_counter()
+            written = await provider.download_media(f"http://127.0.0.1:{port}/media", target)
+            elapsed = time.perf_counter() - start
+            print(
+                f"download_media:  {written / CHUNK:.1f} MiB to disk in "
+                f"{elapsed:.2f}s, peak RSS {_peak_rss_mib():.1f} MiB"
+            )
+        
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Memory benchmark: slotted WhatsAppMessage vs the previous __dict__-based class.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_memory.py [count]
+"""
+
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, List
+
+from whatsapi.models.message import WhatsAppMessage, MessageType, MessageDirection
+
+
+def _dict_based_class() -> type:
+    """Rebuild WhatsAppMessage's fields as a plain (__dict__-based) dataclass"""
+    spec = []
+    for f in dataclasses.fields(WhatsAppMessage):
+        if f.default is dataclasses.MISSING:
+            spec.append((f.name, f.type))
+        else:
+            spec.append((f.name, f.type, dataclasses.field(default=f.default)))
+    return dataclasses.make_dataclass("DictWhatsAppMessage", spec)
+
+
+def _measure(factory: Callable[[int], Any], count: int) -> float:
+    """Return the traced bytes allocated per object created by factory"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects: List[Any] = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    legacy_cls = _dict_based_class()
+    timestamp = datetime(2025, 1, 1)
+    # Field values are shared so only the per-message container is measured
+    kwargs = dict(
+        from_number="+972501234567",
+        to_number=None,
+        message_type=MessageType.TEXT,
+        direction=MessageDirection.INCOMING,
+        timestamp=timestamp,
+        text="hello",
+        sender_name="Alice",
+    )
+    ids = [f"3EB0{i:016X}" for i in range(count)]
+    
+    legacy = _measure(lambda i: legacy_cls(message_id=ids[i], **kwargs), count)
+    slotted = _measure(lambda i: WhatsAppMessage(message_id=ids[i], **kwargs), count)
+    
+    print(f"messages:          {count}")
+    print(f"fields:            {len(dataclasses.fields(WhatsAppMessage))}")
+    print(f"__dict__ class:    {legacy:8.1f} bytes/message")
+    print(f"__slots__ class:   {slotted:8.1f} bytes/message")
+    print(f"saving:            {100 * (1 - slotted / legacy):8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
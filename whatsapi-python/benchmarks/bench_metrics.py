@@ -0,0 +1,102 @@
+"""
+Overhead of metrics instrumentation: disabled vs no-op hook vs PrometheusMetrics.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_metrics.py [webhooks] [requests]
+"""
+
+import asyncio
+import sys
+import time
+import timeit
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from whatsapi.metrics import MetricsHook, PrometheusMetrics, set_metrics_hook
+from whatsapi.providers import EvolutionAPIProvider
+from whatsapi.webhook import WebhookHandler
+
+HOOKS = [
+    ("disabled", None),
+    ("no-op hook", MetricsHook()),
+    ("PrometheusMetrics", PrometheusMetrics()),
+]
+
+
+def _webhooks(count: int) -> List[Dict[str, Any]]:
+    """Text message webhooks"""
+    return [
+        {
+            "event": "messages.upsert",
+            "data": {
+                "key": {"id": f"3EB0{i:016X}", "remoteJid": "972501234567@s.whatsapp.net"},
+                "message": {"conversation": f"message {i}"},
+                "messageTimestamp": 1700000000 + i,
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def _bench_parse(count: int) -> None:
+    # The only work instrumented code does while metrics are disabled
+    set_metrics_hook(None)
+    check = min(timeit.repeat(
+        "get_metrics_hook() is not None", globals=globals(), number=1_000_000, repeat=5
+    ))
+    print(f"disabled check: {check * 1e3:.0f} ns per instrumented call")
+    
+    webhooks = _webhooks(count)
+    baseline: Optional[float] = None
+    for name, hook in HOOKS:
+        set_metrics_hook(hook)
+        seconds = min(
+            timeit.repeat(lambda: [WebhookHandler.parse(w) for w in webhooks], number=1, repeat=5)
+        )
+        per_call = seconds / count * 1e6
+        baseline = baseline or per_call
+        print(f"parse, {name:18}: {per_call:6.2f} us/webhook ({per_call / baseline - 1:+.1%})")
+    set_metrics_hook(None)
+
+
+async def _bench_requests(count: int) -> None:
+    async def send_text(request: web.Request) -> web.Response:
+        return web.json_response({"status": "PENDING"})
+    
+    app = web.Application()
+    app.router.add_post("/message/sendText/bench", send_text)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    
+    baseline: Optional[float] = None
+    async with EvolutionAPIProvider(f"http://127.0.0.1:{port}", "key", "bench") as provider:
+        await provider.send_text_message("+15550000000", "warm up")
+        for name, hook in HOOKS:
+            set_metrics_hook(hook)
+            start = time.perf_counter()
+            for _ in range(count):
+                await provider.send_text_message("+15550000000", "hello")
+            per_call = (time.perf_counter() - start) / count * 1e6
+            baseline = baseline or per_call
+            print(
+                f"request, {name:16}: {per_call:6.0f} us/request "
+                f"({per_call / baseline - 1:+.1%})"
+            )
+    set_metrics_hook(None)
+    await runner.cleanup()
+
+
+def main() -> None:
+    webhooks = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    _bench_parse(webhooks)
+    asyncio.run(_bench_requests(requests))
+
+
+if __name__ == "__main__":
+    main()
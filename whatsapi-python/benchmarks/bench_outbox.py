@@ -0,0 +1,53 @@
+"""
+Enqueue throughput of the SQLite outbox on the local disk.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_outbox.py [count]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from whatsapi.providers import Outbox, OutgoingMessage
+
+
+class _IdleProvider:
+    """Provider that never finishes a send, so draining does not compete with enqueues"""
+    
+    async def send_text_message(self, to: str, text: str):
+        await asyncio.sleep(3600)
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    messages = [
+        OutgoingMessage(to=f"+1555{i % 1000:07d}", text=f"message {i}") for i in range(count)
+    ]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        outbox = Outbox(_IdleProvider(), os.path.join(directory, "outbox.db"))
+        await outbox.start()
+        try:
+            start = time.perf_counter()
+            await outbox.enqueue_many(messages)
+            elapsed = time.perf_counter() - start
+            print(f"enqueue_many: {count / elapsed:10,.0f} messages/s")
+            
+            concurrent = messages[:count // 4]
+            start = time.perf_counter()
+            await asyncio.gather(*(outbox.enqueue(message) for message in concurrent))
+            elapsed = time.perf_counter() - start
+            print(
+                f"enqueue:      {len(concurrent) / elapsed:10,.0f} messages/s "
+                f"({outbox.stats.commits} commits in total)"
+            )
+        finally:
+            await outbox.close(timeout=0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
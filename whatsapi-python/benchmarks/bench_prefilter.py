@@ -0,0 +1,111 @@
+"""
+Event-name prefilter: raw webhook streams where most events are not messages.
+
+Compares decoding every body before checking its event (the previous
+behaviour) with WebhookHandler rejecting unwanted events from the raw bytes.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_prefilter.py [messages] [other_events_per_message]
+"""
+
+import json
+import random
+import sys
+import timeit
+from typing import Any, Dict, List
+
+from corpus import generate_corpus
+from whatsapi.codec import available_codecs, get_json_codec, set_json_codec
+from whatsapi.webhook import WebhookHandler, ParseStats
+
+
+def other_events(webhook: Dict[str, Any], count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Status updates and presence events that follow a message"""
+    key = webhook["data"]["key"]
+    events = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            data = {
+                "messageId": f"cm{rng.getrandbits(48):x}",
+                "keyId": key["id"],
+                "remoteJid": key["remoteJid"],
+                "fromMe": key["fromMe"],
+                "status": rng.choice(["SERVER_ACK", "DELIVERY_ACK", "READ"]),
+                "instanceId": "00000000-0000-0000-0000-000000000000",
+            }
+            event = "messages.update"
+        else:
+            data = {"id": key["remoteJid"], "presences": {key["remoteJid"]: {
+                "lastKnownPresence": rng.choice(["composing", "available", "unavailable"])
+            }}}
+            event = "presence.update"
+        events.append({
+            "event": event,
+            "instance": webhook["instance"],
+            "data": data,
+            "destination": "http://localhost/webhook",
+            "date_time": "2024-01-01T00:00:00.000Z",
+            "sender": key["remoteJid"],
+            "server_url": "http://localhost:8080",
+            "apikey": "test-key",
+        })
+    return events
+
+
+def main() -> None:
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    per_message = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rng = random.Random(0)
+    webhooks: List[Dict[str, Any]] = []
+    for webhook in generate_corpus(messages):
+        webhooks.append(webhook)
+        webhooks.extend(other_events(webhook, per_message, rng))
+    bodies = [json.dumps(webhook).encode() for webhook in webhooks]
+    ndjson = b"\n".join(bodies) + b"\n"
+    print(f"{len(bodies)} webhooks ({messages} messages)")
+    
+    # The gain depends on how expensive the decode being skipped is
+    for codec in dict.fromkeys(["json"] + available_codecs()):
+        set_json_codec(codec)
+        print(f"\ncodec: {codec}")
+        run_cases(bodies, ndjson, messages)
+
+
+def run_cases(bodies: List[bytes], ndjson: bytes, messages: int) -> None:
+    loads = get_json_codec().loads
+    
+    def decode_first() -> List[Any]:
+        return [WebhookHandler.parse(loads(body)) for body in bodies]
+    
+    def prefiltered() -> List[Any]:
+        return [WebhookHandler.parse_bytes(body) for body in bodies]
+    
+    def ndjson_decode_first() -> List[Any]:
+        lines = (loads(line) for line in ndjson.splitlines() if line)
+        return list(WebhookHandler.parse_many(lines))
+    
+    def ndjson_prefiltered() -> List[Any]:
+        return list(WebhookHandler.parse_many(ndjson, ParseStats()))
+    
+    # Both paths must agree before timing them
+    assert [m.message_id for m in decode_first() if m] == [m.message_id for m in prefiltered() if m]
+    assert len(ndjson_decode_first()) == len(ndjson_prefiltered()) == messages
+    
+    cases = [
+        ("bodies, decode first", decode_first),
+        ("bodies, prefiltered", prefiltered),
+        ("NDJSON, decode first", ndjson_decode_first),
+        ("NDJSON, prefiltered", ndjson_prefiltered),
+    ]
+    baseline = 0.0
+    for name, run in cases:
+        seconds = min(timeit.repeat(run, number=1, repeat=5))
+        if name.endswith("decode first"):
+            baseline = seconds
+        speedup = baseline / seconds
+        print(f"{name:22} {len(bodies) / seconds:12,.0f} webhooks/s  {speedup:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Round-trip benchmark for WhatsAppMessage serialization.
+
+Compares the previous asdict()-based to_dict/from_dict with the current
+non-copying to_dict/from_dict and the compact to_bytes/from_bytes encoding.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_serialize.py
+"""
+
+import dataclasses
+import json
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from whatsapi.models.message import WhatsAppMessage, MessageType, MessageDirection
+from whatsapi.webhook.handler import WebhookHandler
+
+
+def _legacy_to_dict(message: WhatsAppMessage) -> Dict[str, Any]:
+    """to_dict() as implemented before: deep copy via asdict, then fix-ups"""
+    data = dataclasses.asdict(message)
+    data['message_type'] = message.message_type.value
+    data['direction'] = message.direction.value
+    data['timestamp'] = message.timestamp.isoformat()
+    return data
+
+
+def _legacy_from_dict(data: Dict[str, Any]) -> WhatsAppMessage:
+    """from_dict() as implemented before (mutates its input)"""
+    data['message_type'] = MessageType(data['message_type'])
+    data['direction'] = MessageDirection(data['direction'])
+    data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+    return WhatsAppMessage(**data)
+
+
+def _webhook(index: int) -> Dict[str, Any]:
+    """A realistic quoted group text webhook"""
+    return {
+        "event": "messages.upsert",
+        "instance": "bench",
+        "data": {
+            "key": {
+                "remoteJid": "120363025246125888@g.us",
+                "fromMe": False,
+                "id": f"3EB0{index:016X}",
+                "participant": "972501234567@s.whatsapp.net",
+            },
+            "pushName": "Alice",
+            "message": {
+                "extendedTextMessage": {
+                    "text": "Sounds good, see you at 10",
+                    "contextInfo": {
+                        "stanzaId": "3EB0AAAAAAAAAAAAAAAA",
+                        "participant": "972509876543@s.whatsapp.net",
+                        "quotedMessage": {"conversation": "Meeting tomorrow?"},
+                    },
+                },
+                "messageContextInfo": {"deviceListMetadataVersion": 2},
+            },
+            "messageType": "extendedTextMessage",
+            "messageTimestamp": 1735689600 + index,
+            "source": "android",
+        },
+    }
+
+
+def _time(label: str, func: Callable[[], None], count: int) -> None:
+    seconds = min(timeit.repeat(func, number=1, repeat=5))
+    print(f"{label:<40} {seconds / count * 1e6:8.2f} us/message")
+
+
+def main() -> None:
+    count = 10_000
+    messages: List[WhatsAppMessage] = [
+        WebhookHandler.parse(_webhook(i)) for i in range(count)
+    ]
+    
+    def legacy_round_trip() -> None:
+        for message in messages:
+            _legacy_from_dict(json.loads(json.dumps(_legacy_to_dict(message))))
+    
+    def dict_round_trip() -> None:
+        for message in messages:
+            WhatsAppMessage.from_dict(json.loads(json.dumps(message.to_dict())))
+    
+    def dict_round_trip_no_raw() -> None:
+        for message in messages:
+            WhatsAppMessage.from_dict(
+                json.loads(json.dumps(message.to_dict(include_raw=False)))
+            )
+    
+    def bytes_round_trip() -> None:
+        for message in messages:
+            WhatsAppMessage.from_bytes(message.to_bytes())
+    
+    def bytes_round_trip_raw() -> None:
+        for message in messages:
+            WhatsAppMessage.from_bytes(message.to_bytes(include_raw=True))
+    
+    sample = messages[0]
+    no_raw = sample.to_dict(include_raw=False)
+    print(f"messages: {count}")
+    print(f"JSON of to_dict():            {len(json.dumps(sample.to_dict()))} bytes")
+    print(f"JSON of to_dict(no raw):      {len(json.dumps(no_raw))} bytes")
+    print(f"to_bytes():                   {len(sample.to_bytes())} bytes")
+    print(f"to_bytes(include_raw=True):   {len(sample.to_bytes(include_raw=True))} bytes")
+    print()
+    _time("asdict to_dict + JSON + from_dict", legacy_round_trip, count)
+    _time("to_dict + JSON + from_dict", dict_round_trip, count)
+    _time("to_dict(no raw) + JSON + from_dict", dict_round_trip_no_raw, count)
+    _time("to_bytes + from_bytes", bytes_round_trip, count)
+    _time("to_bytes(raw) + from_bytes", bytes_round_trip_raw, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Benchmark suite: webhook parsing, serialization, provider sends and ingestion.
+
+Runs every case against a synthetic corpus (benchmarks/corpus.py) and the
+in-process Evolution API simulator (whatsapi.testing), reports throughput,
+latency percentiles and memory, and optionally saves the results as JSON and
+compares them with an earlier run.
+
+After `pip install -e .`, run from the whatsapi-python directory:
+
+    python benchmarks/bench_suite.py [--count N] [--requests N] [--output results.json]
+                                     [--compare baseline.json] [--threshold 0.1]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from aiohttp import web
+
+import whatsapi
+from corpus import generate_corpus
+from whatsapi.models.message import WhatsAppMessage
+from whatsapi.providers import EvolutionAPIProvider
+from whatsapi.testing import EvolutionSimulator
+from whatsapi.webhook import WebhookHandler, WebhookPipeline
+
+Result = Dict[str, float]
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summarize(samples: List[float], elapsed: float) -> Result:
+    """Throughput and latency percentiles (in microseconds) of per-operation samples"""
+    samples.sort()
+    return {
+        "ops": len(samples),
+        "ops_per_sec": len(samples) / elapsed,
+        "mean_us": sum(samples) / len(samples) * 1e6,
+        "p50_us": _percentile(samples, 0.50) * 1e6,
+        "p90_us": _percentile(samples, 0.90) * 1e6,
+        "p99_us": _percentile(samples, 0.99) * 1e6,
+        "max_us": samples[-1] * 1e6,
+    }
+
+
+def _measure(function: Callable[[Any], Any], items: Sequence[Any]) -> Result:
+    """Time function(item) for every item"""
+    clock = time.perf_counter
+    samples = []
+    gc.collect()
+    start = clock()
+    for item in items:
+        before = clock()
+        function(item)
+        samples.append(clock() - before)
+    return _summarize(samples, clock() - start)
+
+
+async def _measure_async(
+    function: Callable[[int], Awaitable[Any]],
+    count: int,
+    concurrency: int
+) -> Result:
+    """Time count awaited calls, with up to concurrency of them in flight"""
+    clock = time.perf_counter
+    samples: List[float] = []
+    indexes = iter(range(count))
+    
+    async def worker() -> None:
+        for index in indexes:
+            before = clock()
+            await function(index)
+            samples.append(clock() - before)
+    
+    start = clock()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summarize(samples, clock() - start)
+
+
+def _memory(build: Callable[[], Any], count: int) -> Result:
+    """Peak and retained allocations of build(), per item"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = build()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return {
+        "retained_bytes_per_item": retained / count,
+        "peak_bytes_per_item": peak / count,
+    }
+
+
+def bench_webhooks(corpus: List[Dict[str, Any]]) -> Dict[str, Result]:
+    """Parsing and serialization cases"""
+    handler = WebhookHandler()
+    messages = [handler.parse(webhook) for webhook in corpus]
+    messages = [message for message in messages if message is not None]
+    dicts = [message.to_dict() for message in messages]
+    encoded = [message.to_bytes() for message in messages]
+    raw = [json.dumps(webhook).encode() for webhook in corpus]
+    ndjson = b"\n".join(raw)
+    
+    results = {
+        "parse": _measure(handler.parse, corpus),
+        "parse_bytes": _measure(handler.parse_bytes, raw),
+        "to_dict": _measure(WhatsAppMessage.to_dict, messages),
+        "from_dict": _measure(WhatsAppMessage.from_dict, dicts),
+        "to_bytes": _measure(WhatsAppMessage.to_bytes, messages),
+        "from_bytes": _measure(WhatsAppMessage.from_bytes, encoded),
+    }
+    
+    gc.collect()
+    start = time.perf_counter()
+    parsed = list(handler.parse_many(ndjson))
+    elapsed = time.perf_counter() - start
+    results["parse_many_ndjson"] = {"ops": len(corpus), "ops_per_sec": len(corpus) / elapsed}
+    del parsed
+    
+    results["memory_parse"] = _memory(
+        lambda: [handler.parse(webhook) for webhook in corpus], len(corpus)
+    )
+    results["memory_from_bytes"] = _memory(
+        lambda: [WhatsAppMessage.from_bytes(data) for data in encoded], len(encoded)
+    )
+    return results
+
+
+async def bench_provider(count: int, concurrency: int) -> Dict[str, Result]:
+    """Provider send cases against the local Evolution API simulator"""
+    results: Dict[str, Result] = {}
+    async with EvolutionSimulator(instance_name="bench", history=0) as simulator:
+        async with EvolutionAPIProvider(
+            simulator.base_url, simulator.api_key, simulator.instance_name
+        ) as provider:
+            await provider.send_text_message("+15550000000", "warm up")
+            
+            async def send_text(index: int) -> Any:
+                return await provider.send_text_message(f"+1555{index % 1000:07d}", "hello")
+            
+            async def send_media(index: int) -> Any:
+                return await provider.send_media_message(
+                    f"+1555{index % 1000:07d}", "https://example.com/a.jpg", "image", "caption"
+                )
+            
+            async def send_reaction(index: int) -> Any:
+                return await provider.send_reaction("3EB0STUB", f"+1555{index % 1000:07d}", "👍")
+            
+            results["send_text"] = await _measure_async(send_text, count, 1)
+            results["send_text_concurrent"] = await _measure_async(send_text, count, concurrency)
+            results["send_media"] = await _measure_async(send_media, count, concurrency)
+            results["send_reaction"] = await _measure_async(send_reaction, count, concurrency)
+    return results
+
+
+async def bench_ingest(corpus: List[Dict[str, Any]], concurrency: int) -> Dict[str, Result]:
+    """Webhooks posted by the simulator into a WebhookPipeline behind a local endpoint"""
+    pipeline = WebhookPipeline(lambda message: None)
+    await pipeline.start()
+    
+    async def receive(request: web.Request) -> web.Response:
+        await pipeline.submit(await request.read())
+        return web.Response()
+    
+    app = web.Application()
+    app.router.add_post("/webhook", receive)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/webhook"
+    try:
+        async with EvolutionSimulator(instance_name="bench") as simulator:
+            start = time.perf_counter()
+            await simulator.emit_webhooks(
+                len(corpus), rate=float("inf"), url=url, factory=corpus.__getitem__,
+                concurrency=concurrency
+            )
+            await pipeline.stop()
+            elapsed = time.perf_counter() - start
+    finally:
+        await runner.cleanup()
+    return {
+        "webhook_ingest": {"ops": len(corpus), "ops_per_sec": len(corpus) / elapsed},
+    }
+
+
+def _git_revision() -> Optional[str]:
+    """Current commit of the checkout, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _print_results(results: Dict[str, Result]) -> None:
+    for name, result in results.items():
+        if "ops_per_sec" in result:
+            line = f"{name:22} {result['ops_per_sec']:12,.0f} ops/s"
+            if "p50_us" in result:
+                line += (
+                    f"   p50 {result['p50_us']:8.1f} us   p90 {result['p90_us']:8.1f} us"
+                    f"   p99 {result['p99_us']:8.1f} us"
+                )
+        else:
+            line = (
+                f"{name:22} {result['retained_bytes_per_item']:12,.0f} B/item retained"
+                f"   {result['peak_bytes_per_item']:,.0f} B/item peak"
+            )
+        print(line)
+
+
+# Metrics compared between runs, with True where higher is better
+_COMPARED = {
+    "ops_per_sec": True,
+    "p50_us": False,
+    "p99_us": False,
+    "retained_bytes_per_item": False,
+}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print the change of every compared metric between two result files.
+    
+    Args:
+        baseline: Earlier results
+        current: New results
+        threshold: Relative change counted as a regression (e.g. 0.1 for 10%)
+    
+    Returns:
+        Names of regressed metrics
+    """
+    regressions = []
+    print(f"\ncompared with {baseline['meta'].get('revision') or baseline['meta']['timestamp']}:")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric, higher_is_better in _COMPARED.items():
+            if metric not in result or not before.get(metric):
+                continue
+            change = result[metric] / before[metric] - 1
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > threshold else ""
+            print(f"{name:22} {metric:24} {before[metric]:14,.1f} -> {result[metric]:14,.1f} "
+                  f"({change:+.1%}){flag}")
+            if flag:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20_000, help="webhooks in the corpus")
+    parser.add_argument("--requests", type=int, default=2_000, help="requests per send case")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent sends")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare with an earlier results JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="relative change reported as a regression (default: 0.1)"
+    )
+    args = parser.parse_args()
+    
+    corpus = generate_corpus(args.count, seed=args.seed)
+    results = bench_webhooks(corpus)
+    results.update(asyncio.run(bench_provider(args.requests, args.concurrency)))
+    results.update(asyncio.run(bench_ingest(corpus[:args.requests * 5], args.concurrency)))
+    
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "version": whatsapi.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "count": args.count,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    _print_results(results)
+    
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nresults written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
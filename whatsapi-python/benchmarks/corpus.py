@@ -0,0 +1,253 @@
+"""
+Synthetic Evolution API messages.upsert corpora for benchmarks.
+
+Run from the whatsapi-python directory to write a corpus as NDJSON:
+
+    python benchmarks/corpus.py [count] [output.ndjson]
+"""
+
+import json
+import random
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Share of each message kind, roughly what a busy customer-support number sees
+DEFAULT_MIX: Dict[str, float] = {
+    "conversation": 0.45,
+    "extendedText": 0.15,
+    "image": 0.12,
+    "audio": 0.08,
+    "video": 0.03,
+    "document": 0.04,
+    "sticker": 0.04,
+    "location": 0.01,
+    "contact": 0.01,
+    "reaction": 0.05,
+    "poll": 0.02,
+}
+
+_WORDS = (
+    "hello thanks order delivery tomorrow price please when where photo invoice "
+    "ok great sorry address payment received shipped call back later yes no"
+).split()
+
+
+class CorpusGenerator:
+    """
+    Deterministic generator of realistic messages.upsert webhooks.
+    
+    The same seed always yields the same corpus, so runs can be compared.
+    """
+    
+    def __init__(
+        self,
+        seed: int = 0,
+        mix: Optional[Dict[str, float]] = None,
+        group_ratio: float = 0.3,
+        quoted_ratio: float = 0.2,
+        outgoing_ratio: float = 0.1,
+        instance: str = "bench"
+    ):
+        """
+        Initialize generator.
+        
+        Args:
+            seed: Random seed (default: 0)
+            mix: Message kind weights (default: DEFAULT_MIX)
+            group_ratio: Fraction of group messages (default: 0.3)
+            quoted_ratio: Fraction of text/media messages replying to another message (default: 0.2)
+            outgoing_ratio: Fraction of messages sent by the instance itself (default: 0.1)
+            instance: Instance name in the webhook envelope
+        """
+        self.random = random.Random(seed)
+        mix = mix or DEFAULT_MIX
+        self.kinds: Sequence[str] = list(mix)
+        self.weights: Sequence[float] = [mix[kind] for kind in self.kinds]
+        self.group_ratio = group_ratio
+        self.quoted_ratio = quoted_ratio
+        self.outgoing_ratio = outgoing_ratio
+        self.instance = instance
+        self._builders: Dict[str, Callable[[], Tuple[str, Dict[str, Any]]]] = {
+            "conversation": self._conversation,
+            "extendedText": self._extended_text,
+            "image": lambda: self._media("imageMessage", "image/jpeg", caption=True),
+            "audio": lambda: self._media("audioMessage", "audio/ogg; codecs=opus"),
+            "video": lambda: self._media("videoMessage", "video/mp4", caption=True),
+            "document": self._document,
+            "sticker": lambda: self._media("stickerMessage", "image/webp"),
+            "location": self._location,
+            "contact": self._contact,
+            "reaction": self._reaction,
+            "poll": self._poll,
+        }
+        self._count = 0
+        self._recent_ids: List[str] = []
+    
+    def _text(self, low: int = 2, high: int = 25) -> str:
+        return " ".join(self.random.choices(_WORDS, k=self.random.randint(low, high)))
+    
+    def _id(self) -> str:
+        return "3EB0" + "".join(self.random.choices("0123456789ABCDEF", k=16))
+    
+    def _phone(self) -> str:
+        return f"9725{self.random.randint(0, 99_999_999):08d}"
+    
+    def _context(self) -> Optional[Dict[str, Any]]:
+        """contextInfo quoting an earlier message, or None"""
+        if not self._recent_ids or self.random.random() >= self.quoted_ratio:
+            return None
+        return {
+            "stanzaId": self.random.choice(self._recent_ids),
+            "participant": f"{self._phone()}@s.whatsapp.net",
+            "quotedMessage": {"conversation": self._text()},
+        }
+    
+    def _media_fields(self, mimetype: str) -> Dict[str, Any]:
+        return {
+            "url": f"https://mmg.whatsapp.net/v/t62.7118-24/{self.random.getrandbits(64):x}.enc",
+            "mimetype": mimetype,
+            "fileSha256": "".join(self.random.choices("abcdef0123456789", k=44)),
+            "fileLength": str(self.random.randint(5_000, 5_000_000)),
+            "mediaKey": "".join(self.random.choices("abcdef0123456789", k=44)),
+            "directPath": "/v/t62.7118-24/enc",
+            "mediaKeyTimestamp": str(1_700_000_000 + self._count),
+        }
+    
+    def _conversation(self) -> Tuple[str, Dict[str, Any]]:
+        return "conversation", {"conversation": self._text()}
+    
+    def _extended_text(self) -> Tuple[str, Dict[str, Any]]:
+        content: Dict[str, Any] = {"text": self._text()}
+        context = self._context()
+        if context:
+            content["contextInfo"] = context
+        return "extendedTextMessage", {"extendedTextMessage": content}
+    
+    def _media(self, key: str, mimetype: str, caption: bool = False) -> Tuple[str, Dict[str, Any]]:
+        content = self._media_fields(mimetype)
+        if caption and self.random.random() < 0.5:
+            content["caption"] = self._text(1, 12)
+        context = self._context()
+        if context:
+            content["contextInfo"] = context
+        return key, {key: content}
+    
+    def _document(self) -> Tuple[str, Dict[str, Any]]:
+        key, message = self._media("documentMessage", "application/pdf", caption=True)
+        message[key]["fileName"] = f"invoice-{self.random.randint(1000, 9999)}.pdf"
+        return key, message
+    
+    def _location(self) -> Tuple[str, Dict[str, Any]]:
+        return "locationMessage", {"locationMessage": {
+            "degreesLatitude": self.random.uniform(29.5, 33.3),
+            "degreesLongitude": self.random.uniform(34.2, 35.9),
+            "name": self._text(1, 3),
+            "address": self._text(3, 6),
+        }}
+    
+    def _contact(self) -> Tuple[str, Dict[str, Any]]:
+        name = self._text(1, 2).title()
+        phone = self._phone()
+        vcard = f"BEGIN:VCARD\nVERSION:3.0\nFN:{name}\nTEL;type=CELL:+{phone}\nEND:VCARD"
+        return "contactMessage", {"contactMessage": {"displayName": name, "vcard": vcard}}
+    
+    def _reaction(self) -> Tuple[str, Dict[str, Any]]:
+        target = self.random.choice(self._recent_ids) if self._recent_ids else self._id()
+        return "reactionMessage", {"reactionMessage": {
+            "key": {"remoteJid": f"{self._phone()}@s.whatsapp.net", "fromMe": True, "id": target},
+            "text": self.random.choice(["👍", "❤️", "😂", "🙏"]),
+        }}
+    
+    def _poll(self) -> Tuple[str, Dict[str, Any]]:
+        return "pollCreationMessageV3", {"pollCreationMessageV3": {
+            "name": self._text(3, 8) + "?",
+            "options": [{"optionName": self._text(1, 3)} for _ in range(self.random.randint(2, 5))],
+            "selectableOptionsCount": 1,
+        }}
+    
+    def webhook(self) -> Dict[str, Any]:
+        """
+        Generate the next webhook.
+        
+        Returns:
+            messages.upsert webhook dict
+        """
+        kind = self.random.choices(self.kinds, self.weights)[0]
+        message_type, message = self._builders[kind]()
+        message_id = self._id()
+        is_group = self.random.random() < self.group_ratio
+        sender = self._phone()
+        
+        key: Dict[str, Any] = {
+            "remoteJid": (
+                f"120363{self.random.randint(0, 10**12):012d}@g.us" if is_group
+                else f"{sender}@s.whatsapp.net"
+            ),
+            "fromMe": self.random.random() < self.outgoing_ratio,
+            "id": message_id,
+        }
+        if is_group:
+            key["participant"] = f"{sender}@s.whatsapp.net"
+        
+        self._count += 1
+        self._recent_ids.append(message_id)
+        if len(self._recent_ids) > 100:
+            del self._recent_ids[:50]
+        
+        return {
+            "event": "messages.upsert",
+            "instance": self.instance,
+            "data": {
+                "key": key,
+                "pushName": self._text(1, 2).title(),
+                "message": message,
+                "messageType": message_type,
+                "messageTimestamp": 1_700_000_000 + self._count,
+                "instanceId": "5c6b1c5e-0000-4000-8000-000000000000",
+                "source": self.random.choice(["android", "ios", "web"]),
+            },
+            "destination": "http://localhost:3000/webhook",
+            "date_time": "2024-01-01T00:00:00.000Z",
+            "sender": "972500000000@s.whatsapp.net",
+            "server_url": "http://localhost:8080",
+        }
+    
+    def corpus(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Generate a list of webhooks.
+        
+        Args:
+            count: Number of webhooks
+        
+        Returns:
+            List of messages.upsert webhook dicts
+        """
+        return [self.webhook() for _ in range(count)]
+
+
+def generate_corpus(count: int, seed: int = 0, **options: Any) -> List[Dict[str, Any]]:
+    """
+    Generate a deterministic corpus of messages.upsert webhooks.
+    
+    Args:
+        count: Number of webhooks
+        seed: Random seed (default: 0)
+        **options: Further CorpusGenerator options (mix, group_ratio, ...)
+    
+    Returns:
+        List of webhook dicts
+    """
+    return CorpusGenerator(seed=seed, **options).corpus(count)
+
+
+def to_ndjson(corpus: List[Dict[str, Any]]) -> bytes:
+    """Encode a corpus as newline-delimited JSON"""
+    return b"".join(json.dumps(webhook).encode() + b"\n" for webhook in corpus)
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    output = sys.argv[2] if len(sys.argv) > 2 else "corpus.ndjson"
+    with open(output, "wb") as file:
+        file.write(to_ndjson(generate_corpus(size)))
+    print(f"wrote {size} webhooks to {output}")
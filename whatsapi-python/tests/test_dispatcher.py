@@ -0,0 +1,47 @@
+"""ChatDispatcher lifecycle tests"""
+
+import asyncio
+
+from whatsapi.webhook import ChatDispatcher, WebhookHandler
+
+
+def message(message_id: str, chat: str):
+    return WebhookHandler.parse({
+        "event": "messages.upsert",
+        "data": {
+            "key": {"id": message_id, "remoteJid": f"{chat}@s.whatsapp.net"},
+            "message": {"conversation": "hi"},
+        },
+    })
+
+
+def test_stop_without_drain_releases_join_and_blocked_submit():
+    handled = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def slow(incoming):
+            handled.append(incoming.message_id)
+            await release.wait()
+
+        dispatcher = ChatDispatcher(slow, concurrency=1, max_pending=2)
+        await dispatcher.start()
+        await dispatcher.submit(message("running", "972501111111"))
+        await dispatcher.submit(message("queued", "972502222222"))
+        blocked = asyncio.ensure_future(dispatcher.submit(message("blocked", "972503333333")))
+        joined = asyncio.ensure_future(dispatcher.join())
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(dispatcher.stop(drain=False), 1)
+        await asyncio.wait_for(asyncio.gather(joined, blocked), 1)
+        assert dispatcher.stats.dropped == 2
+
+        # The message that was waiting in submit() is handled after a restart
+        release.set()
+        await dispatcher.start()
+        await asyncio.wait_for(dispatcher.join(), 1)
+        await dispatcher.stop()
+
+    asyncio.run(main())
+    assert handled == ["running", "blocked"]
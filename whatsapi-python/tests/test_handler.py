@@ -0,0 +1,117 @@
+"""WebhookHandler regression tests"""
+
+import asyncio
+import json
+
+import pytest
+
+from whatsapi.models import MessageType, WebhookEvent
+from whatsapi.metrics import PrometheusMetrics, set_metrics_hook
+from whatsapi.webhook import (
+    WebhookHandler, WebhookPipeline, ParseStats, LRUDeduplicator, BloomDeduplicator
+)
+
+
+def upsert(message_id: str = "ABC123", text: str = "hi") -> dict:
+    return {
+        "event": "messages.upsert",
+        "instance": "test",
+        "data": {
+            "key": {"id": message_id, "remoteJid": "972501234567@s.whatsapp.net", "fromMe": False},
+            "message": {"conversation": text},
+            "messageTimestamp": 1700000000,
+        },
+    }
+
+
+def body(webhook: dict) -> bytes:
+    return json.dumps(webhook, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, lambda raw: raw.decode()])
+def test_parse_bytes_accepts_every_raw_body_type(wrap):
+    message = WebhookHandler.parse_bytes(wrap(body(upsert())))
+    assert message is not None
+    assert message.message_id == "ABC123"
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, lambda raw: raw.decode()])
+def test_parse_many_accepts_every_raw_body_type(wrap):
+    ndjson = body(upsert("A")) + b"\n" + body({"event": "presence.update", "data": {}}) + b"\n"
+    stats = ParseStats()
+    messages = list(WebhookHandler.parse_many([wrap(ndjson)], stats))
+    assert [message.message_id for message in messages] == ["A"]
+    assert stats.skipped == 1
+
+
+def test_pipeline_accepts_bytearray():
+    received = []
+
+    async def main():
+        async with WebhookPipeline(received.append, workers=1) as pipeline:
+            await pipeline.submit(bytearray(body(upsert())))
+            await pipeline.join()
+
+    asyncio.run(main())
+    assert [message.message_id for message in received] == ["ABC123"]
+
+
+@pytest.mark.parametrize("deduplicator", [LRUDeduplicator(), BloomDeduplicator(capacity=1000)])
+def test_failed_build_does_not_mark_message_seen(deduplicator, monkeypatch):
+    build = WebhookHandler._build_message
+    calls = []
+
+    def fail_once(*args, **kwargs):
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("transient failure")
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(WebhookHandler, "_build_message", staticmethod(fail_once))
+    assert WebhookHandler.parse(upsert(), deduplicator=deduplicator) is None
+    message = WebhookHandler.parse(upsert(), deduplicator=deduplicator)
+    assert message is not None and message.message_id == "ABC123"
+    assert WebhookHandler.parse(upsert(), deduplicator=deduplicator) is None
+    stats = ParseStats()
+    assert list(WebhookHandler.parse_many([upsert()], stats, deduplicator)) == []
+    assert stats.duplicates == 1
+
+
+def test_metrics_label_unknown_events_as_other():
+    metrics = PrometheusMetrics()
+    set_metrics_hook(metrics)
+    try:
+        for event in ["custom.1", "custom.2", "connection.update"]:
+            WebhookHandler.parse_event({"event": event, "data": {}}, WebhookEvent.MESSAGES_UPSERT)
+    finally:
+        set_metrics_hook(None)
+    assert metrics.webhooks_dropped == {
+        ("other", "unsupported_event"): 2,
+        ("connection.update", "unsupported_event"): 1,
+    }
+
+
+@pytest.mark.parametrize("remote_jid, from_number", [
+    ("972501234567:12@s.whatsapp.net", "+972501234567"),
+    ("972501234567", "+972501234567"),
+    ("120363000000000000@newsletter", "120363000000000000@newsletter"),
+    ("@s.whatsapp.net", "@s.whatsapp.net"),
+])
+def test_unusual_remote_jid_keeps_message(remote_jid, from_number):
+    webhook = upsert()
+    webhook["data"]["key"]["remoteJid"] = remote_jid
+    message = WebhookHandler.parse(webhook)
+    assert message is not None
+    assert message.from_number == from_number
+
+
+def test_type_detection_follows_table_priority_not_key_order():
+    webhook = upsert()
+    webhook["data"]["message"] = {
+        "imageMessage": {"url": "https://example.com/a.jpg", "caption": "photo"},
+        "conversation": "hi",
+    }
+    message = WebhookHandler.parse(webhook)
+    assert message is not None
+    assert message.message_type is MessageType.TEXT
+    assert message.text == "hi"
@@ -0,0 +1,42 @@
+"""MediaSpooler tests"""
+
+import base64
+import os
+
+from whatsapi.webhook import MediaSpooler, WebhookHandler
+
+
+def image_upsert(encoded: str) -> dict:
+    return {
+        "event": "messages.upsert",
+        "data": {
+            "key": {"id": "IMG1", "remoteJid": "972501234567@s.whatsapp.net"},
+            "message": {
+                "imageMessage": {"mimetype": "image/jpeg", "caption": "photo"},
+                "base64": encoded,
+            },
+        },
+    }
+
+
+def test_spooled_media_is_written_to_disk(tmp_path):
+    payload = os.urandom(3000)
+    spooler = MediaSpooler(threshold=16, directory=str(tmp_path))
+    message = WebhookHandler.parse(
+        image_upsert(base64.b64encode(payload).decode()), media_spooler=spooler
+    )
+    assert message is not None
+    assert message.media_file is not None
+    with open(message.media_file.path, "rb") as file:
+        assert file.read() == payload
+
+
+def test_malformed_base64_keeps_message_unspooled(tmp_path):
+    encoded = "A" * 4097
+    spooler = MediaSpooler(threshold=16, directory=str(tmp_path))
+    message = WebhookHandler.parse(image_upsert(encoded), media_spooler=spooler)
+    assert message is not None
+    assert message.message_id == "IMG1"
+    assert message.media_file is None
+    assert message.raw_data["message"]["base64"] == encoded
+    assert list(tmp_path.iterdir()) == []
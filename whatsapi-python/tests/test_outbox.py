@@ -0,0 +1,122 @@
+"""Outbox regression tests: no double sends across close()/start(), no stuck claims"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from whatsapi.providers import Outbox, OutgoingMessage
+from whatsapi.providers import outbox as outbox_module
+
+
+class RecordingProvider:
+    """Provider that takes a little time per send and counts sends per text"""
+
+    def __init__(self, latency: float = 0.002):
+        self.latency = latency
+        self.sent: Counter = Counter()
+
+    async def send_text_message(self, to: str, text: str):
+        await asyncio.sleep(self.latency)
+        self.sent[text] += 1
+        return {"key": {"id": text}}
+
+
+def make_messages(count: int):
+    return [OutgoingMessage(to=f"+1555{i % 50:07d}", text=f"m{i}") for i in range(count)]
+
+
+async def wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+async def drained(outbox: Outbox) -> bool:
+    counts = await outbox.counts()
+    return counts["pending"] == 0 and counts["sending"] == 0
+
+
+@pytest.mark.parametrize("timeout", [10.0, 0.0])
+def test_close_while_draining_does_not_resend(tmp_path, timeout):
+    path = str(tmp_path / "outbox.db")
+    provider = RecordingProvider()
+
+    async def main():
+        outbox = Outbox(provider, path, max_in_flight=10)
+        await outbox.start()
+        await outbox.enqueue_many(make_messages(500))
+
+        async def some_sent():
+            return sum(provider.sent.values()) >= 150
+        await wait_for(some_sent)
+        # timeout=0 cancels in-flight sends instead of waiting for them
+        await outbox.close(timeout=timeout)
+
+        outbox = Outbox(provider, path, max_in_flight=10)
+        await outbox.start()
+        await wait_for(lambda: drained(outbox))
+        counts = await outbox.counts()
+        await outbox.close()
+        return counts
+
+    counts = asyncio.run(main())
+    assert counts["sent"] == 500
+    assert len(provider.sent) == 500
+    assert max(provider.sent.values()) == 1
+
+
+def test_invalid_recipient_is_failed_not_stuck(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    provider = RecordingProvider(latency=0)
+    messages = make_messages(21)
+    messages.insert(1, OutgoingMessage(to="", text="bad"))
+
+    async def main():
+        for _ in range(2):
+            outbox = Outbox(provider, path)
+            await outbox.start()
+            if not provider.sent:
+                assert await outbox.enqueue_many(messages) == 22
+            await wait_for(lambda: drained(outbox))
+            counts = await outbox.counts()
+            await outbox.close()
+        return counts
+
+    counts = asyncio.run(main())
+    assert counts == {"pending": 0, "sending": 0, "sent": 21, "failed": 1}
+    assert "bad" not in provider.sent
+    assert len(provider.sent) == 21
+    assert max(provider.sent.values()) == 1
+
+
+def test_failed_batch_returns_claims_to_queue(tmp_path, monkeypatch):
+    path = str(tmp_path / "outbox.db")
+    provider = RecordingProvider(latency=0)
+    send_many = outbox_module.bulk.send_many
+    calls = []
+
+    async def failing_send_many(*args, **kwargs):
+        # The first batch yields one result, then breaks
+        calls.append(1)
+        async for result in send_many(*args, **kwargs):
+            yield result
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+
+    monkeypatch.setattr(outbox_module.bulk, "send_many", failing_send_many)
+
+    async def main():
+        outbox = Outbox(provider, path, max_in_flight=1, poll_interval=0.01)
+        await outbox.start()
+        await outbox.enqueue_many(make_messages(10))
+        await wait_for(lambda: drained(outbox))
+        counts = await outbox.counts()
+        await outbox.close()
+        return counts
+
+    counts = asyncio.run(main())
+    assert len(calls) >= 2
+    assert counts["sent"] == 10
+    assert len(provider.sent) == 10
@@ -0,0 +1,48 @@
+"""WebhookPipeline lifecycle tests"""
+
+import asyncio
+
+from whatsapi.webhook import WebhookPipeline
+
+
+def upsert(message_id: str) -> dict:
+    return {
+        "event": "messages.upsert",
+        "data": {
+            "key": {"id": message_id, "remoteJid": "972501234567@s.whatsapp.net"},
+            "message": {"conversation": "hi"},
+        },
+    }
+
+
+def test_stop_without_drain_releases_join_and_blocked_submit():
+    received = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def slow(message):
+            received.append(message.message_id)
+            await release.wait()
+
+        pipeline = WebhookPipeline(slow, workers=1, maxsize=1, backpressure="block")
+        await pipeline.start()
+        await pipeline.submit(upsert("running"))
+        await asyncio.sleep(0)
+        await pipeline.submit(upsert("queued"))
+        blocked = asyncio.ensure_future(pipeline.submit(upsert("blocked")))
+        joined = asyncio.ensure_future(pipeline.join())
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(pipeline.stop(drain=False), 1)
+        await asyncio.wait_for(asyncio.gather(joined, blocked), 1)
+        assert pipeline.stats.dropped == 1
+
+        # The event that was blocked in submit() is handled after a restart
+        release.set()
+        await pipeline.start()
+        await asyncio.wait_for(pipeline.join(), 1)
+        await pipeline.stop()
+
+    asyncio.run(main())
+    assert received == ["running", "blocked"]
@@ -0,0 +1,164 @@
+"""EvolutionSimulator behaviour and provider resilience against it"""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from whatsapi.providers import CircuitBreaker, EvolutionAPIProvider, RateLimiter, RetryPolicy
+from whatsapi.providers.evolution import EvolutionAPICircuitOpenError
+from whatsapi.testing import EvolutionSimulator, FaultProfile
+
+
+def no_backoff(max_retries: int) -> RetryPolicy:
+    return RetryPolicy(max_retries=max_retries, base_delay=0.0, jitter=False)
+
+
+def run(scenario, simulator=None, **provider_options):
+    """Run scenario(simulator, provider) against a fresh simulator"""
+    async def main():
+        async with simulator or EvolutionSimulator(seed=1) as sim:
+            provider = EvolutionAPIProvider(
+                sim.base_url, sim.api_key, sim.instance_name, **provider_options
+            )
+            try:
+                return await scenario(sim, provider)
+            finally:
+                await provider.close()
+
+    return asyncio.run(main())
+
+
+def test_sends_are_recorded():
+    async def scenario(sim, provider):
+        response = await provider.send_text_message("+15550001111", "hello")
+        assert response["key"]["remoteJid"] == "15550001111@s.whatsapp.net"
+        assert sim.requests[-1] == ("POST", "sendText", {"number": "15550001111", "text": "hello"})
+        assert sim.stats.succeeded == 1
+
+    run(scenario)
+
+
+def test_wrong_api_key_gets_401_without_retry():
+    async def scenario(sim, provider):
+        other = EvolutionAPIProvider(
+            sim.base_url, "wrong", sim.instance_name, retry_policy=no_backoff(3)
+        )
+        try:
+            with pytest.raises(aiohttp.ClientResponseError) as error:
+                await other.send_text_message("+15550001111", "hello")
+        finally:
+            await other.close()
+        assert error.value.status == 401
+        assert sim.stats.unauthorized == 1
+        assert sim.stats.requests == 1
+
+    run(scenario)
+
+
+def test_unknown_instance_gets_404():
+    async def scenario(sim, provider):
+        other = EvolutionAPIProvider(sim.base_url, sim.api_key, "missing")
+        try:
+            with pytest.raises(aiohttp.ClientResponseError) as error:
+                await other.get_instance_status()
+        finally:
+            await other.close()
+        assert error.value.status == 404
+        assert len(sim.requests) == 0
+
+    run(scenario)
+
+
+def test_fault_order_drop_then_rate_limit_then_error():
+    async def scenario(sim, provider):
+        sim.faults = FaultProfile(rate_limit_rate=1.0, error_rate=1.0)
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await provider.send_text_message("+15550001111", "hello")
+        assert error.value.status == 429
+
+        sim.faults = FaultProfile(drop_rate=1.0, rate_limit_rate=1.0, error_rate=1.0)
+        with pytest.raises(aiohttp.ClientError):
+            await provider.send_text_message("+15550001111", "hello")
+        assert (sim.stats.rate_limited, sim.stats.dropped, sim.stats.errors) == (1, 1, 0)
+
+    run(scenario, retry_policy=no_backoff(0))
+
+
+def test_endpoint_faults_override_defaults():
+    async def scenario(sim, provider):
+        await provider.send_text_message("+15550001111", "hello")
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await provider.get_instance_status()
+        assert error.value.status == 503
+
+    simulator = EvolutionSimulator(
+        faults=FaultProfile(error_rate=1.0),
+        endpoint_faults={
+            "sendText": FaultProfile(),
+            "connectionState": FaultProfile(error_rate=1.0, error_status=503),
+        },
+    )
+    run(scenario, simulator, retry_policy=no_backoff(0))
+
+
+def test_retries_until_the_policy_gives_up():
+    async def scenario(sim, provider):
+        sim.faults = FaultProfile(error_rate=1.0, error_status=502)
+        with pytest.raises(aiohttp.ClientResponseError):
+            await provider.send_text_message("+15550001111", "hello")
+        assert sim.stats.errors == 3
+
+    run(scenario, retry_policy=no_backoff(2))
+
+
+def test_retry_waits_for_retry_after():
+    async def scenario(sim, provider):
+        sim.faults = FaultProfile(rate_limit_rate=1.0, retry_after=0.2)
+        started = time.monotonic()
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await provider.send_text_message("+15550001111", "hello")
+        assert error.value.headers["Retry-After"] == "0.2"
+        assert time.monotonic() - started >= 0.2
+        assert sim.stats.rate_limited == 2
+
+    run(scenario, retry_policy=no_backoff(1))
+
+
+def test_circuit_breaker_opens_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30.0, clock=lambda: now[0])
+
+    async def scenario(sim, provider):
+        sim.faults = FaultProfile(error_rate=1.0)
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await provider.send_text_message("+15550001111", "hello")
+        with pytest.raises(EvolutionAPICircuitOpenError):
+            await provider.send_text_message("+15550001111", "hello")
+        assert sim.stats.requests == 2
+
+        # After the recovery timeout a probe goes through and closes the circuit
+        sim.faults = FaultProfile()
+        now[0] += 30.0
+        await provider.send_text_message("+15550001111", "hello")
+        await provider.send_text_message("+15550001111", "hello")
+        assert sim.stats.succeeded == 2
+
+    run(scenario, retry_policy=no_backoff(0), circuit_breaker=breaker)
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=20.0, burst=1.0)
+
+    async def scenario(sim, provider):
+        started = time.monotonic()
+        for _ in range(5):
+            await provider.send_text_message("+15550001111", "hello")
+        assert time.monotonic() - started >= 0.15
+        assert sim.stats.succeeded == 5
+        assert limiter.stats.acquired == 5
+        assert limiter.stats.delayed == 4
+
+    run(scenario, rate_limiter=limiter)
@@ -4,10 +4,36 @@ whatsapi-python - WhatsApp communication library via Evolution API
 
 __version__ = "1.0.0"
 
-from .providers.base import WhatsAppProvider
-from .providers.evolution import EvolutionAPIProvider
-from .models.message import WhatsAppMessage, MessageType, MessageDirection
-from .webhook.handler import WebhookHandler
+from typing import TYPE_CHECKING, Any, List
+
+from ._lazy import export_names, load_export
+
+# Imported on first access, so webhook-only processes never load aiohttp
+_EXPORTS = {
+    "WhatsAppProvider": ".providers.base",
+    "EvolutionAPIProvider": ".providers.evolution",
+    "WhatsAppMessage": ".models.message",
+    "MessageType": ".models.message",
+    "MessageDirection": ".models.message",
+    "Jid": ".models.jid",
+    "WebhookHandler": ".webhook.handler",
+}
+
+
+def __getattr__(name: str) -> Any:
+    return load_export(__name__, _EXPORTS, name)
+
+
+def __dir__() -> List[str]:
+    return export_names(__name__, _EXPORTS)
+
+
+if TYPE_CHECKING:
+    from .providers.base import WhatsAppProvider
+    from .providers.evolution import EvolutionAPIProvider
+    from .models.message import WhatsAppMessage, MessageType, MessageDirection
+    from .models.jid import Jid
+    from .webhook.handler import WebhookHandler
 
 __all__ = [
     "WhatsAppProvider",
@@ -15,5 +41,6 @@ __all__ = [
     "WhatsAppMessage",
     "MessageType",
     "MessageDirection",
+    "Jid",
     "WebhookHandler",
 ]
@@ -0,0 +1,47 @@
+"""Module-level lazy attribute loading (PEP 562)"""
+
+import importlib
+import sys
+from typing import Any, Dict, List
+
+
+def load_export(package: str, exports: Dict[str, str], name: str) -> Any:
+    """
+    Import a lazily exported attribute; backs a package's ``__getattr__``.
+    
+    The submodule providing the export is imported on first access, and the
+    value is cached in the package namespace so later accesses are plain
+    lookups.
+    
+    Args:
+        package: Package ``__name__``
+        exports: Export name -> relative submodule providing it (e.g. ".evolution")
+        name: Attribute requested
+    
+    Returns:
+        The exported value
+    
+    Raises:
+        AttributeError: If the package does not export ``name``
+    """
+    try:
+        submodule = exports[name]
+    except KeyError:
+        raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(submodule, package), name)
+    setattr(sys.modules[package], name, value)
+    return value
+
+
+def export_names(package: str, exports: Dict[str, str]) -> List[str]:
+    """
+    List a package's attributes including lazy exports; backs its ``__dir__``.
+    
+    Args:
+        package: Package ``__name__``
+        exports: Export name -> relative submodule providing it
+    
+    Returns:
+        Sorted attribute names
+    """
+    return sorted(set(vars(sys.modules[package])) | set(exports))
@@ -0,0 +1,180 @@
+"""Pluggable JSON codec with optional orjson and msgspec backends"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Union
+
+JSONInput = Union[bytes, bytearray, str]
+
+# Tried in this order when no codec is set explicitly
+PREFERRED_CODECS = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """
+    A JSON encoder/decoder pair.
+    
+    ``loads`` accepts bytes or str and raises ValueError on invalid input
+    whatever the backend; ``dumps`` returns str (the form aiohttp's
+    ``json_serialize`` expects) and ``dumpb`` UTF-8 bytes for request bodies.
+    """
+    
+    __slots__ = ("name", "dumps", "dumpb", "loads")
+    
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], str],
+        dumpb: Callable[[Any], bytes],
+        loads: Callable[[JSONInput], Any]
+    ):
+        """
+        Initialize codec.
+        
+        Args:
+            name: Backend name
+            dumps: Encodes an object to a JSON str
+            dumpb: Encodes an object to JSON bytes
+            loads: Decodes JSON bytes or str
+        """
+        self.name = name
+        self.dumps = dumps
+        self.dumpb = dumpb
+        self.loads = loads
+    
+    def __repr__(self) -> str:
+        return f"JSONCodec({self.name!r})"
+
+
+def _stdlib_codec() -> JSONCodec:
+    encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+    return JSONCodec(
+        "json",
+        dumps=encode,
+        dumpb=lambda obj: encode(obj).encode(),
+        loads=json.loads
+    )
+
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+    
+    dumpb = orjson.dumps
+    return JSONCodec(
+        "orjson",
+        dumps=lambda obj: dumpb(obj).decode(),
+        dumpb=dumpb,
+        loads=orjson.loads  # orjson.JSONDecodeError subclasses ValueError
+    )
+
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+    
+    dumpb = msgspec.json.Encoder().encode
+    decode = msgspec.json.Decoder().decode
+    decode_error = msgspec.DecodeError
+    
+    def loads(data: JSONInput) -> Any:
+        try:
+            return decode(data)
+        except decode_error as e:
+            raise ValueError(str(e)) from e
+    
+    return JSONCodec(
+        "msgspec",
+        dumps=lambda obj: dumpb(obj).decode(),
+        dumpb=dumpb,
+        loads=loads
+    )
+
+
+_BACKENDS: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+def load_codec(name: str) -> JSONCodec:
+    """
+    Create a codec for a named backend.
+    
+    Args:
+        name: "orjson", "msgspec" or "json"
+    
+    Returns:
+        JSONCodec for the backend
+    
+    Raises:
+        ValueError: If the backend is unknown
+        ImportError: If the backend package is not installed
+    """
+    try:
+        factory = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown JSON codec {name!r}, expected one of {', '.join(_BACKENDS)}"
+        ) from None
+    return factory()
+
+
+def available_codecs() -> List[str]:
+    """
+    List the backends that can be loaded in this environment.
+    
+    Returns:
+        Backend names in order of preference
+    """
+    available = []
+    for name in PREFERRED_CODECS:
+        try:
+            load_codec(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def _default_codec() -> JSONCodec:
+    """Fastest installed backend"""
+    for name in PREFERRED_CODECS:
+        try:
+            return load_codec(name)
+        except ImportError:
+            continue
+    return _stdlib_codec()
+
+
+_codec: Optional[JSONCodec] = None
+
+
+def set_json_codec(codec: Union[JSONCodec, str, None]) -> None:
+    """
+    Install the process-wide JSON codec.
+    
+    Used by providers for request bodies and responses and by the webhook
+    handler for raw payloads, unless a component is given its own codec.
+    
+    Args:
+        codec: JSONCodec, backend name, or None to pick the fastest installed backend
+    
+    Raises:
+        ValueError: If a backend name is unknown
+        ImportError: If a named backend is not installed
+    """
+    global _codec
+    _codec = load_codec(codec) if isinstance(codec, str) else codec
+
+
+def get_json_codec() -> JSONCodec:
+    """
+    Get the process-wide JSON codec.
+    
+    Returns:
+        Installed JSONCodec; orjson, msgspec or the standard library, whichever
+        is available first, if none was set
+    """
+    global _codec
+    if _codec is None:
+        _codec = _default_codec()
+    return _codec
@@ -0,0 +1,272 @@
+"""Metrics hooks for HTTP requests and webhook parsing"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; HTTP calls span milliseconds to tens of seconds
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+# Webhook parsing takes microseconds
+DEFAULT_PARSE_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01
+)
+
+
+class MetricsHook:
+    """
+    Receives measurements from providers and the webhook handler.
+    
+    Every method is a no-op; subclass and override the ones you need to
+    forward measurements to your metrics system. Instrumented code skips
+    timing entirely while no hook is installed.
+    """
+    
+    def request_started(self, method: str, endpoint: str) -> None:
+        """
+        An HTTP attempt is about to be sent.
+        
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path without the instance name (e.g. "/message/sendText")
+        """
+    
+    def request_finished(self, method: str, endpoint: str, status: str, duration: float) -> None:
+        """
+        An HTTP attempt completed or failed.
+        
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path without the instance name
+            status: HTTP status code, or "timeout", "connection_error", "circuit_open"
+                or "error" (any other exception, including cancellation)
+            duration: Seconds the attempt took
+        """
+    
+    def request_retried(self, method: str, endpoint: str) -> None:
+        """
+        A failed attempt will be retried.
+        
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path without the instance name
+        """
+    
+    def webhook_parsed(self, event: str, message_type: str, duration: float) -> None:
+        """
+        A webhook was parsed into a message or another event model.
+        
+        Args:
+            event: Webhook event name ("other" for names outside WebhookEvent)
+            message_type: MessageType value of the parsed message ("" for other events)
+            duration: Seconds spent parsing
+        """
+    
+    def webhook_dropped(self, event: str, reason: str, duration: float) -> None:
+        """
+        A webhook produced no message.
+        
+        Args:
+            event: Webhook event name ("" if the webhook had none, "other" for names
+                outside WebhookEvent)
+            reason: "invalid", "unsupported_event", "duplicate", "missing_id" or "error"
+            duration: Seconds spent before the webhook was dropped
+        """
+
+
+class _Histogram:
+    """Cumulative-bucket histogram for one label set"""
+    
+    __slots__ = ("counts", "sum", "count")
+    
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, buckets: Sequence[float], value: float) -> None:
+        index = bisect_left(buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+Labels = Tuple[str, ...]
+
+
+class PrometheusMetrics(MetricsHook):
+    """
+    In-process metrics store with Prometheus text format export.
+    
+    Needs no third-party packages: serve ``render()`` from your own
+    ``/metrics`` endpoint.
+    
+    Example:
+        metrics = PrometheusMetrics()
+        set_metrics_hook(metrics)
+        ...
+        body = metrics.render()
+    """
+    
+    def __init__(
+        self,
+        namespace: str = "whatsapi",
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        parse_buckets: Sequence[float] = DEFAULT_PARSE_BUCKETS
+    ):
+        """
+        Initialize metrics store.
+        
+        Args:
+            namespace: Prefix of every metric name (default: "whatsapi")
+            latency_buckets: Request latency bucket bounds in seconds
+            parse_buckets: Webhook parse duration bucket bounds in seconds
+        """
+        self.namespace = namespace
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.parse_buckets = tuple(sorted(parse_buckets))
+        self.requests_in_flight = 0
+        self.requests: Dict[Labels, int] = {}
+        self.request_retries: Dict[Labels, int] = {}
+        self.request_latency: Dict[Labels, _Histogram] = {}
+        self.webhooks: Dict[Labels, int] = {}
+        self.webhooks_dropped: Dict[Labels, int] = {}
+        self.parse_duration = _Histogram(len(self.parse_buckets))
+    
+    def request_started(self, method: str, endpoint: str) -> None:
+        self.requests_in_flight += 1
+    
+    def request_finished(self, method: str, endpoint: str, status: str, duration: float) -> None:
+        self.requests_in_flight -= 1
+        key = (method, endpoint, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.request_latency.get((method, endpoint))
+        if histogram is None:
+            histogram = self.request_latency[(method, endpoint)] = _Histogram(
+                len(self.latency_buckets)
+            )
+        histogram.observe(self.latency_buckets, duration)
+    
+    def request_retried(self, method: str, endpoint: str) -> None:
+        key = (method, endpoint)
+        self.request_retries[key] = self.request_retries.get(key, 0) + 1
+    
+    def webhook_parsed(self, event: str, message_type: str, duration: float) -> None:
+        key = (event, message_type)
+        self.webhooks[key] = self.webhooks.get(key, 0) + 1
+        self.parse_duration.observe(self.parse_buckets, duration)
+    
+    def webhook_dropped(self, event: str, reason: str, duration: float) -> None:
+        key = (event, reason)
+        self.webhooks_dropped[key] = self.webhooks_dropped.get(key, 0) + 1
+        self.parse_duration.observe(self.parse_buckets, duration)
+    
+    def render(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format (version 0.0.4).
+        
+        Returns:
+            Metrics text, served with content type ``text/plain; version=0.0.4``
+        """
+        ns = self.namespace
+        lines: List[str] = []
+        
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {ns}_{name} {help_text}")
+            lines.append(f"# TYPE {ns}_{name} {kind}")
+        
+        def counter(name: str, label_names: Labels, values: Dict[Labels, int]) -> None:
+            for labels, value in sorted(values.items()):
+                lines.append(f"{ns}_{name}{_labels(label_names, labels)} {value}")
+        
+        def histogram(
+            name: str,
+            label_names: Labels,
+            labels: Labels,
+            buckets: Sequence[float],
+            data: _Histogram
+        ) -> None:
+            cumulative = 0
+            for bound, count in zip(buckets, data.counts):
+                cumulative += count
+                bucket_labels = _labels(label_names + ("le",), labels + (_number(bound),))
+                lines.append(f"{ns}_{name}_bucket{bucket_labels} {cumulative}")
+            inf_labels = _labels(label_names + ("le",), labels + ("+Inf",))
+            lines.append(f"{ns}_{name}_bucket{inf_labels} {data.count}")
+            lines.append(f"{ns}_{name}_sum{_labels(label_names, labels)} {_number(data.sum)}")
+            lines.append(f"{ns}_{name}_count{_labels(label_names, labels)} {data.count}")
+        
+        header("requests_in_flight", "gauge", "HTTP requests currently in progress.")
+        lines.append(f"{ns}_requests_in_flight {self.requests_in_flight}")
+        
+        header("requests_total", "counter", "HTTP request attempts by outcome.")
+        counter("requests_total", ("method", "endpoint", "status"), self.requests)
+        
+        header("request_retries_total", "counter", "HTTP request retries.")
+        counter("request_retries_total", ("method", "endpoint"), self.request_retries)
+        
+        header("request_duration_seconds", "histogram", "HTTP request attempt latency.")
+        for labels, data in sorted(self.request_latency.items()):
+            histogram(
+                "request_duration_seconds", ("method", "endpoint"), labels,
+                self.latency_buckets, data
+            )
+        
+        header("webhooks_parsed_total", "counter", "Webhooks parsed into messages.")
+        counter("webhooks_parsed_total", ("event", "message_type"), self.webhooks)
+        
+        header("webhooks_dropped_total", "counter", "Webhooks that produced no message.")
+        counter("webhooks_dropped_total", ("event", "reason"), self.webhooks_dropped)
+        
+        header("webhook_parse_duration_seconds", "histogram", "Webhook parse duration.")
+        histogram(
+            "webhook_parse_duration_seconds", (), (), self.parse_buckets, self.parse_duration
+        )
+        
+        return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    """Format a sample value"""
+    return repr(float(value))
+
+
+def _labels(names: Labels, values: Labels) -> str:
+    """Format a label set, escaping values"""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_hook: Optional[MetricsHook] = None
+
+
+def set_metrics_hook(hook: Optional[MetricsHook]) -> None:
+    """
+    Install the process-wide metrics hook.
+    
+    Args:
+        hook: MetricsHook to receive measurements, or None to disable metrics
+    """
+    global _hook
+    _hook = hook
+
+
+def get_metrics_hook() -> Optional[MetricsHook]:
+    """
+    Get the process-wide metrics hook.
+    
+    Returns:
+        Installed MetricsHook, or None if metrics are disabled
+    """
+    return _hook
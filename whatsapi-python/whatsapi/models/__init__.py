@@ -1,5 +1,41 @@
 """WhatsApp models package"""
 
+from typing import TYPE_CHECKING, Any, List
+
+from .._lazy import export_names, load_export
 from .message import WhatsAppMessage, MessageType, MessageDirection
+from .media import MediaHandle
+from .jid import Jid
+from .events import (
+    WebhookEvent, ALL_EVENTS, MessageStatus, MessageStatusUpdate, ConnectionUpdate, QRCodeUpdate
+)
+
+# MessageBatch may import NumPy, which most processes never need
+_EXPORTS = {"MessageBatch": ".batch"}
+
+
+def __getattr__(name: str) -> Any:
+    return load_export(__name__, _EXPORTS, name)
+
+
+def __dir__() -> List[str]:
+    return export_names(__name__, _EXPORTS)
+
+
+if TYPE_CHECKING:
+    from .batch import MessageBatch
 
-__all__ = ["WhatsAppMessage", "MessageType", "MessageDirection"]
+__all__ = [
+    "WhatsAppMessage",
+    "MessageType",
+    "MessageDirection",
+    "MediaHandle",
+    "MessageBatch",
+    "Jid",
+    "WebhookEvent",
+    "ALL_EVENTS",
+    "MessageStatus",
+    "MessageStatusUpdate",
+    "ConnectionUpdate",
+    "QRCodeUpdate",
+]
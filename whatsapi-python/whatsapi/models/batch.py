@@ -0,0 +1,421 @@
+"""Columnar message batches for filtering and aggregation"""
+
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .message import WhatsAppMessage, MessageType, MessageDirection
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore[assignment]
+
+# Column codes: position in these tuples
+MESSAGE_TYPES = tuple(MessageType)
+DIRECTIONS = tuple(MessageDirection)
+_TYPE_CODES = {message_type: code for code, message_type in enumerate(MESSAGE_TYPES)}
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# media_size of messages without media
+NO_MEDIA = -1
+
+# Fixed-width columns, in storage order
+COLUMNS = ("message_type", "direction", "timestamp", "chat", "is_group", "media_size")
+
+# Keys accepted by count_by / sum_by; hour and day are UTC buckets
+GROUP_KEYS = ("message_type", "direction", "chat", "is_group", "hour", "day")
+
+_BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+
+TimeBound = Union[datetime, int, float]
+
+
+def _epoch(value: TimeBound) -> int:
+    """Seconds since the epoch of a datetime (naive means local time) or number"""
+    return int(value.timestamp()) if isinstance(value, datetime) else int(value)
+
+
+def _as_set(value: Any) -> set:
+    """Normalize one filter value (strings and str enums included) or an iterable of them"""
+    if isinstance(value, str) or not isinstance(value, Iterable):
+        return {value}
+    return set(value)
+
+
+class MessageBatch:
+    """
+    Column-oriented batch of parsed messages.
+    
+    Each message becomes one row across compact typed columns: a type code,
+    a direction code, the timestamp as int64 epoch seconds, a dictionary
+    encoded chat ID (index into ``chats``), a group flag and the media size
+    (NO_MEDIA when absent). Filtering and group-by counts run over whole
+    columns, using NumPy when installed and the array module otherwise.
+    
+    The full messages are kept in their compact ``to_bytes()`` encoding so
+    single rows can be materialized on demand; pass ``keep_rows=False`` when
+    only the columns are needed.
+    
+    Example:
+        batch = MessageBatch.from_messages(WebhookHandler.parse_many(ndjson))
+        groups = batch.filter(is_group=True, since=datetime(2024, 1, 1))
+        per_hour = groups.count_by("hour", "message_type")
+        first = groups[0]
+    """
+    
+    def __init__(self, keep_rows: bool = True):
+        """
+        Initialize an empty batch.
+        
+        Args:
+            keep_rows: Keep encoded messages so rows can be materialized (default: True)
+        """
+        self.keep_rows = keep_rows
+        self.message_ids: List[str] = []
+        self.message_type = array("b")
+        self.direction = array("b")
+        self.timestamp = array("q")
+        self.chat = array("i")
+        self.is_group = array("b")
+        self.media_size = array("q")
+        self.chats: List[str] = []
+        self._chat_codes: Dict[str, int] = {}
+        self._rows: Optional[List[bytes]] = [] if keep_rows else None
+    
+    @classmethod
+    def from_messages(
+        cls,
+        messages: Iterable[Optional[WhatsAppMessage]],
+        keep_rows: bool = True
+    ) -> "MessageBatch":
+        """
+        Build a batch from messages, e.g. WebhookHandler.parse_many() output.
+        
+        Args:
+            messages: Messages; None entries (unparsed webhooks) are skipped
+            keep_rows: Keep encoded messages so rows can be materialized (default: True)
+        
+        Returns:
+            New MessageBatch
+        """
+        batch = cls(keep_rows)
+        batch.extend(messages)
+        return batch
+    
+    def _chat_code(self, chat: str) -> int:
+        code = self._chat_codes.get(chat)
+        if code is None:
+            code = self._chat_codes[chat] = len(self.chats)
+            self.chats.append(sys.intern(chat))
+        return code
+    
+    def append(self, message: WhatsAppMessage) -> None:
+        """
+        Add one message as a row.
+        
+        Args:
+            message: Message to add
+        """
+        media_size = message.media_size
+        try:
+            media_size = int(media_size) if media_size is not None else NO_MEDIA
+        except (TypeError, ValueError):
+            media_size = NO_MEDIA
+        
+        self.message_ids.append(message.message_id)
+        self.message_type.append(_TYPE_CODES[message.message_type])
+        self.direction.append(_DIRECTION_CODES[message.direction])
+        self.timestamp.append(int(message.timestamp.timestamp()))
+        self.chat.append(self._chat_code(message.group_id or message.from_number))
+        self.is_group.append(message.is_group)
+        self.media_size.append(media_size)
+        if self._rows is not None:
+            self._rows.append(message.to_bytes())
+    
+    def extend(self, messages: Iterable[Optional[WhatsAppMessage]]) -> int:
+        """
+        Add messages as rows.
+        
+        Args:
+            messages: Messages; None entries are skipped
+        
+        Returns:
+            Number of rows added
+        """
+        added = 0
+        append = self.append
+        for message in messages:
+            if message is not None:
+                append(message)
+                added += 1
+        return added
+    
+    def __len__(self) -> int:
+        return len(self.message_ids)
+    
+    def __getitem__(self, index: int) -> WhatsAppMessage:
+        return self.row(index)
+    
+    def row(self, index: int) -> WhatsAppMessage:
+        """
+        Materialize one row as a WhatsAppMessage.
+        
+        Args:
+            index: Row index (negative values count from the end)
+        
+        Returns:
+            The message as it was added (without raw_data)
+        
+        Raises:
+            ValueError: If the batch was built with keep_rows=False
+            IndexError: If index is out of range
+        """
+        if self._rows is None:
+            raise ValueError("Rows were not kept (keep_rows=False)")
+        return WhatsAppMessage.from_bytes(self._rows[index])
+    
+    def rows(self) -> Iterator[WhatsAppMessage]:
+        """
+        Materialize every row, one at a time.
+        
+        Yields:
+            WhatsAppMessage objects in row order
+        """
+        for index in range(len(self)):
+            yield self.row(index)
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the fixed-width columns"""
+        return sum(len(getattr(self, name)) * getattr(self, name).itemsize for name in COLUMNS)
+    
+    def column(self, name: str) -> Any:
+        """
+        Get a fixed-width column.
+        
+        Args:
+            name: "message_type", "direction", "timestamp", "chat", "is_group" or "media_size"
+        
+        Returns:
+            Zero-copy NumPy view if NumPy is installed, else the underlying
+            array.array; release views before appending rows
+        
+        Raises:
+            ValueError: If the column does not exist
+        """
+        if name not in COLUMNS:
+            raise ValueError(f"Unknown column: {name}")
+        column = getattr(self, name)
+        if numpy is None:
+            return column
+        return numpy.frombuffer(column, dtype=f"i{column.itemsize}")
+    
+    def filter(
+        self,
+        message_type: Union[MessageType, Iterable[MessageType], None] = None,
+        direction: Optional[MessageDirection] = None,
+        chat: Union[str, Iterable[str], None] = None,
+        is_group: Optional[bool] = None,
+        since: Optional[TimeBound] = None,
+        until: Optional[TimeBound] = None
+    ) -> "MessageBatch":
+        """
+        Select the rows matching every given condition.
+        
+        Args:
+            message_type: Type or types to keep
+            direction: Direction to keep
+            chat: Chat ID or IDs to keep (group JID or sender number)
+            is_group: Keep only group (True) or only direct (False) messages
+            since: Keep messages at or after this time (datetime or epoch seconds)
+            until: Keep messages before this time (datetime or epoch seconds)
+        
+        Returns:
+            New MessageBatch with the matching rows
+        """
+        conditions: List[Tuple[str, Any]] = []
+        if message_type is not None:
+            types = _as_set(message_type)
+            conditions.append(("message_type", {_TYPE_CODES[MessageType(t)] for t in types}))
+        if direction is not None:
+            conditions.append(("direction", {_DIRECTION_CODES[MessageDirection(direction)]}))
+        if chat is not None:
+            chats = _as_set(chat)
+            conditions.append((
+                "chat", {self._chat_codes[c] for c in chats if c in self._chat_codes}
+            ))
+        if is_group is not None:
+            conditions.append(("is_group", {int(bool(is_group))}))
+        low = _epoch(since) if since is not None else None
+        high = _epoch(until) if until is not None else None
+        
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+            for name, codes in conditions:
+                mask &= numpy.isin(self.column(name), list(codes))
+            timestamps = self.column("timestamp")
+            if low is not None:
+                mask &= timestamps >= low
+            if high is not None:
+                mask &= timestamps < high
+            return self.take(numpy.flatnonzero(mask))
+        
+        selected: Iterable[int] = range(len(self))
+        for name, codes in conditions:
+            column = getattr(self, name)
+            selected = [index for index in selected if column[index] in codes]
+        timestamps = self.timestamp
+        if low is not None:
+            selected = [index for index in selected if timestamps[index] >= low]
+        if high is not None:
+            selected = [index for index in selected if timestamps[index] < high]
+        return self.take(selected)
+    
+    def take(self, indices: "Union[Sequence[int], numpy.ndarray]") -> "MessageBatch":
+        """
+        Copy the given rows into a new batch.
+        
+        Args:
+            indices: Row indices (a sequence or NumPy integer array), in the order wanted
+        
+        Returns:
+            New MessageBatch sharing this batch's chat dictionary
+        """
+        batch = MessageBatch(self.keep_rows)
+        # Shared, so chat codes stay comparable; new chats only ever get appended
+        batch.chats = self.chats
+        batch._chat_codes = self._chat_codes
+        batch.message_ids = [self.message_ids[index] for index in indices]
+        if self._rows is not None:
+            batch._rows = [self._rows[index] for index in indices]
+        for name in COLUMNS:
+            source = getattr(self, name)
+            target = getattr(batch, name)
+            if numpy is not None:
+                target.frombytes(self.column(name)[numpy.asarray(indices, dtype=int)].tobytes())
+            else:
+                target.extend(source[index] for index in indices)
+        return batch
+    
+    def _group_columns(self, keys: Sequence[str]) -> List[Tuple[Any, Callable[[int], Any]]]:
+        """Integer code column and code decoder per group-by key"""
+        columns: List[Tuple[Any, Callable[[int], Any]]] = []
+        for key in keys:
+            if key == "message_type":
+                columns.append((self.message_type, MESSAGE_TYPES.__getitem__))
+            elif key == "direction":
+                columns.append((self.direction, DIRECTIONS.__getitem__))
+            elif key == "chat":
+                columns.append((self.chat, self.chats.__getitem__))
+            elif key == "is_group":
+                columns.append((self.is_group, bool))
+            elif key in _BUCKET_SECONDS:
+                seconds = _BUCKET_SECONDS[key]
+                
+                def decode(bucket: int, seconds: int = seconds) -> datetime:
+                    return datetime.fromtimestamp(bucket * seconds, timezone.utc)
+                
+                if numpy is not None:
+                    codes = self.column("timestamp") // seconds
+                else:
+                    codes = [timestamp // seconds for timestamp in self.timestamp]
+                columns.append((codes, decode))
+            else:
+                raise ValueError(f"Unknown group key {key!r}, expected one of {GROUP_KEYS}")
+        return columns
+    
+    def _aggregate(
+        self,
+        keys: Sequence[str],
+        weights: Optional[Any] = None
+    ) -> Dict[Any, int]:
+        """Count rows (or sum weights) per distinct key combination"""
+        if not keys:
+            raise ValueError("At least one group key is required")
+        columns = self._group_columns(keys)
+        if len(self) == 0:
+            return {}
+        
+        if numpy is not None:
+            # Fold every key into one int64 code (mixed radix), then reduce once
+            combined = numpy.zeros(len(self), dtype=numpy.int64)
+            bases = []
+            for codes, _ in columns:
+                codes = numpy.asarray(codes, dtype=numpy.int64)
+                base = int(codes.min())
+                radix = int(codes.max()) - base + 1
+                combined = combined * radix + (codes - base)
+                bases.append((base, radix))
+            unique, inverse = numpy.unique(combined, return_inverse=True)
+            if weights is None:
+                totals = numpy.bincount(inverse)
+            else:
+                totals = numpy.bincount(inverse, weights=weights).astype(numpy.int64)
+            
+            result = {}
+            for value, total in zip(unique.tolist(), totals.tolist()):
+                parts = []
+                for base, radix in reversed(bases):
+                    value, code = divmod(value, radix)
+                    parts.append(code + base)
+                decoded = tuple(
+                    decode(code) for (_, decode), code in zip(columns, reversed(parts))
+                )
+                result[decoded if len(decoded) > 1 else decoded[0]] = total
+            return result
+        
+        counter: Counter = Counter()
+        code_rows = zip(*(codes for codes, _ in columns))
+        if weights is None:
+            counter.update(code_rows)
+        else:
+            for codes, weight in zip(code_rows, weights):
+                counter[codes] += weight
+        result = {}
+        # Same order as the NumPy path: ascending codes
+        for codes, total in sorted(counter.items()):
+            decoded = tuple(decode(code) for (_, decode), code in zip(columns, codes))
+            result[decoded if len(decoded) > 1 else decoded[0]] = total
+        return result
+    
+    def count_by(self, *keys: str) -> Dict[Any, int]:
+        """
+        Count rows per distinct key combination.
+        
+        Args:
+            *keys: Group keys from GROUP_KEYS; "hour" and "day" yield the start
+                of the UTC bucket as an aware datetime
+        
+        Returns:
+            Counts keyed by the decoded value, or by a tuple of values for several keys
+        
+        Raises:
+            ValueError: If no key or an unknown key is given
+        """
+        return self._aggregate(keys)
+    
+    def sum_by(self, column: str, *keys: str) -> Dict[Any, int]:
+        """
+        Sum a numeric column per distinct key combination.
+        
+        Args:
+            column: Column to sum; only "media_size" is supported (rows without
+                media count as 0)
+            *keys: Group keys from GROUP_KEYS
+        
+        Returns:
+            Sums keyed like count_by()
+        
+        Raises:
+            ValueError: If the column or a key is not supported
+        """
+        if column != "media_size":
+            raise ValueError(f"Cannot sum column {column!r}")
+        if numpy is not None:
+            weights = numpy.maximum(self.column("media_size"), 0)
+        else:
+            weights = [max(size, 0) for size in self.media_size]
+        return self._aggregate(keys, weights)
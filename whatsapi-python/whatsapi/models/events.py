@@ -0,0 +1,144 @@
+"""Typed models for non-message webhook events"""
+
+from dataclasses import dataclass
+from enum import Enum, Flag
+from typing import Any, ClassVar, Dict, Optional, Union, cast
+
+from .jid import Jid
+from .message import WhatsAppMessage, _with_slots
+
+
+class WebhookEvent(Flag):
+    """
+    Webhook events the library understands.
+    
+    Members combine into subscription masks, e.g.
+    ``WebhookEvent.MESSAGES_UPSERT | WebhookEvent.CONNECTION_UPDATE``.
+    Member names are the Evolution API subscription names.
+    """
+    MESSAGES_UPSERT = 1
+    MESSAGES_UPDATE = 2
+    SEND_MESSAGE = 4
+    CONNECTION_UPDATE = 8
+    QRCODE_UPDATED = 16
+    
+    @property
+    def event_name(self) -> str:
+        """Dotted name used in webhook payloads, e.g. messages.upsert (empty for masks)"""
+        return (self.name or "").lower().replace("_", ".")
+
+
+# Every event setup_webhook subscribes to by default
+ALL_EVENTS = (
+    WebhookEvent.MESSAGES_UPSERT
+    | WebhookEvent.MESSAGES_UPDATE
+    | WebhookEvent.SEND_MESSAGE
+    | WebhookEvent.CONNECTION_UPDATE
+    | WebhookEvent.QRCODE_UPDATED
+)
+
+# Both spellings Evolution uses ("messages.upsert" and "MESSAGES_UPSERT") -> event
+EVENT_NAMES: Dict[str, WebhookEvent] = {}
+for _event in WebhookEvent:
+    EVENT_NAMES[cast(str, _event.name)] = _event
+    EVENT_NAMES[_event.event_name] = _event
+del _event
+
+
+class MessageStatus(str, Enum):
+    """Delivery status reported by messages.update"""
+    ERROR = "ERROR"
+    PENDING = "PENDING"
+    SERVER_ACK = "SERVER_ACK"
+    DELIVERY_ACK = "DELIVERY_ACK"
+    READ = "READ"
+    PLAYED = "PLAYED"
+    DELETED = "DELETED"
+    UNKNOWN = "UNKNOWN"
+    
+    @classmethod
+    def from_value(cls, value: Any) -> "MessageStatus":
+        """
+        Map a status name or a numeric Baileys status code to a MessageStatus.
+        
+        Args:
+            value: Status such as "READ" or 4
+        
+        Returns:
+            MessageStatus, UNKNOWN if not recognized
+        """
+        if isinstance(value, int):
+            return _STATUS_CODES.get(value, cls.UNKNOWN)
+        try:
+            return cls(str(value).upper())
+        except ValueError:
+            return cls.UNKNOWN
+
+
+_STATUS_CODES = {
+    0: MessageStatus.ERROR,
+    1: MessageStatus.PENDING,
+    2: MessageStatus.SERVER_ACK,
+    3: MessageStatus.DELIVERY_ACK,
+    4: MessageStatus.READ,
+    5: MessageStatus.PLAYED,
+}
+
+
+@_with_slots
+@dataclass
+class MessageStatusUpdate:
+    """A messages.update event: the delivery status of a message changed"""
+    
+    event: ClassVar[WebhookEvent] = WebhookEvent.MESSAGES_UPDATE
+    
+    message_id: str
+    remote_jid: Optional[str]
+    from_me: bool
+    status: MessageStatus
+    participant: Optional[str] = None
+    instance: Optional[str] = None
+    raw_data: Optional[Dict[str, Any]] = None
+    
+    @property
+    def chat_jid(self) -> Optional[Jid]:
+        """Jid of the chat the message belongs to"""
+        return Jid.parse(self.remote_jid) if self.remote_jid else None
+
+
+@_with_slots
+@dataclass
+class ConnectionUpdate:
+    """A connection.update event: the instance connection state changed"""
+    
+    event: ClassVar[WebhookEvent] = WebhookEvent.CONNECTION_UPDATE
+    
+    state: str
+    status_reason: Optional[int] = None
+    wuid: Optional[str] = None
+    profile_name: Optional[str] = None
+    instance: Optional[str] = None
+    raw_data: Optional[Dict[str, Any]] = None
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether the instance is connected"""
+        return self.state == "open"
+
+
+@_with_slots
+@dataclass
+class QRCodeUpdate:
+    """A qrcode.updated event: a new pairing QR code is available"""
+    
+    event: ClassVar[WebhookEvent] = WebhookEvent.QRCODE_UPDATED
+    
+    code: Optional[str] = None
+    base64: Optional[str] = None
+    pairing_code: Optional[str] = None
+    instance: Optional[str] = None
+    raw_data: Optional[Dict[str, Any]] = None
+
+
+# What WebhookHandler.parse_event() returns; messages.upsert and send.message yield messages
+WebhookEventModel = Union[WhatsAppMessage, MessageStatusUpdate, ConnectionUpdate, QRCodeUpdate]
@@ -0,0 +1,156 @@
+"""Interned WhatsApp JID value type"""
+
+import re
+from typing import Dict, Optional, Union
+
+USER_SERVER = "s.whatsapp.net"
+GROUP_SERVER = "g.us"
+LID_SERVER = "lid"
+BROADCAST_SERVER = "broadcast"
+
+# Older clients address users as <number>@c.us
+_SERVER_ALIASES = {"c.us": USER_SERVER}
+
+# Evolution's rule for bare values: <creator>-<timestamp> group IDs are at least this long
+_LEGACY_GROUP_LENGTH = 24
+_PHONE_PUNCTUATION = str.maketrans("", "", " +()")
+_NON_DIGITS = re.compile(r"\D")
+
+# Parsed JIDs kept for reuse; the oldest entry is evicted first
+CACHE_SIZE = 65536
+
+_cache: Dict[str, "Jid"] = {}
+
+
+class Jid:
+    """
+    Normalized WhatsApp address: ``<user>@<server>``.
+    
+    Covers individual users (``@s.whatsapp.net``, also written ``@c.us`` or as
+    a plain phone number), groups (``@g.us``), LIDs (``@lid``, privacy
+    identifiers that are not phone numbers) and broadcasts (``@broadcast``,
+    including ``status@broadcast``). Device suffixes (``user:3@server``) are
+    dropped.
+    
+    Create instances with ``Jid.parse()``: results are cached, so a hot chat
+    resolves to the same Jid object, with the same ``jid`` and ``phone``
+    strings, every time. Dictionaries keyed by these strings then compare by
+    identity before comparing characters.
+    
+    Example:
+        jid = Jid.parse("+972501234567")
+        jid.jid      # "972501234567@s.whatsapp.net"
+        jid.phone    # "+972501234567"
+        Jid.parse("120363025246125888@g.us").number  # "120363025246125888@g.us"
+    """
+    
+    __slots__ = ("user", "server", "jid", "phone", "number", "_hash")
+    
+    def __init__(self, user: str, server: str):
+        """
+        Initialize JID. Prefer ``Jid.parse()``, which reuses cached instances.
+        
+        Args:
+            user: User part (phone number, group ID, LID or broadcast ID)
+            server: Server part, e.g. "s.whatsapp.net" or "g.us"
+        """
+        self.user = user
+        self.server = server
+        self.jid = f"{user}@{server}"
+        is_user = server == USER_SERVER
+        self.phone: Optional[str] = f"+{user}" if is_user else None
+        # What the Evolution API accepts as "number": digits for users, the full JID otherwise
+        self.number = user if is_user else self.jid
+        self._hash = hash(self.jid)
+    
+    @classmethod
+    def parse(cls, value: Union[str, "Jid"]) -> "Jid":
+        """
+        Parse a JID or phone number, using the normalization cache.
+        
+        Args:
+            value: JID ("972501234567@s.whatsapp.net", "...@g.us", "...@lid"), phone
+                number in any format ("+1 (555) 123-4567"), legacy group ID, or a Jid
+        
+        Returns:
+            Jid instance
+        
+        Raises:
+            ValueError: If value has no user part, e.g. it is empty or a phone number
+                without digits
+        """
+        if isinstance(value, Jid):
+            return value
+        jid = _cache.get(value)
+        if jid is not None:
+            return jid
+        
+        text = value.strip()
+        user, _, server = text.partition("@")
+        if server:
+            # Unknown servers are kept as they are
+            server = _SERVER_ALIASES.get(server, server)
+            user = user.lstrip("+").partition(":")[0]
+        else:
+            # Same rule as the Evolution API: long <creator>-<timestamp> values are legacy
+            # group IDs, anything else is a phone number and keeps only its digits.
+            # A trailing "@" or a device suffix ("<number>:3") is dropped first.
+            user = user.partition(":")[0].translate(_PHONE_PUNCTUATION)
+            if "-" in user and len(user) >= _LEGACY_GROUP_LENGTH:
+                server = GROUP_SERVER
+            else:
+                user = _NON_DIGITS.sub("", user)
+                server = USER_SERVER
+        if not user:
+            raise ValueError(f"Invalid JID: {value!r}")
+        
+        canonical = f"{user}@{server}"
+        jid = _cache.get(canonical)
+        if jid is None:
+            jid = cls(user, server)
+            _remember(canonical, jid)
+        _remember(value, jid)
+        return jid
+    
+    @property
+    def is_user(self) -> bool:
+        """Whether this is an individual user addressed by phone number"""
+        return self.server == USER_SERVER
+    
+    @property
+    def is_group(self) -> bool:
+        """Whether this is a group"""
+        return self.server == GROUP_SERVER
+    
+    @property
+    def is_lid(self) -> bool:
+        """Whether this is a LID (a privacy identifier, not a phone number)"""
+        return self.server == LID_SERVER
+    
+    @property
+    def is_broadcast(self) -> bool:
+        """Whether this is a broadcast list or status@broadcast"""
+        return self.server == BROADCAST_SERVER
+    
+    def __str__(self) -> str:
+        return self.jid
+    
+    def __repr__(self) -> str:
+        return f"Jid({self.jid!r})"
+    
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, Jid):
+            return self.jid == other.jid
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return self._hash
+
+
+def _remember(key: str, jid: Jid) -> None:
+    """Add a cache entry, evicting the oldest when full"""
+    if len(_cache) >= CACHE_SIZE:
+        _cache.pop(next(iter(_cache)), None)
+    _cache[key] = jid
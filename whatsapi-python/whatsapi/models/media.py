@@ -0,0 +1,131 @@
+"""Handles for media decoded out of webhook payloads"""
+
+import mmap
+import os
+import weakref
+from typing import Any, BinaryIO, Dict, Optional
+
+_COPY_CHUNK_SIZE = 256 * 1024
+
+
+class MediaHandle:
+    """
+    Reference to decoded media stored in a temporary file.
+    
+    The handle is what a message keeps instead of the base64 string. When
+    it was created with ``delete=True`` the file is removed as soon as the
+    handle is garbage collected (or ``unlink()`` is called); call ``save()``
+    to keep a copy.
+    """
+    
+    __slots__ = ("path", "size", "mime_type", "_finalizer", "__weakref__")
+    
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        mime_type: Optional[str] = None,
+        delete: bool = False
+    ):
+        """
+        Initialize handle.
+        
+        Args:
+            path: File holding the decoded media
+            size: Size in bytes
+            mime_type: MIME type reported by the webhook
+            delete: Remove the file when the handle is garbage collected
+        """
+        self.path = path
+        self.size = size
+        self.mime_type = mime_type
+        self._finalizer = weakref.finalize(self, _remove, path) if delete else None
+    
+    def __fspath__(self) -> str:
+        return self.path
+    
+    def __repr__(self) -> str:
+        return f"MediaHandle({self.path!r}, size={self.size}, mime_type={self.mime_type!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert handle to dictionary.
+        
+        Returns:
+            Dictionary with path, size and mime_type
+        """
+        return {"path": self.path, "size": self.size, "mime_type": self.mime_type}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MediaHandle':
+        """
+        Create a handle from to_dict() output. The file is not deleted automatically.
+        
+        Args:
+            data: Dictionary containing handle data
+            
+        Returns:
+            MediaHandle instance
+        """
+        return cls(data["path"], data["size"], data.get("mime_type"))
+    
+    def open(self) -> BinaryIO:
+        """
+        Open the media for reading.
+        
+        Returns:
+            Binary file object
+        """
+        return open(self.path, "rb")
+    
+    def read(self) -> bytes:
+        """
+        Read the whole media into memory.
+        
+        Returns:
+            Decoded media bytes
+        """
+        with self.open() as file:
+            return file.read()
+    
+    def mmap(self) -> mmap.mmap:
+        """
+        Memory-map the media read-only, without copying it into the heap.
+        
+        Returns:
+            Read-only mmap (close it when done)
+        
+        Raises:
+            ValueError: If the media is empty (empty files cannot be mapped)
+        """
+        with self.open() as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def save(self, destination: str) -> None:
+        """
+        Copy the media to a permanent location.
+        
+        Args:
+            destination: Target file path
+        """
+        with self.open() as source, open(destination, "wb") as target:
+            while True:
+                chunk = source.read(_COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                target.write(chunk)
+    
+    def unlink(self) -> None:
+        """Delete the file now"""
+        if self._finalizer is not None:
+            self._finalizer()
+        else:
+            _remove(self.path)
+
+
+def _remove(path: str) -> None:
+    """Delete a file if it still exists"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
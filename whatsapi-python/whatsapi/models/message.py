@@ -1,9 +1,12 @@
 """WhatsApp message models and types"""
 
-from dataclasses import dataclass, field, asdict
+import json
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any
+from .media import MediaHandle
+from .jid import Jid
 
 
 class MessageType(str, Enum):
@@ -16,6 +19,10 @@ class MessageType(str, Enum):
     LOCATION = "location"
     CONTACT = "contact"
     STICKER = "sticker"
+    REACTION = "reaction"
+    POLL = "poll"
+    BUTTON = "button"
+    LIST = "list"
     UNKNOWN = "unknown"
 
 
@@ -25,6 +32,34 @@ class MessageDirection(str, Enum):
     OUTGOING = "outgoing"
 
 
+def _with_slots(cls: type) -> type:
+    """
+    Recreate a dataclass with __slots__ instead of a per-instance __dict__.
+    
+    Equivalent to ``@dataclass(slots=True)``, which requires Python 3.10.
+    A ``__weakref__`` slot is kept so instances stay weak-referenceable.
+    
+    Args:
+        cls: Dataclass to convert
+        
+    Returns:
+        New class with the same fields, methods and properties
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names + ("__weakref__",)
+    for name in field_names:
+        # Defaults live in the generated __init__; class attributes would clash with slots
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    
+    slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+@_with_slots
 @dataclass
 class WhatsAppMessage:
     """
@@ -32,6 +67,10 @@ class WhatsAppMessage:
     
     This class represents a WhatsApp message in a provider-agnostic format.
     It supports all message types and can be created from different provider formats.
+    
+    Instances use __slots__ rather than a per-instance __dict__, which keeps
+    large in-memory message histories compact. Arbitrary extra attributes
+    cannot be set on a message.
     """
     
     # Required fields
@@ -77,19 +116,32 @@ class WhatsAppMessage:
     # Metadata
     raw_data: Optional[Dict[str, Any]] = field(default=None, repr=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    # Inline base64 media spilled to a temporary file (see MediaSpooler)
+    media_file: Optional[MediaHandle] = field(default=None, repr=False)
+    
+    def to_dict(self, include_raw: bool = True) -> Dict[str, Any]:
         """
         Convert message to dictionary.
         
+        Field values are not copied: ``raw_data`` in the result is the same
+        object held by the message.
+        
+        Args:
+            include_raw: Whether to include raw_data (default: True)
+            
         Returns:
             Dictionary representation of the message
         """
-        data = asdict(self)
+        data = {name: getattr(self, name) for name in _FIELD_NAMES}
         # Convert enums to strings
         data['message_type'] = self.message_type.value
         data['direction'] = self.direction.value
         # Convert datetime to ISO format
         data['timestamp'] = self.timestamp.isoformat()
+        if self.media_file is not None:
+            data['media_file'] = self.media_file.to_dict()
+        if not include_raw:
+            del data['raw_data']
         return data
     
     @classmethod
@@ -97,22 +149,91 @@ class WhatsAppMessage:
         """
         Create message from dictionary.
         
+        The input dictionary is not modified.
+        
         Args:
             data: Dictionary containing message data
             
         Returns:
             WhatsAppMessage instance
         """
+        kwargs = dict(data)
         # Convert string enums back to enum types
-        if 'message_type' in data and isinstance(data['message_type'], str):
-            data['message_type'] = MessageType(data['message_type'])
-        if 'direction' in data and isinstance(data['direction'], str):
-            data['direction'] = MessageDirection(data['direction'])
+        if 'message_type' in kwargs and isinstance(kwargs['message_type'], str):
+            kwargs['message_type'] = MessageType(kwargs['message_type'])
+        if 'direction' in kwargs and isinstance(kwargs['direction'], str):
+            kwargs['direction'] = MessageDirection(kwargs['direction'])
         # Convert ISO string to datetime
-        if 'timestamp' in data and isinstance(data['timestamp'], str):
-            data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        if 'timestamp' in kwargs and isinstance(kwargs['timestamp'], str):
+            kwargs['timestamp'] = datetime.fromisoformat(kwargs['timestamp'])
+        if isinstance(kwargs.get('media_file'), dict):
+            kwargs['media_file'] = MediaHandle.from_dict(kwargs['media_file'])
         
-        return cls(**data)
+        return cls(**kwargs)
+    
+    def to_bytes(self, include_raw: bool = False) -> bytes:
+        """
+        Encode message into a compact byte string for queues and caches.
+        
+        The encoding is a positional JSON array (field names are implied by
+        a format version), so it is small, fast to produce with the C JSON
+        encoder and safe to decode from untrusted sources.
+        
+        Args:
+            include_raw: Whether to include raw_data (default: False)
+            
+        Returns:
+            Encoded message
+        """
+        values = [getattr(self, name) for name in _WIRE_FIELDS]
+        values[_WIRE_TYPE_INDEX] = self.message_type.value
+        values[_WIRE_DIRECTION_INDEX] = self.direction.value
+        values[_WIRE_TIMESTAMP_INDEX] = self.timestamp.isoformat()
+        if self.media_file is not None:
+            values[_WIRE_MEDIA_FILE_INDEX] = self.media_file.to_dict()
+        # Trailing unset optional fields are implied
+        while values[-1] is None:
+            values.pop()
+        
+        raw_data = self.raw_data if include_raw else None
+        return json.dumps(
+            [_WIRE_VERSION, raw_data, *values],
+            separators=(",", ":"),
+            ensure_ascii=False
+        ).encode("utf-8")
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'WhatsAppMessage':
+        """
+        Decode a message produced by to_bytes().
+        
+        Args:
+            data: Encoded message
+            
+        Returns:
+            WhatsAppMessage instance
+            
+        Raises:
+            ValueError: If data is not a supported encoding
+        """
+        decoded = json.loads(data)
+        if not isinstance(decoded, list) or not decoded or decoded[0] != _WIRE_VERSION:
+            raise ValueError("Unsupported WhatsAppMessage encoding")
+        
+        kwargs = dict(zip(_WIRE_FIELDS, decoded[2:]))
+        kwargs['message_type'] = MessageType(kwargs['message_type'])
+        kwargs['direction'] = MessageDirection(kwargs['direction'])
+        kwargs['timestamp'] = datetime.fromisoformat(kwargs['timestamp'])
+        kwargs['raw_data'] = decoded[1]
+        if kwargs.get('media_file') is not None:
+            kwargs['media_file'] = MediaHandle.from_dict(kwargs['media_file'])
+        return cls(**kwargs)
+    
+    @property
+    def chat_jid(self) -> Optional[Jid]:
+        """Jid of the conversation: the group for group messages, else from_number"""
+        address = self.group_id or self.from_number
+        return Jid.parse(address) if address else None
     
     @property
     def is_text(self) -> bool:
@@ -147,3 +268,16 @@ class WhatsAppMessage:
             return f"WhatsAppMessage({type_str} from {from_str})"
         else:
             return f"WhatsAppMessage({type_str} from {from_str})"
+
+
+# Field order used by to_dict()
+_FIELD_NAMES = tuple(f.name for f in fields(WhatsAppMessage))
+
+# Positional layout used by to_bytes(); bump _WIRE_VERSION when fields are reordered
+# or removed (appending fields keeps older encodings decodable)
+_WIRE_VERSION = 1
+_WIRE_FIELDS = tuple(name for name in _FIELD_NAMES if name != "raw_data")
+_WIRE_TYPE_INDEX = _WIRE_FIELDS.index("message_type")
+_WIRE_DIRECTION_INDEX = _WIRE_FIELDS.index("direction")
+_WIRE_TIMESTAMP_INDEX = _WIRE_FIELDS.index("timestamp")
+_WIRE_MEDIA_FILE_INDEX = _WIRE_FIELDS.index("media_file")
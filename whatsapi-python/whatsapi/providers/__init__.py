@@ -1,6 +1,71 @@
 """WhatsApp providers package"""
 
-from .base import WhatsAppProvider
-from .evolution import EvolutionAPIProvider
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["WhatsAppProvider", "EvolutionAPIProvider"]
+from .._lazy import export_names, load_export
+
+# Most providers need aiohttp; load each module on first access
+_EXPORTS = {
+    "WhatsAppProvider": ".base",
+    "OutgoingMessage": ".bulk",
+    "SendResult": ".bulk",
+    "BulkSendStats": ".bulk",
+    "TTLCache": ".cache",
+    "CacheStats": ".cache",
+    "EvolutionAPIProvider": ".evolution",
+    "MediaSourceError": ".media",
+    "Outbox": ".outbox",
+    "OutboxStats": ".outbox",
+    "InstancePool": ".pool",
+    "InstancePoolError": ".pool",
+    "RateLimiter": ".ratelimit",
+    "TokenBucket": ".ratelimit",
+    "RateLimitStats": ".ratelimit",
+    "RetryPolicy": ".retry",
+    "CircuitBreaker": ".retry",
+    "SessionManager": ".session",
+    "PoolStats": ".session",
+}
+
+
+def __getattr__(name: str) -> Any:
+    return load_export(__name__, _EXPORTS, name)
+
+
+def __dir__() -> List[str]:
+    return export_names(__name__, _EXPORTS)
+
+
+if TYPE_CHECKING:
+    from .base import WhatsAppProvider
+    from .bulk import OutgoingMessage, SendResult, BulkSendStats
+    from .cache import TTLCache, CacheStats
+    from .evolution import EvolutionAPIProvider
+    from .media import MediaSourceError
+    from .outbox import Outbox, OutboxStats
+    from .pool import InstancePool, InstancePoolError
+    from .ratelimit import RateLimiter, TokenBucket, RateLimitStats
+    from .retry import RetryPolicy, CircuitBreaker
+    from .session import SessionManager, PoolStats
+
+__all__ = [
+    "WhatsAppProvider",
+    "EvolutionAPIProvider",
+    "InstancePool",
+    "InstancePoolError",
+    "OutgoingMessage",
+    "SendResult",
+    "BulkSendStats",
+    "RateLimiter",
+    "TokenBucket",
+    "RateLimitStats",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "SessionManager",
+    "PoolStats",
+    "TTLCache",
+    "CacheStats",
+    "MediaSourceError",
+    "Outbox",
+    "OutboxStats",
+]
@@ -1,7 +1,11 @@
 """Base provider interface for WhatsApp communication"""
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterable, AsyncIterator, Iterable, List, Union
+from . import bulk
+from .bulk import OutgoingMessage, SendResult, BulkSendStats
+from .media import MediaSource
+from ..models.events import WebhookEvent
 
 
 class WhatsAppProvider(ABC):
@@ -58,6 +62,36 @@ class WhatsAppProvider(ABC):
         """
         pass
     
+    async def send_media_file(
+        self,
+        to: str,
+        source: MediaSource,
+        media_type: str,
+        caption: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        file_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a local file as a media message.
+        
+        Providers that can upload files override this; the default raises.
+        
+        Args:
+            to: Recipient phone number
+            source: File path or binary file object
+            media_type: Type of media ("image", "video", "audio", "document")
+            caption: Optional caption for the media
+            mime_type: MIME type (e.g., "image/png", "video/mp4")
+            file_name: Optional filename for documents
+            
+        Returns:
+            Dict containing the API response with message status
+            
+        Raises:
+            NotImplementedError: If the provider cannot upload files
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support send_media_file")
+    
     @abstractmethod
     async def get_instance_status(self) -> Dict[str, Any]:
         """
@@ -77,7 +111,7 @@ class WhatsAppProvider(ABC):
         webhook_url: str,
         webhook_by_events: bool = True,
         webhook_base64: bool = False,
-        events: Optional[list] = None
+        events: Union[List[str], WebhookEvent, None] = None
     ) -> Dict[str, Any]:
         """
         Configure webhook URL for receiving messages.
@@ -86,7 +120,7 @@ class WhatsAppProvider(ABC):
             webhook_url: URL where webhooks will be sent
             webhook_by_events: If True, sends separate requests per event
             webhook_base64: If True, sends files in base64 format
-            events: List of events to subscribe to
+            events: Event names or a WebhookEvent mask to subscribe to
             
         Returns:
             Dict containing webhook configuration status
@@ -117,6 +151,75 @@ class WhatsAppProvider(ABC):
         """
         pass
     
+    def send_many(
+        self,
+        messages: Union[Iterable[OutgoingMessage], AsyncIterable[OutgoingMessage]],
+        max_in_flight: int = 10,
+        max_pending: Optional[int] = None,
+        stats: Optional[BulkSendStats] = None
+    ) -> AsyncIterator[SendResult]:
+        """
+        Send many messages with bounded concurrency.
+        
+        Messages to the same recipient keep their input order; results are
+        yielded as they complete and the source is consumed lazily.
+        
+        Args:
+            messages: Sync or async iterable of OutgoingMessage
+            max_in_flight: Maximum concurrent requests (default: 10)
+            max_pending: Maximum buffered messages (default: 4 * max_in_flight)
+            stats: Optional BulkSendStats updated with sent/failed counts
+            
+        Returns:
+            Async iterator of SendResult, one per message
+        """
+        return bulk.send_many(self, messages, max_in_flight, max_pending, stats)
+    
+    def broadcast(
+        self,
+        recipients: Union[Iterable[str], AsyncIterable[str]],
+        text: Optional[str] = None,
+        media_url: Optional[str] = None,
+        media_type: Optional[str] = None,
+        caption: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        file_name: Optional[str] = None,
+        max_in_flight: int = 10,
+        max_pending: Optional[int] = None,
+        stats: Optional[BulkSendStats] = None
+    ) -> AsyncIterator[SendResult]:
+        """
+        Send the same text or media message to many recipients.
+        
+        Args:
+            recipients: Sync or async iterable of phone numbers
+            text: Text to send (for text messages)
+            media_url: URL of the media file (for media messages)
+            media_type: Type of media ("image", "video", "audio", "document")
+            caption: Optional caption for the media
+            mime_type: Optional MIME type for the media
+            file_name: Optional filename for documents
+            max_in_flight: Maximum concurrent requests (default: 10)
+            max_pending: Maximum buffered messages (default: 4 * max_in_flight)
+            stats: Optional BulkSendStats updated with sent/failed counts
+            
+        Returns:
+            Async iterator of SendResult, one per recipient
+        """
+        async def messages() -> AsyncIterator[OutgoingMessage]:
+            async for to in bulk._aiter(recipients):
+                yield OutgoingMessage(
+                    to=to,
+                    text=text,
+                    media_url=media_url,
+                    media_type=media_type,
+                    caption=caption,
+                    mime_type=mime_type,
+                    file_name=file_name
+                )
+        
+        return self.send_many(messages(), max_in_flight, max_pending, stats)
+    
     async def close(self):
         """
         Close provider resources (e.g., HTTP sessions).
@@ -0,0 +1,216 @@
+"""Bulk sending with bounded concurrency and per-recipient ordering"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING, Any, AsyncGenerator, AsyncIterable, AsyncIterator, Deque, Dict, Iterable,
+    Optional, Set, Tuple, TypeVar, Union
+)
+
+from ..models.jid import Jid
+
+if TYPE_CHECKING:
+    from .base import WhatsAppProvider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class OutgoingMessage:
+    """
+    A single message to send in bulk.
+    
+    Text messages set ``text``; media messages set ``media_url`` and
+    ``media_type`` (plus the optional media fields).
+    """
+    to: str
+    text: Optional[str] = None
+    media_url: Optional[str] = None
+    media_type: Optional[str] = None
+    caption: Optional[str] = None
+    mime_type: Optional[str] = None
+    file_name: Optional[str] = None
+    
+    def __post_init__(self) -> None:
+        if self.text is None and self.media_url is None:
+            raise ValueError("OutgoingMessage requires text or media_url")
+        if self.media_url is not None and self.media_type is None:
+            raise ValueError("OutgoingMessage with media_url requires media_type")
+    
+    @property
+    def recipient_key(self) -> str:
+        """Key used to keep messages to the same recipient in order"""
+        return Jid.parse(self.to).number
+
+
+@dataclass
+class SendResult:
+    """Outcome of one bulk send"""
+    index: int
+    message: OutgoingMessage
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the message was sent successfully"""
+        return self.error is None
+
+
+@dataclass
+class BulkSendStats:
+    """Counters shared by all sends of a send_many / broadcast run"""
+    sent: int = 0
+    failed: int = 0
+    
+    @property
+    def total(self) -> int:
+        """Total number of messages processed"""
+        return self.sent + self.failed
+
+
+async def _aiter(source: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """Iterate a sync or async iterable asynchronously"""
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+
+
+async def _send_one(
+    provider: "WhatsAppProvider",
+    index: int,
+    message: OutgoingMessage
+) -> SendResult:
+    """Send one message, capturing any failure in the result"""
+    try:
+        # __post_init__ guarantees media_type with media_url, and text otherwise
+        if message.media_url is not None and message.media_type is not None:
+            response = await provider.send_media_message(
+                to=message.to,
+                media_url=message.media_url,
+                media_type=message.media_type,
+                caption=message.caption,
+                mime_type=message.mime_type,
+                file_name=message.file_name
+            )
+        else:
+            response = await provider.send_text_message(message.to, message.text or "")
+        return SendResult(index=index, message=message, response=response)
+    except Exception as e:
+        return SendResult(index=index, message=message, error=e)
+
+
+async def send_many(
+    provider: "WhatsAppProvider",
+    messages: Union[Iterable[OutgoingMessage], AsyncIterable[OutgoingMessage]],
+    max_in_flight: int = 10,
+    max_pending: Optional[int] = None,
+    stats: Optional[BulkSendStats] = None
+) -> AsyncGenerator[SendResult, None]:
+    """
+    Send messages with bounded concurrency, yielding results as they complete.
+    
+    Messages to the same recipient are sent one after another in input order;
+    different recipients are sent concurrently, at most ``max_in_flight`` at a
+    time. The source is consumed lazily: at most ``max_pending`` messages are
+    buffered (in flight, queued behind a recipient, or awaiting the consumer),
+    so arbitrarily large sources run in constant memory.
+    
+    Args:
+        provider: Provider used to send each message
+        messages: Sync or async iterable of OutgoingMessage
+        max_in_flight: Maximum concurrent requests (default: 10)
+        max_pending: Maximum buffered messages (default: 4 * max_in_flight)
+        stats: Optional BulkSendStats updated with sent/failed counts
+    
+    Yields:
+        SendResult for every message, in completion order; messages with an invalid
+        recipient fail with a ValueError without being sent
+    
+    Raises:
+        ValueError: If max_in_flight or max_pending is not positive
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    if max_pending is None:
+        max_pending = max_in_flight * 4
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+    if stats is None:
+        stats = BulkSendStats()
+    
+    in_flight = asyncio.Semaphore(max_in_flight)
+    capacity = asyncio.Semaphore(max_pending)
+    results: "asyncio.Queue[Any]" = asyncio.Queue()
+    lanes: Dict[str, Deque[Tuple[int, OutgoingMessage]]] = {}
+    tasks: Set["asyncio.Task[None]"] = set()
+    done = object()
+    
+    async def run_lane(key: str, lane: Deque[Tuple[int, OutgoingMessage]]) -> None:
+        while lane:
+            index, message = lane.popleft()
+            async with in_flight:
+                result = await _send_one(provider, index, message)
+            results.put_nowait(result)
+        # No await since the final emptiness check, so no message can be lost
+        del lanes[key]
+    
+    async def produce() -> None:
+        count = 0
+        try:
+            async for message in _aiter(messages):
+                await capacity.acquire()
+                try:
+                    key = message.recipient_key
+                except ValueError as e:
+                    # A bad recipient fails its own message, not the whole run
+                    results.put_nowait(SendResult(index=count, message=message, error=e))
+                    count += 1
+                    continue
+                lane = lanes.get(key)
+                if lane is not None:
+                    lane.append((count, message))
+                else:
+                    lane = lanes[key] = deque([(count, message)])
+                    task = asyncio.ensure_future(run_lane(key, lane))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                count += 1
+        except Exception as e:
+            results.put_nowait((done, count, e))
+        else:
+            results.put_nowait((done, count, None))
+    
+    producer = asyncio.ensure_future(produce())
+    total: Optional[int] = None
+    yielded = 0
+    source_error: Optional[Exception] = None
+    try:
+        while total is None or yielded < total:
+            item = await results.get()
+            if isinstance(item, tuple) and item[0] is done:
+                _, total, source_error = item
+                continue
+            
+            if item.ok:
+                stats.sent += 1
+            else:
+                stats.failed += 1
+            yielded += 1
+            capacity.release()
+            yield item
+        
+        if source_error is not None:
+            raise source_error
+    finally:
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+        logger.info(f"Bulk send finished: {stats.sent} sent, {stats.failed} failed")
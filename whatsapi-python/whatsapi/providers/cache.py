@@ -0,0 +1,154 @@
+"""LRU + TTL cache with single-flight request coalescing"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Cache hit/miss counters"""
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered without a new fetch"""
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed time-to-live.
+    
+    ``get_or_fetch`` coalesces concurrent misses for the same key: only the
+    first caller runs the fetch, everyone else awaits its result. Failed
+    fetches are not cached. Cached values are shared between callers and
+    must not be mutated.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize cache.
+        
+        Args:
+            maxsize: Maximum number of entries (default: 1024)
+            ttl: Seconds an entry stays valid (default: 60)
+            clock: Monotonic clock function (default: time.monotonic)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.stats = CacheStats()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a fresh cached value without fetching.
+        
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+        
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+    
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a cached entry.
+        
+        A fetch already in flight still answers its waiters, but its result
+        is not cached and later lookups start a new fetch.
+        
+        Args:
+            key: Cache key
+        """
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._entries.clear()
+        self._inflight.clear()
+    
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached value, fetching it once on a miss.
+        
+        Args:
+            key: Cache key
+            fetch: Coroutine function producing the value
+        
+        Returns:
+            Cached or freshly fetched value
+        
+        Raises:
+            Exception: Whatever the fetch raised
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self.stats.hits += 1
+            return value
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(inflight)
+        
+        self.stats.misses += 1
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        
+        def store(done: "asyncio.Future[Any]") -> None:
+            # Retrieving the exception also silences "never retrieved" warnings
+            failed = done.cancelled() or done.exception() is not None
+            if self._inflight.get(key) is not done:
+                return  # Invalidated while in flight
+            del self._inflight[key]
+            if not failed:
+                self.set(key, done.result())
+        
+        task.add_done_callback(store)
+        # Shielded so one cancelled caller does not fail the others
+        return await asyncio.shield(task)
+
@@ -1,12 +1,37 @@
 """Evolution API provider implementation"""
 
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import mimetypes
+import os
+import time
+import yarl
+from typing import Dict, Any, List, Optional, Tuple, Union, cast
 from .base import WhatsAppProvider
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, CircuitBreaker
+from .session import SessionManager, PoolStats
+from .cache import TTLCache
+from .media import Base64JSONBody, MediaSource, MediaSink, DOWNLOAD_CHUNK_SIZE, write_stream
+from ..models.message import WhatsAppMessage
+from ..models.jid import Jid
+from ..models.events import ALL_EVENTS, WebhookEvent
+from ..metrics import MetricsHook, get_metrics_hook
+from ..codec import JSONCodec, get_json_codec
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_MEDIA_TYPES = ("image", "video", "audio", "document")
+
+# Used when no MIME type is given or can be guessed from the file name
+DEFAULT_MIME_TYPES = {
+    "image": "image/png",
+    "video": "video/mp4",
+    "audio": "audio/ogg",
+    "document": "application/pdf"
+}
+
 
 class EvolutionAPIError(Exception):
     """Base exception for Evolution API errors"""
@@ -23,6 +48,34 @@ class EvolutionAPITimeoutError(EvolutionAPIError):
     pass
 
 
+class EvolutionAPICircuitOpenError(EvolutionAPIConnectionError):
+    """Raised without sending a request while the circuit breaker is open"""
+    pass
+
+
+def _status_label(error: BaseException) -> str:
+    """Metrics status label for a failed request"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return str(error.status)
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    return "connection_error"
+
+
+def _chat_address(to: str) -> Tuple[str, str]:
+    """
+    remoteJid and rate-limit key of a chat.
+    
+    Addresses Jid cannot normalize (e.g. taken from an unusual webhook) are
+    passed through as given, so the API can still match the message key.
+    """
+    try:
+        jid = Jid.parse(to)
+    except ValueError:
+        return to, to
+    return jid.jid, jid.number
+
+
 class EvolutionAPIProvider(WhatsAppProvider):
     """
     Evolution API provider implementation.
@@ -37,7 +90,16 @@ class EvolutionAPIProvider(WhatsAppProvider):
         api_key: str,
         instance_name: str,
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        session_manager: Optional[SessionManager] = None,
+        profile_picture_cache: Optional[TTLCache] = None,
+        status_cache: Optional[TTLCache] = None,
+        max_concurrent_transfers: int = 4,
+        metrics: Optional[MetricsHook] = None,
+        json_codec: Optional[JSONCodec] = None
     ):
         """
         Initialize Evolution API provider.
@@ -47,14 +109,45 @@ class EvolutionAPIProvider(WhatsAppProvider):
             api_key: API key for authentication
             instance_name: WhatsApp instance name
             timeout: Request timeout in seconds (default: 30)
-            max_retries: Maximum number of retry attempts (default: 3)
+            max_retries: Maximum number of retry attempts (default: 3),
+                used when no retry_policy is given
+            rate_limiter: Optional RateLimiter applied to every request, retries included
+            retry_policy: Optional RetryPolicy (default: exponential backoff with jitter)
+            circuit_breaker: Optional CircuitBreaker to fail fast while the API is down
+            session_manager: Optional SessionManager shared with other providers;
+                if omitted the provider gets a private pool that close() shuts down
+            profile_picture_cache: Optional TTLCache for get_profile_picture results
+            status_cache: Optional TTLCache for get_instance_status results
+            max_concurrent_transfers: Media uploads/downloads running at once (default: 4)
+            metrics: Optional MetricsHook for this provider (default: the hook installed
+                with set_metrics_hook, if any)
+            json_codec: Optional JSONCodec for request bodies and responses (default: the
+                codec installed with set_json_codec)
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.instance_name = instance_name
         self.timeout = timeout
-        self.max_retries = max_retries
-        self._session: Optional[aiohttp.ClientSession] = None
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self.max_retries = self.retry_policy.max_retries
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.profile_picture_cache = profile_picture_cache
+        self.status_cache = status_cache
+        self._owns_session = session_manager is None
+        self._session_manager = session_manager or SessionManager(json_codec=json_codec)
+        # Sent per request so a shared session can serve any instance and API key
+        self._headers = {"apikey": api_key}
+        self._json_headers = {**self._headers, "Content-Type": "application/json"}
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        # Large media may take longer than `timeout` in total, but must keep moving
+        self._transfer_timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=timeout, sock_read=timeout
+        )
+        self.max_concurrent_transfers = max_concurrent_transfers
+        self.metrics = metrics
+        self.json_codec = json_codec
+        self._transfers: Optional[asyncio.Semaphore] = None
         
         logger.info(
             f"Evolution API Provider initialized: {base_url} "
@@ -69,6 +162,16 @@ class EvolutionAPIProvider(WhatsAppProvider):
         """Context manager exit"""
         await self.close()
     
+    @property
+    def session_manager(self) -> SessionManager:
+        """Session manager providing this provider's connection pool"""
+        return self._session_manager
+    
+    @property
+    def pool_stats(self) -> PoolStats:
+        """Connection reuse counters of the (possibly shared) pool"""
+        return self._session_manager.stats
+    
     async def _get_session(self) -> aiohttp.ClientSession:
         """
         Get or create aiohttp session.
@@ -76,63 +179,138 @@ class EvolutionAPIProvider(WhatsAppProvider):
         Returns:
             Active aiohttp ClientSession
         """
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                headers={"apikey": self.api_key},
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            )
-            logger.debug("Created new aiohttp session")
-        return self._session
+        return await self._session_manager.get_session()
     
     async def _make_request(
         self,
         method: str,
         endpoint: str,
         json_data: Optional[Dict[str, Any]] = None,
-        retry_count: int = 0
+        recipient: Optional[str] = None,
+        body: Optional[Base64JSONBody] = None
     ) -> Dict[str, Any]:
         """
         Make HTTP request to Evolution API with retry logic.
         
+        Transient failures are retried according to the retry policy, waiting
+        between attempts. While the circuit breaker is open, requests fail
+        immediately without reaching the network.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
             json_data: JSON payload for request body
-            retry_count: Current retry attempt number
+            recipient: Recipient number, used for per-recipient rate limiting
+            body: Streamed JSON body sent instead of json_data
             
         Returns:
             JSON response from API
             
         Raises:
+            EvolutionAPICircuitOpenError: If the circuit breaker is open
             aiohttp.ClientError: If request fails after all retries
+            asyncio.TimeoutError: If request times out after all retries
         """
-        session = await self._get_session()
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        metrics = self.metrics if self.metrics is not None else get_metrics_hook()
         url = f"{self.base_url}{endpoint}"
+        attempt = 0
+        if metrics is not None:
+            # Drop the instance name so every instance shares the same series
+            label = endpoint
+            if endpoint.endswith(f"/{self.instance_name}"):
+                label = endpoint[:-len(self.instance_name) - 1]
+        codec = self.json_codec or get_json_codec()
+        if body is not None:
+            request_options = {"headers": self._json_headers, "timeout": self._transfer_timeout}
+        elif json_data is not None:
+            request_options = {
+                "data": codec.dumpb(json_data),
+                "headers": self._json_headers,
+                "timeout": self._timeout
+            }
+        else:
+            request_options = {"headers": self._headers, "timeout": self._timeout}
         
-        try:
-            async with session.request(method, url, json=json_data) as response:
-                response.raise_for_status()
-                result = await response.json()
-                logger.debug(f"Request successful: {method} {endpoint}")
-                return result
+        while True:
+            if breaker is not None and not breaker.allow_request():
+                if metrics is not None:
+                    metrics.request_started(method, label)
+                    metrics.request_finished(method, label, "circuit_open", 0.0)
+                raise EvolutionAPICircuitOpenError(
+                    f"Circuit open for {self.base_url}, "
+                    f"retry in {breaker.retry_in:.1f}s: {method} {endpoint}"
+                )
+            
+            try:
+                if self.rate_limiter is not None:
+                    waited = await self.rate_limiter.acquire(recipient)
+                    if waited:
+                        logger.debug(f"Rate limited {method} {endpoint} for {waited:.3f}s")
                 
-        except aiohttp.ClientError as e:
-            logger.error(f"Request failed: {method} {endpoint} - {e}")
+                session = await self._get_session()
+            except BaseException:
+                # allow_request() may have handed out the half-open probe; give it back
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            if metrics is not None:
+                metrics.request_started(method, label)
+                started = time.perf_counter()
             
-            # Retry logic
-            if retry_count < self.max_retries:
-                logger.info(f"Retrying... (attempt {retry_count + 1}/{self.max_retries})")
-                return await self._make_request(method, endpoint, json_data, retry_count + 1)
+            try:
+                if body is not None:
+                    request_options["data"] = body()
+                async with session.request(method, url, **request_options) as response:
+                    response.raise_for_status()
+                    content = await response.read()
+                    result = codec.loads(content) if content.strip() else None
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Request failed: {method} {endpoint} - {e}")
+                if metrics is not None:
+                    metrics.request_finished(
+                        method, label, _status_label(e), time.perf_counter() - started
+                    )
+                if breaker is not None:
+                    breaker.record_failure(e)
+                
+                if attempt >= policy.max_retries or not policy.is_retryable(e):
+                    raise
+                
+                if metrics is not None:
+                    metrics.request_retried(method, label)
+                delay = policy.get_delay(attempt, e)
+                attempt += 1
+                logger.info(
+                    f"Retrying in {delay:.2f}s... (attempt {attempt}/{policy.max_retries})"
+                )
+                await asyncio.sleep(delay)
+                continue
+                
+            except BaseException:
+                if metrics is not None:
+                    metrics.request_finished(method, label, "error", time.perf_counter() - started)
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
             
-            # Max retries reached
-            raise
+            if metrics is not None:
+                metrics.request_finished(
+                    method, label, str(response.status), time.perf_counter() - started
+                )
+            if breaker is not None:
+                breaker.record_success()
+            logger.debug(f"Request successful: {method} {endpoint}")
+            return result
     
     async def send_text_message(self, to: str, text: str) -> Dict[str, Any]:
         """
         Send text message via Evolution API.
         
         Args:
-            to: Recipient phone number (e.g., "+972501234567")
+            to: Recipient phone number (e.g., "+972501234567") or JID
             text: Message text content
             
         Returns:
@@ -141,8 +319,8 @@ class EvolutionAPIProvider(WhatsAppProvider):
         Raises:
             aiohttp.ClientError: If message sending fails
         """
-        # Remove + from phone number if present
-        number = to.lstrip('+')
+        # Normalize phone number or JID ("+972..." -> "972...", groups keep their JID)
+        number = Jid.parse(to).number
         
         endpoint = f"/message/sendText/{self.instance_name}"
         payload = {
@@ -151,7 +329,7 @@ class EvolutionAPIProvider(WhatsAppProvider):
         }
         
         logger.info(f"Sending text message to {to}")
-        return await self._make_request("POST", endpoint, payload)
+        return await self._make_request("POST", endpoint, payload, recipient=number)
     
     async def send_media_message(
         self,
@@ -166,7 +344,7 @@ class EvolutionAPIProvider(WhatsAppProvider):
         Send media message via Evolution API.
         
         Args:
-            to: Recipient phone number
+            to: Recipient phone number or JID
             media_url: URL of the media file to send
             media_type: Type of media ("image", "video", "audio", "document")
             caption: Optional caption for the media
@@ -180,34 +358,153 @@ class EvolutionAPIProvider(WhatsAppProvider):
             ValueError: If media_type is not supported
             aiohttp.ClientError: If message sending fails
         """
-        # Remove + from phone number if present
-        number = to.lstrip('+')
+        # Normalize phone number or JID ("+972..." -> "972...", groups keep their JID)
+        number = Jid.parse(to).number
+        
+        endpoint = f"/message/sendMedia/{self.instance_name}"
+        payload = self._media_fields(number, media_type, mime_type, caption, file_name)
+        payload["media"] = media_url
+        
+        logger.info(f"Sending {media_type} message to {to}")
+        return await self._make_request("POST", endpoint, payload, recipient=number)
+    
+    async def send_media_file(
+        self,
+        to: str,
+        source: MediaSource,
+        media_type: str,
+        caption: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        file_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a local file as a media message, streaming it as base64.
+        
+        The file is encoded chunk by chunk while the request body is being
+        sent, so memory use stays flat regardless of file size.
+        
+        Args:
+            to: Recipient phone number or JID
+            source: File path or binary file object (seekable, so the upload can be retried)
+            media_type: Type of media ("image", "video", "audio", "document")
+            caption: Optional caption for the media
+            mime_type: MIME type; guessed from the file name if omitted
+            file_name: File name shown to the recipient; defaults to the path's base name
+            
+        Returns:
+            Dict containing the API response with message status
+            
+        Raises:
+            ValueError: If media_type is not supported
+            MediaSourceError: If a retry is needed but the file object is not seekable
+            aiohttp.ClientError: If message sending fails
+        """
+        number = Jid.parse(to).number
+        
+        if file_name is None:
+            if isinstance(source, (str, os.PathLike)):
+                path: Any = source
+            else:
+                path = getattr(source, "name", None)
+            if isinstance(path, (str, os.PathLike)):
+                file_name = os.path.basename(os.fspath(path))
+        if not mime_type and file_name:
+            mime_type = mimetypes.guess_type(file_name)[0]
+        
+        endpoint = f"/message/sendMedia/{self.instance_name}"
+        fields = self._media_fields(number, media_type, mime_type, caption, file_name)
+        
+        logger.info(f"Sending {media_type} file to {to}")
+        async with self._transfer_slot():
+            return await self._make_request(
+                "POST", endpoint, recipient=number, body=Base64JSONBody(fields, source)
+            )
+    
+    async def download_media(
+        self,
+        media: Union[str, WhatsAppMessage],
+        destination: MediaSink,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> int:
+        """
+        Stream media to a file or async sink without loading it into memory.
+        
+        The API key is only sent when the URL points at the Evolution API
+        itself. Downloads are not retried, since part of the data may already
+        have been written.
+        
+        Args:
+            media: Media URL, or a WhatsAppMessage whose media_url is downloaded
+            destination: File path, binary file object, or coroutine function taking each chunk
+            chunk_size: Bytes per chunk (default: 64 KiB)
+            
+        Returns:
+            Number of bytes written
+            
+        Raises:
+            ValueError: If the message has no media URL
+            aiohttp.ClientError: If the download fails
+        """
+        url = media.media_url if isinstance(media, WhatsAppMessage) else media
+        if not url:
+            raise ValueError("Message has no media_url to download")
+        headers = self._headers if self._is_own_url(url) else None
         
-        # Supported media types
-        supported_types = ["image", "video", "audio", "document"]
+        async with self._transfer_slot():
+            session = await self._get_session()
+            async with session.get(
+                url, headers=headers, timeout=self._transfer_timeout
+            ) as response:
+                response.raise_for_status()
+                written = await write_stream(
+                    response.content.iter_chunked(chunk_size), destination
+                )
+        
+        logger.debug(f"Downloaded {written} bytes of media")
+        return written
+    
+    def _is_own_url(self, url: str) -> bool:
+        """Whether a URL has the API's scheme, host and port, so it may receive the API key"""
+        target, own = yarl.URL(url), yarl.URL(self.base_url)
+        # .port falls back to the scheme's default, so ":80" and no port compare equal
+        return target.is_absolute() and (target.scheme, target.host, target.port) == (
+            own.scheme, own.host, own.port
+        )
+    
+    def _transfer_slot(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent media transfers (created on first use)"""
+        if self._transfers is None:
+            self._transfers = asyncio.Semaphore(self.max_concurrent_transfers)
+        return self._transfers
+    
+    @staticmethod
+    def _media_fields(
+        number: str,
+        media_type: str,
+        mime_type: Optional[str],
+        caption: Optional[str],
+        file_name: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Build the sendMedia payload without the media itself.
         
-        if media_type not in supported_types:
+        Raises:
+            ValueError: If media_type is not supported
+        """
+        if media_type not in SUPPORTED_MEDIA_TYPES:
             raise ValueError(
                 f"Unsupported media_type: {media_type}. "
-                f"Supported types: {', '.join(supported_types)}"
+                f"Supported types: {', '.join(SUPPORTED_MEDIA_TYPES)}"
             )
         
         # Auto-detect MIME type if not provided
         if not mime_type:
-            mime_map = {
-                "image": "image/png",
-                "video": "video/mp4",
-                "audio": "audio/ogg",
-                "document": "application/pdf"
-            }
-            mime_type = mime_map.get(media_type, "application/octet-stream")
+            mime_type = DEFAULT_MIME_TYPES.get(media_type, "application/octet-stream")
         
-        endpoint = f"/message/sendMedia/{self.instance_name}"
         payload = {
             "number": number,
             "mediatype": media_type,
-            "mimetype": mime_type,
-            "media": media_url
+            "mimetype": mime_type
         }
         
         if caption:
@@ -216,8 +513,7 @@ class EvolutionAPIProvider(WhatsAppProvider):
         if file_name:
             payload["fileName"] = file_name
         
-        logger.info(f"Sending {media_type} message to {to}")
-        return await self._make_request("POST", endpoint, payload)
+        return payload
     
     async def get_instance_status(self) -> Dict[str, Any]:
         """
@@ -231,15 +527,29 @@ class EvolutionAPIProvider(WhatsAppProvider):
         """
         endpoint = f"/instance/connectionState/{self.instance_name}"
         
+        if self.status_cache is not None:
+            status: Dict[str, Any] = await self.status_cache.get_or_fetch(
+                self.instance_name,
+                lambda: self._make_request("GET", endpoint)
+            )
+            return status
+        
         logger.info(f"Checking instance status: {self.instance_name}")
         return await self._make_request("GET", endpoint)
     
+    def invalidate_instance_status(self) -> None:
+        """
+        Drop the cached instance status (e.g. on a CONNECTION_UPDATE webhook).
+        """
+        if self.status_cache is not None:
+            self.status_cache.invalidate(self.instance_name)
+    
     async def setup_webhook(
         self,
         webhook_url: str,
         webhook_by_events: bool = True,
         webhook_base64: bool = False,
-        events: Optional[list] = None
+        events: Union[List[str], WebhookEvent, None] = None
     ) -> Dict[str, Any]:
         """
         Configure webhook URL for receiving messages.
@@ -248,7 +558,8 @@ class EvolutionAPIProvider(WhatsAppProvider):
             webhook_url: URL where webhooks will be sent
             webhook_by_events: If True, sends separate requests per event
             webhook_base64: If True, sends files in base64 format
-            events: List of events to subscribe to (uses defaults if None)
+            events: Event names or a WebhookEvent mask to subscribe to (default: every
+                event WebhookHandler.parse_event() understands)
             
         Returns:
             Dict containing webhook configuration status
@@ -257,13 +568,9 @@ class EvolutionAPIProvider(WhatsAppProvider):
             aiohttp.ClientError: If webhook setup fails
         """
         if events is None:
-            events = [
-                "QRCODE_UPDATED",
-                "MESSAGES_UPSERT",
-                "MESSAGES_UPDATE",
-                "SEND_MESSAGE",
-                "CONNECTION_UPDATE"
-            ]
+            events = ALL_EVENTS
+        if isinstance(events, WebhookEvent):
+            events = [cast(str, event.name) for event in WebhookEvent if event in events]
         
         endpoint = f"/webhook/set/{self.instance_name}"
         payload = {
@@ -287,7 +594,7 @@ class EvolutionAPIProvider(WhatsAppProvider):
         
         Args:
             message_id: ID of the message to delete
-            to: Phone number of the chat where message exists
+            to: Phone number or JID (e.g. a group) of the chat where message exists
             
         Returns:
             Dict containing deletion status
@@ -295,17 +602,16 @@ class EvolutionAPIProvider(WhatsAppProvider):
         Raises:
             aiohttp.ClientError: If deletion fails
         """
-        # Remove + from phone number if present
-        number = to.lstrip('+')
+        remote_jid, number = _chat_address(to)
         
         endpoint = f"/message/delete/{self.instance_name}"
         payload = {
             "id": message_id,
-            "remoteJid": f"{number}@s.whatsapp.net"
+            "remoteJid": remote_jid
         }
         
         logger.info(f"Deleting message {message_id}")
-        return await self._make_request("DELETE", endpoint, payload)
+        return await self._make_request("DELETE", endpoint, payload, recipient=number)
     
     async def send_reaction(
         self,
@@ -319,7 +625,7 @@ class EvolutionAPIProvider(WhatsAppProvider):
         
         Args:
             message_id: ID of the message to react to
-            to: Phone number of the chat
+            to: Phone number or JID (e.g. a group) of the chat
             emoji: Emoji to react with
             from_me: Whether the message was sent by you
             
@@ -329,13 +635,12 @@ class EvolutionAPIProvider(WhatsAppProvider):
         Raises:
             aiohttp.ClientError: If reaction fails
         """
-        # Remove + from phone number if present
-        number = to.lstrip('+')
+        remote_jid, number = _chat_address(to)
         
         endpoint = f"/message/sendReaction/{self.instance_name}"
         payload = {
             "key": {
-                "remoteJid": f"{number}@s.whatsapp.net",
+                "remoteJid": remote_jid,
                 "fromMe": from_me,
                 "id": message_id
             },
@@ -343,14 +648,14 @@ class EvolutionAPIProvider(WhatsAppProvider):
         }
         
         logger.info(f"Sending reaction {emoji} to message {message_id}")
-        return await self._make_request("POST", endpoint, payload)
+        return await self._make_request("POST", endpoint, payload, recipient=number)
     
     async def get_profile_picture(self, phone: str) -> Dict[str, Any]:
         """
         Get profile picture URL for a phone number.
         
         Args:
-            phone: Phone number to get profile picture for
+            phone: Phone number or JID to get profile picture for
             
         Returns:
             Dict containing profile picture URL
@@ -358,21 +663,43 @@ class EvolutionAPIProvider(WhatsAppProvider):
         Raises:
             aiohttp.ClientError: If request fails
         """
-        # Remove + from phone number if present
-        number = phone.lstrip('+')
+        number = Jid.parse(phone).number
         
         endpoint = f"/chat/fetchProfilePictureUrl/{self.instance_name}"
         payload = {
             "number": number
         }
         
+        if self.profile_picture_cache is not None:
+            picture: Dict[str, Any] = await self.profile_picture_cache.get_or_fetch(
+                number,
+                lambda: self._make_request("POST", endpoint, payload)
+            )
+            return picture
+        
         logger.info(f"Fetching profile picture for {phone}")
         return await self._make_request("POST", endpoint, payload)
     
+    def invalidate_profile_picture(self, phone: Optional[str] = None) -> None:
+        """
+        Drop cached profile pictures.
+        
+        Args:
+            phone: Phone number to invalidate; all entries are dropped if omitted
+        """
+        if self.profile_picture_cache is None:
+            return
+        if phone is None:
+            self.profile_picture_cache.clear()
+        else:
+            self.profile_picture_cache.invalidate(Jid.parse(phone).number)
+    
     async def close(self):
         """
         Close HTTP session and cleanup resources.
+        
+        A shared session manager passed in by the caller is left open.
         """
-        if self._session and not self._session.closed:
-            await self._session.close()
+        if self._owns_session and not self._session_manager.closed:
+            await self._session_manager.close()
             logger.info("Evolution API session closed")
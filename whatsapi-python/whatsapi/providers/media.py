@@ -0,0 +1,149 @@
+"""Chunked media transfer helpers: streamed base64 upload bodies and download sinks"""
+
+import asyncio
+import base64
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Optional, Union, cast
+
+# Multiple of 3 so every chunk encodes to base64 without padding
+UPLOAD_CHUNK_SIZE = 3 * 64 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+MediaSource = Union[str, "os.PathLike[str]", BinaryIO]
+MediaSink = Union[str, "os.PathLike[str]", BinaryIO, Callable[[bytes], Awaitable[Any]]]
+
+
+class MediaSourceError(Exception):
+    """Raised when an upload source cannot be read (again)"""
+    pass
+
+
+class Base64JSONBody:
+    """
+    Replayable JSON request body whose ``media`` field is streamed as base64.
+    
+    The file is read and encoded one chunk at a time, so memory use does not
+    depend on the file size. Each call returns a fresh async iterator that
+    starts from the beginning of the source, which lets the request be
+    retried; file objects must be seekable for that.
+    """
+    
+    def __init__(
+        self,
+        fields: Dict[str, Any],
+        source: MediaSource,
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+    ):
+        """
+        Initialize body.
+        
+        Args:
+            fields: JSON fields sent before ``media``
+            source: File path or binary file object opened for reading
+            chunk_size: Bytes read per chunk, rounded down to a multiple of 3
+        """
+        self.fields = fields
+        self.source = source
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self._start: Optional[int] = None
+        self._uses = 0
+        if not isinstance(source, (str, os.PathLike)):
+            try:
+                self._start = source.tell()
+            except (AttributeError, OSError):
+                self._start = None
+    
+    def __call__(self) -> AsyncIterator[bytes]:
+        """
+        Return an async iterator over the encoded body.
+        
+        Raises:
+            MediaSourceError: If called again for a file object that cannot seek back
+        """
+        replay = self._uses > 0
+        if replay and self._start is None and not isinstance(self.source, (str, os.PathLike)):
+            raise MediaSourceError("Cannot resend media from a non-seekable file object")
+        self._uses += 1
+        return self._generate(replay)
+    
+    async def _generate(self, replay: bool) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        head = json.dumps(self.fields)
+        head = (head[:-1] + ", " if len(head) > 2 else "{") + '"media": "'
+        yield head.encode()
+        
+        file: BinaryIO
+        source = self.source
+        if isinstance(source, (str, os.PathLike)):
+            file = await loop.run_in_executor(None, open, source, "rb")
+            owned = True
+        else:
+            file = source
+            owned = False
+            # __call__ refused replays of file objects without a start offset
+            if replay and self._start is not None:
+                await loop.run_in_executor(None, file.seek, self._start)
+        
+        try:
+            pending = b""
+            while True:
+                chunk = await loop.run_in_executor(None, file.read, self.chunk_size)
+                if not chunk:
+                    break
+                if pending:
+                    chunk = pending + chunk
+                # Short reads are carried over so only the last chunk gets padding
+                cut = len(chunk) - len(chunk) % 3
+                pending = chunk[cut:]
+                if cut:
+                    yield base64.b64encode(chunk[:cut])
+            if pending:
+                yield base64.b64encode(pending)
+        finally:
+            if owned:
+                await loop.run_in_executor(None, file.close)
+        
+        yield b'"}'
+
+
+async def write_stream(
+    chunks: AsyncIterator[bytes],
+    destination: MediaSink
+) -> int:
+    """
+    Write an async stream of chunks to a file path, file object or async callable.
+    
+    Args:
+        chunks: Async iterator of byte chunks
+        destination: File path, binary file object, or coroutine function taking each chunk
+    
+    Returns:
+        Number of bytes written
+    """
+    loop = asyncio.get_running_loop()
+    written = 0
+    
+    if callable(destination) and not hasattr(destination, "write"):
+        async for chunk in chunks:
+            await destination(chunk)
+            written += len(chunk)
+        return written
+    
+    file: BinaryIO
+    if isinstance(destination, (str, os.PathLike)):
+        file = await loop.run_in_executor(None, open, destination, "wb")
+        owned = True
+    else:
+        # Callables without a write() method were handled above
+        file = cast(BinaryIO, destination)
+        owned = False
+    
+    try:
+        async for chunk in chunks:
+            await loop.run_in_executor(None, file.write, chunk)
+            written += len(chunk)
+    finally:
+        if owned:
+            await loop.run_in_executor(None, file.close)
+    return written
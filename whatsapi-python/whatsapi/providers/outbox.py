@@ -0,0 +1,541 @@
+"""Durable outbound message queue backed by SQLite"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from types import TracebackType
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Type, TypeVar
+)
+from . import bulk
+from .base import WhatsAppProvider
+from .bulk import OutgoingMessage
+from .evolution import EvolutionAPIConnectionError
+from .retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MESSAGE_FIELDS = tuple(f.name for f in fields(OutgoingMessage))
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+# Send outcomes committed per transaction while draining
+_RECORD_BATCH = 100
+
+# Row states
+PENDING = 0
+SENDING = 1
+SENT = 2
+FAILED = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt, id);
+"""
+
+
+@dataclass
+class OutboxStats:
+    """Outbox counters for this process"""
+    enqueued: int = 0
+    duplicates: int = 0
+    commits: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    recovered: int = 0
+
+
+class Outbox:
+    """
+    Persistent queue in front of a provider.
+    
+    ``enqueue()`` writes messages to a local SQLite database (WAL mode)
+    and returns once they are committed; concurrent enqueues are grouped
+    into one transaction. A background drainer sends due messages through
+    the provider with ``send_many`` and records each outcome. Messages that
+    were being sent when the process died were never acknowledged, so they
+    are sent again on ``start()``.
+    
+    Each message has an idempotency key (random unless given); enqueueing
+    a key that is already in the outbox is ignored, so retried producers do
+    not cause double sends. Delivery is at least once: a crash between the
+    API accepting a message and the outbox recording it resends that message.
+    Messages to one recipient keep their order within a drain batch, but a
+    message waiting for a retry does not hold back later ones. Messages with
+    an invalid recipient are stored as failed and never sent.
+    """
+    
+    def __init__(
+        self,
+        provider: WhatsAppProvider,
+        path: str,
+        batch_size: int = 1000,
+        flush_interval: float = 0.01,
+        max_in_flight: int = 10,
+        retry_policy: Optional[RetryPolicy] = None,
+        poll_interval: float = 1.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize outbox.
+        
+        Args:
+            provider: Provider used to send messages
+            path: SQLite database file
+            batch_size: Maximum messages per enqueue transaction and per drain batch
+                (default: 1000)
+            flush_interval: Seconds an enqueue waits for others to share its commit
+                (default: 0.01)
+            max_in_flight: Maximum concurrent sends (default: 10)
+            retry_policy: Backoff for failed sends; max_retries bounds the attempts per
+                message (default: RetryPolicy(max_retries=5, base_delay=1, max_delay=300))
+            poll_interval: Seconds between checks for retries that became due (default: 1)
+            clock: Wall clock function; retry times are stored in the database
+                (default: time.time)
+        """
+        self.provider = provider
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_in_flight = max_in_flight
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=5, base_delay=1.0, max_delay=300.0
+        )
+        self.poll_interval = poll_interval
+        self.stats = OutboxStats()
+        self._clock = clock
+        # One thread owns the connection; every query runs there in order
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._buffer: List[Tuple[str, str, Optional[str], "asyncio.Future[bool]"]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drainer: Optional["asyncio.Task[None]"] = None
+        self._closing = False
+        self._flushes: Set["asyncio.Future[None]"] = set()
+    
+    async def __aenter__(self) -> "Outbox":
+        """Context manager entry"""
+        await self.start()
+        return self
+    
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        """Context manager exit"""
+        await self.close()
+    
+    def _require_db(self) -> sqlite3.Connection:
+        """The open database connection"""
+        if self._db is None:
+            raise RuntimeError("Outbox is not started")
+        return self._db
+    
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        """Run a database function on the outbox thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+    
+    def _open(self) -> int:
+        """Open the database and requeue unacknowledged messages"""
+        db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL survives process crashes; only an OS crash can lose the last commits
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+        recovered = db.execute(
+            "UPDATE outbox SET status = ? WHERE status = ?", (PENDING, SENDING)
+        ).rowcount
+        self._db = db
+        return recovered
+    
+    async def start(self) -> None:
+        """
+        Open the database, requeue messages left in flight and start the drainer.
+        """
+        if self._drainer is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="whatsapi-outbox"
+        )
+        recovered = await self._run(self._open)
+        self.stats.recovered += recovered
+        if recovered:
+            logger.warning(f"Outbox: resending {recovered} unacknowledged messages")
+        wakeup = self._wakeup = asyncio.Event()
+        wakeup.set()
+        self._drainer = asyncio.ensure_future(self._drain(wakeup))
+        logger.info(f"Outbox started: {self.path}")
+    
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        Commit buffered enqueues, stop the drainer and close the database.
+        
+        No new sends are started; sends already under way get ``timeout``
+        seconds to finish and have their outcomes recorded. Messages still
+        unacknowledged after that are resent by the next start().
+        
+        Args:
+            timeout: Seconds to wait for in-flight sends (default: 10)
+        """
+        if self._db is None:
+            return
+        await self.flush()
+        if self._drainer is not None:
+            self._closing = True
+            if self._wakeup is not None:
+                self._wakeup.set()
+            done, _ = await asyncio.wait({self._drainer}, timeout=timeout)
+            if not done:
+                logger.warning("Outbox: in-flight sends did not finish before close")
+                self._drainer.cancel()
+            await asyncio.gather(self._drainer, return_exceptions=True)
+            self._drainer = None
+            self._closing = False
+        await self._run(self._require_db().close)
+        self._db = None
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        logger.info("Outbox closed")
+    
+    @staticmethod
+    def _encode(message: OutgoingMessage) -> str:
+        """Serialize a message, leaving out unset fields"""
+        # Shallow field access; dataclasses.asdict deep-copies and dominates enqueue cost
+        data = {}
+        for name in _MESSAGE_FIELDS:
+            value = getattr(message, name)
+            if value is not None:
+                data[name] = value
+        return _dumps(data)
+    
+    @staticmethod
+    def _check(message: OutgoingMessage) -> Optional[str]:
+        """Error that will keep a message from being sent, if any"""
+        try:
+            message.recipient_key
+        except ValueError as e:
+            return str(e)
+        return None
+    
+    async def enqueue(
+        self,
+        message: OutgoingMessage,
+        idempotency_key: Optional[str] = None
+    ) -> bool:
+        """
+        Durably queue a message for sending.
+        
+        Returns after the message is committed. Enqueues made within
+        ``flush_interval`` of each other share one transaction.
+        
+        Args:
+            message: Message to send
+            idempotency_key: Unique key for this message (default: random)
+        
+        Returns:
+            True if queued (or stored as failed, for an invalid recipient), False if
+            the idempotency key was already used
+        
+        Raises:
+            RuntimeError: If the outbox is not started
+        """
+        if self._db is None:
+            raise RuntimeError("Outbox is not started")
+        future: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        key = idempotency_key or uuid.uuid4().hex
+        self._buffer.append((key, self._encode(message), self._check(message), future))
+        if len(self._buffer) >= self.batch_size:
+            self._schedule_flush(0)
+        elif self._flush_handle is None:
+            self._schedule_flush(self.flush_interval)
+        return await future
+    
+    async def enqueue_many(
+        self,
+        messages: Iterable[OutgoingMessage],
+        idempotency_keys: Optional[Sequence[Optional[str]]] = None
+    ) -> int:
+        """
+        Durably queue many messages, committing them in batches.
+        
+        Args:
+            messages: Messages to send
+            idempotency_keys: Optional keys, one per message (None entries get random keys)
+        
+        Returns:
+            Number of messages stored (duplicates excluded; invalid recipients are
+            stored as failed)
+        
+        Raises:
+            RuntimeError: If the outbox is not started
+        """
+        if self._db is None:
+            raise RuntimeError("Outbox is not started")
+        queued = 0
+        rows: List[Tuple[str, str, Optional[str]]] = []
+        for index, message in enumerate(messages):
+            key = idempotency_keys[index] if idempotency_keys is not None else None
+            rows.append((key or uuid.uuid4().hex, self._encode(message), self._check(message)))
+            if len(rows) >= self.batch_size:
+                queued += sum(await self._commit(rows))
+                rows = []
+        if rows:
+            queued += sum(await self._commit(rows))
+        return queued
+    
+    def _schedule_flush(self, delay: float) -> None:
+        """Arrange for the enqueue buffer to be committed"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._flush_handle = loop.call_later(delay, self._start_flush)
+    
+    def _start_flush(self) -> None:
+        """Commit the current buffer in the background"""
+        self._flush_handle = None
+        if self._buffer:
+            flush = asyncio.ensure_future(self._flush_buffer())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+    
+    async def flush(self) -> None:
+        """
+        Commit all buffered enqueues now.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self._flush_buffer()
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+    
+    async def _flush_buffer(self) -> None:
+        """Commit buffered enqueues batch by batch and resolve their futures"""
+        while self._buffer:
+            batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+            try:
+                inserted = await self._commit([row[:3] for row in batch])
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (*_, future), added in zip(batch, inserted):
+                if not future.done():
+                    future.set_result(added)
+    
+    async def _commit(self, rows: List[Tuple[str, str, Optional[str]]]) -> List[bool]:
+        """Insert (key, payload, error) rows in one transaction and wake the drainer"""
+        added = await self._run(self._insert, rows)
+        new = sum(added)
+        invalid = sum(1 for row, was_added in zip(rows, added) if was_added and row[2])
+        self.stats.enqueued += new - invalid
+        self.stats.failed += invalid
+        self.stats.duplicates += len(added) - new
+        self.stats.commits += 1
+        if new > invalid and self._wakeup is not None:
+            self._wakeup.set()
+        return added
+    
+    def _insert(self, rows: List[Tuple[str, str, Optional[str]]]) -> List[bool]:
+        """Insert rows in one transaction, rows with an error as failed; returns which were new"""
+        db = self._require_db()
+        now = self._clock()
+        added = []
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for key, payload, error in rows:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO outbox "
+                    "(idempotency_key, payload, status, error, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, FAILED if error else PENDING, error, now)
+                )
+                added.append(cursor.rowcount == 1)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return added
+    
+    def _claim(self, limit: int) -> List[Tuple[int, str, int]]:
+        """Mark due messages as being sent; returns (id, payload, attempts) rows"""
+        db = self._require_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = db.execute(
+                "SELECT id, payload, attempts FROM outbox "
+                "WHERE status = ? AND next_attempt <= ? ORDER BY id LIMIT ?",
+                (PENDING, self._clock(), limit)
+            ).fetchall()
+            db.executemany(
+                "UPDATE outbox SET status = ? WHERE id = ?",
+                [(SENDING, row[0]) for row in rows]
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return rows
+    
+    def _record(self, updates: List[Tuple[Any, ...]], released: Sequence[int] = ()) -> None:
+        """
+        Store send outcomes as (status, attempts, next_attempt, error, sent_at, id) rows,
+        and return released claims (ids without an outcome) to the queue
+        """
+        db = self._require_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, error = ?, "
+                "sent_at = ? WHERE id = ?",
+                updates
+            )
+            db.executemany(
+                "UPDATE outbox SET status = ? WHERE id = ? AND status = ?",
+                [(PENDING, row_id, SENDING) for row_id in released]
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+    
+    def _is_retryable(self, error: BaseException) -> bool:
+        """Transient errors, and an open circuit, are retried later"""
+        if isinstance(error, EvolutionAPIConnectionError):
+            return True
+        return self.retry_policy.is_retryable(error)
+    
+    async def _drain(self, wakeup: asyncio.Event) -> None:
+        """Background task sending due messages batch by batch until close()"""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            
+            try:
+                while not self._closing:
+                    rows = await self._run(self._claim, self.batch_size)
+                    if not rows:
+                        break
+                    await self._send_batch(rows)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # _send_batch has returned the failed batch to the queue; retry it on the next poll
+                logger.error(f"Outbox drain failed: {e}", exc_info=True)
+    
+    def _until_closing(self, messages: List[OutgoingMessage]) -> Iterator[OutgoingMessage]:
+        """Feed messages to send_many until close() is called"""
+        for message in messages:
+            if self._closing:
+                return
+            yield message
+    
+    async def _send_batch(self, rows: List[Tuple[int, str, int]]) -> None:
+        """Send claimed messages and record outcomes as they complete"""
+        policy = self.retry_policy
+        updates: List[Tuple[Any, ...]] = []
+        sendable: List[Tuple[int, str, int]] = []
+        messages: List[OutgoingMessage] = []
+        for row in rows:
+            try:
+                messages.append(OutgoingMessage(**json.loads(row[1])))
+            except (TypeError, ValueError) as e:
+                updates.append((FAILED, row[2] + 1, 0.0, f"Invalid payload: {e}", None, row[0]))
+                self.stats.failed += 1
+                continue
+            sendable.append(row)
+        # Claimed rows without a recorded outcome; returned to the queue however the batch ends
+        unsettled = {row[0] for row in sendable}
+        
+        results = bulk.send_many(
+            self.provider, self._until_closing(messages), max_in_flight=self.max_in_flight
+        )
+        try:
+            async for result in results:
+                row_id, _, attempts = sendable[result.index]
+                unsettled.discard(row_id)
+                now = self._clock()
+                error = result.error
+                if error is None:
+                    updates.append((SENT, attempts + 1, 0.0, None, now, row_id))
+                    self.stats.sent += 1
+                elif attempts < policy.max_retries and self._is_retryable(error):
+                    retry_at = now + policy.get_delay(attempts, error)
+                    updates.append((PENDING, attempts + 1, retry_at, str(error), None, row_id))
+                    self.stats.retried += 1
+                else:
+                    updates.append((FAILED, attempts + 1, 0.0, str(error), None, row_id))
+                    self.stats.failed += 1
+                    logger.error(f"Outbox: giving up on message {row_id}: {error}")
+                
+                # Acknowledge in small groups so a crash resends little
+                if len(updates) >= _RECORD_BATCH:
+                    recorded, updates = updates, []
+                    await self._run(self._record, recorded)
+        finally:
+            # Stop sends still queued, then store every outcome known so far even when
+            # cancelled, so that close() followed by start() resends nothing already sent
+            await results.aclose()
+            if updates or unsettled:
+                await asyncio.shield(self._run(self._record, updates, list(unsettled)))
+    
+    async def counts(self) -> Dict[str, int]:
+        """
+        Count stored messages by state.
+        
+        Returns:
+            Dict with pending, sending, sent and failed counts
+        """
+        def query() -> Dict[str, int]:
+            rows = self._require_db().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+            counts = dict(rows.fetchall())
+            return {
+                "pending": counts.get(PENDING, 0),
+                "sending": counts.get(SENDING, 0),
+                "sent": counts.get(SENT, 0),
+                "failed": counts.get(FAILED, 0),
+            }
+        return await self._run(query)
+    
+    async def purge_sent(self, older_than: float = 0.0) -> int:
+        """
+        Delete sent messages to keep the database small.
+        
+        Args:
+            older_than: Only delete messages sent at least this many seconds ago
+        
+        Returns:
+            Number of deleted messages
+        """
+        cutoff = self._clock() - older_than
+        
+        def delete() -> int:
+            return self._require_db().execute(
+                "DELETE FROM outbox WHERE status = ? AND sent_at <= ?", (SENT, cutoff)
+            ).rowcount
+        return await self._run(delete)
@@ -0,0 +1,383 @@
+"""Sharding outbound traffic over several WhatsApp instances"""
+
+import asyncio
+import hashlib
+import logging
+from bisect import bisect
+from types import TracebackType
+from typing import Dict, Any, Iterable, List, Optional, Set, Type, Union
+from .base import WhatsAppProvider
+from .media import MediaSource
+from ..models.jid import Jid
+from ..models.events import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+
+class InstancePoolError(Exception):
+    """Raised when no instance is available to handle a request"""
+    pass
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash (the builtin hash() is randomized per process)"""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class InstancePool(WhatsAppProvider):
+    """
+    Provider that spreads traffic over several instances (WhatsApp numbers).
+    
+    Each recipient is routed to one instance by consistent hashing, so a
+    conversation stays on the same number. Draining or adding an instance
+    only remaps the recipients that hashed to it; everyone else keeps their
+    instance.
+    
+    Nothing drains a disconnected instance automatically: the caller must run
+    ``check_health()`` periodically (e.g. from a background task) for the pool
+    to route around instances that dropped their connection.
+    """
+    
+    def __init__(self, providers: Iterable[WhatsAppProvider], replicas: int = 100):
+        """
+        Initialize instance pool.
+        
+        Args:
+            providers: Providers to pool; each is keyed by its ``instance_name``
+            replicas: Virtual nodes per instance on the hash ring (default: 100)
+        
+        Raises:
+            ValueError: If no providers are given or instance names collide
+        """
+        self.replicas = replicas
+        self.instances: Dict[str, WhatsAppProvider] = {}
+        self._drained: Set[str] = set()
+        self._ring_hashes: List[int] = []
+        self._ring_names: List[str] = []
+        
+        for provider in providers:
+            self._add(provider)
+        if not self.instances:
+            raise ValueError("InstancePool requires at least one provider")
+        self._rebuild()
+        
+        logger.info(f"Instance pool initialized with {len(self.instances)} instances")
+    
+    async def __aenter__(self) -> "InstancePool":
+        """Context manager entry"""
+        return self
+    
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        """Context manager exit"""
+        await self.close()
+    
+    @staticmethod
+    def _name(provider: WhatsAppProvider) -> str:
+        """Pool key for a provider"""
+        name = getattr(provider, "instance_name", None)
+        if not name:
+            raise ValueError(f"Provider {provider!r} has no instance_name")
+        return str(name)
+    
+    def _add(self, provider: WhatsAppProvider) -> str:
+        """Register a provider without rebuilding the ring"""
+        name = self._name(provider)
+        if name in self.instances:
+            raise ValueError(f"Duplicate instance name: {name}")
+        self.instances[name] = provider
+        return name
+    
+    def _rebuild(self) -> None:
+        """Rebuild the hash ring from the active instances"""
+        points = sorted(
+            (_hash(f"{name}#{replica}"), name)
+            for name in self.active_instances
+            for replica in range(self.replicas)
+        )
+        self._ring_hashes = [point for point, _ in points]
+        self._ring_names = [name for _, name in points]
+    
+    @property
+    def active_instances(self) -> List[str]:
+        """Names of instances currently receiving traffic"""
+        return [name for name in self.instances if name not in self._drained]
+    
+    def add_instance(self, provider: WhatsAppProvider) -> None:
+        """
+        Add an instance to the pool.
+        
+        Args:
+            provider: Provider for the new instance
+        """
+        name = self._add(provider)
+        self._rebuild()
+        logger.info(f"Instance added to pool: {name}")
+    
+    def remove_instance(self, name: str) -> WhatsAppProvider:
+        """
+        Remove an instance from the pool (the provider is not closed).
+        
+        Args:
+            name: Instance name
+        
+        Returns:
+            The removed provider
+        """
+        provider = self.instances.pop(name)
+        self._drained.discard(name)
+        self._rebuild()
+        logger.info(f"Instance removed from pool: {name}")
+        return provider
+    
+    def drain(self, name: str) -> None:
+        """
+        Stop routing traffic to an instance; its recipients move to other instances.
+        
+        Args:
+            name: Instance name
+            
+        Raises:
+            KeyError: If the instance is not in the pool
+        """
+        if name not in self.instances:
+            raise KeyError(name)
+        if name not in self._drained:
+            self._drained.add(name)
+            self._rebuild()
+            logger.warning(f"Instance drained: {name}")
+    
+    def undrain(self, name: str) -> None:
+        """
+        Resume routing traffic to a drained instance.
+        
+        Args:
+            name: Instance name
+        """
+        if name in self._drained:
+            self._drained.discard(name)
+            self._rebuild()
+            logger.info(f"Instance restored: {name}")
+    
+    def instance_for(self, to: str) -> str:
+        """
+        Get the instance a recipient is routed to.
+        
+        Args:
+            to: Recipient phone number or JID
+        
+        Returns:
+            Instance name
+        
+        Raises:
+            InstancePoolError: If every instance is drained
+        """
+        if not self._ring_hashes:
+            raise InstancePoolError("No connected instance available")
+        index = bisect(self._ring_hashes, _hash(Jid.parse(to).number))
+        if index == len(self._ring_hashes):
+            index = 0
+        return self._ring_names[index]
+    
+    def provider_for(self, to: str) -> WhatsAppProvider:
+        """
+        Get the provider a recipient is routed to.
+        
+        Args:
+            to: Recipient phone number or JID
+        
+        Returns:
+            Provider of the selected instance
+        """
+        return self.instances[self.instance_for(to)]
+    
+    @staticmethod
+    def _is_connected(status: Dict[str, Any]) -> bool:
+        """Interpret an Evolution connectionState response"""
+        instance = status.get("instance", status)
+        return bool(instance.get("state") == "open")
+    
+    async def check_health(self) -> Dict[str, bool]:
+        """
+        Query every instance and drain those that are not connected.
+        
+        Instances whose status request fails, or returns no usable status, are
+        left unchanged, so an API outage does not drain the whole pool.
+        
+        Returns:
+            Dict mapping instance name to connected flag (omitted if the check failed)
+        """
+        names = list(self.instances)
+        statuses = await asyncio.gather(
+            *(self.instances[name].get_instance_status() for name in names),
+            return_exceptions=True
+        )
+        
+        health: Dict[str, bool] = {}
+        for name, status in zip(names, statuses):
+            if isinstance(status, BaseException):
+                logger.warning(f"Status check failed for instance {name}: {status}")
+                continue
+            # An empty or unexpected response says nothing about the connection either
+            instance = status.get("instance", status) if isinstance(status, dict) else None
+            if not isinstance(instance, dict):
+                logger.warning(
+                    f"Status check failed for instance {name}: unexpected response {status!r}"
+                )
+                continue
+            connected = self._is_connected(status)
+            health[name] = connected
+            if connected:
+                self.undrain(name)
+            else:
+                self.drain(name)
+        return health
+    
+    async def send_text_message(self, to: str, text: str) -> Dict[str, Any]:
+        """
+        Send text message from the recipient's instance.
+        
+        Args:
+            to: Recipient phone number (e.g., "+972501234567")
+            text: Message text content
+        
+        Returns:
+            Dict containing the API response with message status
+        """
+        return await self.provider_for(to).send_text_message(to, text)
+    
+    async def send_media_message(
+        self,
+        to: str,
+        media_url: str,
+        media_type: str,
+        caption: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        file_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send media message from the recipient's instance.
+        
+        Args:
+            to: Recipient phone number
+            media_url: URL of the media file to send
+            media_type: Type of media ("image", "video", "audio", "document")
+            caption: Optional caption for the media
+            mime_type: MIME type (e.g., "image/png", "video/mp4")
+            file_name: Optional filename for documents
+        
+        Returns:
+            Dict containing the API response with message status
+        """
+        return await self.provider_for(to).send_media_message(
+            to, media_url, media_type, caption, mime_type, file_name
+        )
+    
+    async def send_media_file(
+        self,
+        to: str,
+        source: MediaSource,
+        media_type: str,
+        caption: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        file_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a local file as a media message from the recipient's instance.
+        
+        Args:
+            to: Recipient phone number
+            source: File path or binary file object
+            media_type: Type of media ("image", "video", "audio", "document")
+            caption: Optional caption for the media
+            mime_type: MIME type; guessed from the file name if omitted
+            file_name: File name shown to the recipient
+        
+        Returns:
+            Dict containing the API response with message status
+        
+        Raises:
+            NotImplementedError: If the instance's provider cannot upload files
+        """
+        return await self.provider_for(to).send_media_file(
+            to, source, media_type, caption, mime_type, file_name
+        )
+    
+    async def get_instance_status(self) -> Dict[str, Any]:
+        """
+        Get connection status of every instance.
+        
+        Returns:
+            Dict mapping instance name to its status response
+        """
+        names = list(self.instances)
+        statuses = await asyncio.gather(
+            *(self.instances[name].get_instance_status() for name in names)
+        )
+        return dict(zip(names, statuses))
+    
+    async def setup_webhook(
+        self,
+        webhook_url: str,
+        webhook_by_events: bool = True,
+        webhook_base64: bool = False,
+        events: Union[List[str], WebhookEvent, None] = None
+    ) -> Dict[str, Any]:
+        """
+        Configure the same webhook on every instance.
+        
+        Args:
+            webhook_url: URL where webhooks will be sent
+            webhook_by_events: If True, sends separate requests per event
+            webhook_base64: If True, sends files in base64 format
+            events: Event names or a WebhookEvent mask to subscribe to
+        
+        Returns:
+            Dict mapping instance name to its webhook configuration status
+        """
+        names = list(self.instances)
+        results = await asyncio.gather(*(
+            self.instances[name].setup_webhook(
+                webhook_url, webhook_by_events, webhook_base64, events
+            )
+            for name in names
+        ))
+        return dict(zip(names, results))
+    
+    async def delete_message(
+        self,
+        message_id: str,
+        to: str,
+        instance: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Delete a message through the instance that sent it.
+        
+        Only the sending number can revoke a message. Without ``instance`` the
+        recipient's current instance is used, which is a different number if the
+        recipient was remapped (drain, undrain or add_instance) since the send.
+        
+        Args:
+            message_id: ID of the message to delete
+            to: Phone number of the chat where message exists
+            instance: Name of the instance that sent the message (default: the
+                recipient's current instance)
+        
+        Returns:
+            Dict containing deletion status
+        
+        Raises:
+            KeyError: If the instance is not in the pool
+        """
+        provider = self.instances[instance] if instance is not None else self.provider_for(to)
+        return await provider.delete_message(message_id, to)
+    
+    async def close(self) -> None:
+        """
+        Close every pooled provider.
+        """
+        await asyncio.gather(*(provider.close() for provider in self.instances.values()))
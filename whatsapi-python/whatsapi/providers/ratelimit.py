@@ -0,0 +1,176 @@
+"""Token-bucket rate limiting for provider requests"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class RateLimitStats:
+    """Counters describing how long callers waited for the rate limiter"""
+    acquired: int = 0
+    delayed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    
+    @property
+    def average_wait(self) -> float:
+        """Average wait per acquired request, in seconds"""
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+    
+    Holds up to ``burst`` tokens and refills at ``rate`` tokens per second.
+    Waiting callers queue on an asyncio.Lock, which is FIFO, so they are
+    served in arrival order and sleep instead of polling.
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity (default: max(1, rate))
+            clock: Monotonic clock function (default: time.monotonic)
+        
+        Raises:
+            ValueError: If rate or burst is not positive
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        if self.burst <= 0:
+            raise ValueError("burst must be positive")
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        # Created lazily so the bucket can be built outside a running loop
+        self._lock: Optional[asyncio.Lock] = None
+    
+    def _refill(self) -> None:
+        """Add tokens accrued since the last update"""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available"""
+        self._refill()
+        return self._tokens
+    
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, waiting until they are available.
+        
+        Args:
+            tokens: Number of tokens to take (default: 1)
+        
+        Returns:
+            Seconds spent waiting
+        
+        Raises:
+            ValueError: If more tokens are requested than the bucket holds
+        """
+        if tokens > self.burst:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.burst}")
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        start = self._clock()
+        waited = self._lock.locked()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return self._clock() - start if waited else 0.0
+                waited = True
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class RateLimiter:
+    """
+    Request rate limiter with a global bucket and optional per-recipient buckets.
+    
+    The per-recipient buckets are kept in a bounded LRU so memory stays flat
+    with many distinct recipients.
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        per_recipient_rate: Optional[float] = None,
+        per_recipient_burst: Optional[float] = None,
+        max_recipients: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            rate: Requests per second allowed for the whole instance
+            burst: Requests allowed in a burst (default: max(1, rate))
+            per_recipient_rate: Optional requests per second allowed per recipient
+            per_recipient_burst: Burst allowed per recipient
+                (default: max(1, per_recipient_rate))
+            max_recipients: Maximum number of per-recipient buckets kept (default: 10000)
+            clock: Monotonic clock function (default: time.monotonic)
+        """
+        self._clock = clock
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.per_recipient_rate = per_recipient_rate
+        self.per_recipient_burst = per_recipient_burst
+        self.max_recipients = max_recipients
+        self._recipients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.stats = RateLimitStats()
+    
+    def _recipient_bucket(self, recipient: str, rate: float) -> TokenBucket:
+        """Get or create the bucket for a recipient, evicting the least recently used"""
+        bucket = self._recipients.get(recipient)
+        if bucket is None:
+            bucket = TokenBucket(rate, self.per_recipient_burst, self._clock)
+            self._recipients[recipient] = bucket
+            if len(self._recipients) > self.max_recipients:
+                self._recipients.popitem(last=False)
+        else:
+            self._recipients.move_to_end(recipient)
+        return bucket
+    
+    async def acquire(self, recipient: Optional[str] = None) -> float:
+        """
+        Wait until a request may be sent.
+        
+        Args:
+            recipient: Optional recipient key for the per-recipient limit
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        rate = self.per_recipient_rate
+        if recipient is not None and rate is not None:
+            waited += await self._recipient_bucket(recipient, rate).acquire()
+        waited += await self.bucket.acquire()
+        
+        stats = self.stats
+        stats.acquired += 1
+        if waited > 0:
+            stats.delayed += 1
+            stats.total_wait += waited
+            if waited > stats.max_wait:
+                stats.max_wait = waited
+        return waited
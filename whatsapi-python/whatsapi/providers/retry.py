@@ -0,0 +1,209 @@
+"""Retry policy and circuit breaker for provider requests"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet, Mapping, Optional
+
+import aiohttp
+
+# Statuses worth retrying: timeouts, throttling and transient server errors
+DEFAULT_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        headers: Response headers
+    
+    Returns:
+        Delay in seconds, or None if the header is missing or invalid
+    """
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+    
+    Delays grow exponentially from ``base_delay`` up to ``max_delay`` with
+    full jitter. Only connection errors, timeouts and responses whose status
+    is in ``retry_statuses`` are retried; a Retry-After header on a retryable
+    response is honored up to ``max_retry_after`` seconds.
+    """
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: DEFAULT_RETRY_STATUSES)
+    max_retry_after: float = 60.0
+    
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        Check whether a failed attempt may be retried.
+        
+        Args:
+            error: Exception raised by the attempt
+        
+        Returns:
+            True if the error is transient
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            if error.status not in self.retry_statuses:
+                return False
+            retry_after = parse_retry_after(error.headers)
+            return retry_after is None or retry_after <= self.max_retry_after
+        return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+    
+    def get_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Compute the delay before the next attempt.
+        
+        Args:
+            attempt: Number of retries already made (0 for the first retry)
+            error: Exception raised by the failed attempt
+        
+        Returns:
+            Delay in seconds
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            retry_after = parse_retry_after(error.headers)
+            if retry_after is not None:
+                return retry_after
+        
+        delay = min(self.max_delay, self.base_delay * (self.multiplier ** attempt))
+        if self.jitter:
+            delay *= random.random()
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the backend is unhealthy.
+    
+    After ``failure_threshold`` consecutive backend failures the circuit
+    opens and requests are rejected without touching the network. Once
+    ``recovery_timeout`` seconds have passed a single probe request is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (default: 5)
+            recovery_timeout: Seconds to stay open before probing (default: 30)
+            clock: Monotonic clock function (default: time.monotonic)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+    
+    @staticmethod
+    def is_failure(error: BaseException) -> bool:
+        """
+        Check whether an error indicates an unhealthy backend.
+        
+        Client errors (4xx, including 429 throttling) mean the backend is up.
+        
+        Args:
+            error: Exception raised by a request
+        
+        Returns:
+            True if the error should count towards opening the circuit
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500
+        return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+    
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the open circuit lets a probe through"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now.
+        
+        Returns:
+            True if the request may proceed
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if self._clock() - self._opened_at < self.recovery_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        # Half-open: exactly one probe at a time
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+    
+    def record_success(self) -> None:
+        """Record a successful request"""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+    
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        """
+        Record a failed request.
+        
+        Args:
+            error: Exception raised by the request; errors that do not indicate
+                an unhealthy backend (see is_failure) count as a success
+        """
+        if error is not None and not self.is_failure(error):
+            # The backend answered, so it is reachable
+            self.record_success()
+            return
+        
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+    
+    def release_probe(self) -> None:
+        """Abandon an in-flight probe (e.g. on cancellation) without recording an outcome"""
+        self._probing = False
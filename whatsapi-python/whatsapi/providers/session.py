@@ -0,0 +1,155 @@
+"""Shared HTTP connection pool for providers"""
+
+import logging
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+
+import aiohttp
+
+from ..codec import JSONCodec, get_json_codec
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """Connection pool counters collected through aiohttp tracing"""
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests served on an already open connection"""
+        acquired = self.connections_created + self.connections_reused
+        return self.connections_reused / acquired if acquired else 0.0
+
+
+class SessionManager:
+    """
+    Owns one aiohttp connector and session that many providers can share.
+    
+    Authentication headers and timeouts are sent per request by each
+    provider, so providers for different instances or API keys can use the
+    same pool. The session is created lazily on first use and is bound to
+    the event loop running at that time.
+    """
+    
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        ttl_dns_cache: Optional[int] = 300,
+        enable_cleanup_closed: bool = False,
+        json_codec: Optional[JSONCodec] = None
+    ):
+        """
+        Initialize session manager.
+        
+        Args:
+            limit: Maximum simultaneous connections, 0 for unlimited (default: 100)
+            limit_per_host: Maximum connections per host, 0 for unlimited (default: 0)
+            keepalive_timeout: Seconds an idle connection is kept open (default: 30)
+            ttl_dns_cache: Seconds DNS results are cached, None for no expiry (default: 300)
+            enable_cleanup_closed: Abort SSL connections that were not shut down cleanly
+            json_codec: JSONCodec used as the session's json_serialize (default: the
+                codec installed with set_json_codec)
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.enable_cleanup_closed = enable_cleanup_closed
+        self.json_codec = json_codec
+        self.stats = PoolStats()
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Build a trace config that feeds PoolStats"""
+        stats = self.stats
+        trace_config = aiohttp.TraceConfig()
+        
+        async def on_request_start(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestStartParams
+        ) -> None:
+            stats.requests += 1
+        
+        async def on_connection_create_end(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceConnectionCreateEndParams
+        ) -> None:
+            stats.connections_created += 1
+        
+        async def on_connection_reuseconn(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceConnectionReuseconnParams
+        ) -> None:
+            stats.connections_reused += 1
+        
+        async def on_dns_cache_hit(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceDnsCacheHitParams
+        ) -> None:
+            stats.dns_cache_hits += 1
+        
+        async def on_dns_cache_miss(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceDnsCacheMissParams
+        ) -> None:
+            stats.dns_cache_misses += 1
+        
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get or create the shared aiohttp session.
+        
+        Returns:
+            Active aiohttp ClientSession
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+                enable_cleanup_closed=self.enable_cleanup_closed
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                json_serialize=(self.json_codec or get_json_codec()).dumps,
+                trace_configs=[self._trace_config()]
+            )
+            logger.debug(
+                f"Created shared aiohttp session (limit={self.limit}, "
+                f"limit_per_host={self.limit_per_host})"
+            )
+        return self._session
+    
+    @property
+    def closed(self) -> bool:
+        """Whether there is no open session"""
+        return self._session is None or self._session.closed
+    
+    async def close(self) -> None:
+        """
+        Close the shared session and all pooled connections.
+        """
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.debug("Shared aiohttp session closed")
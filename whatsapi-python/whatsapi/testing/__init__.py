@@ -0,0 +1,19 @@
+"""Testing utilities"""
+
+from .simulator import (
+    EvolutionSimulator,
+    Latency,
+    LatencyDistribution,
+    FaultProfile,
+    SimulatorStats,
+    text_webhook,
+)
+
+__all__ = [
+    "EvolutionSimulator",
+    "Latency",
+    "LatencyDistribution",
+    "FaultProfile",
+    "SimulatorStats",
+    "text_webhook",
+]
@@ -0,0 +1,442 @@
+"""In-process Evolution API simulator with latency and fault injection"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Type
+
+import aiohttp
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+WebhookFactory = Callable[[int], Dict[str, Any]]
+
+
+class LatencyDistribution(str, Enum):
+    """Shape of simulated response latency"""
+    CONSTANT = "constant"
+    UNIFORM = "uniform"
+    NORMAL = "normal"
+    EXPONENTIAL = "exponential"
+    LOGNORMAL = "lognormal"
+
+
+@dataclass
+class Latency:
+    """
+    Simulated response latency.
+    
+    ``mean`` is the constant value, the center of UNIFORM (± ``jitter``) and
+    NORMAL (standard deviation ``jitter``), the mean of EXPONENTIAL and the
+    median of LOGNORMAL (shape ``jitter``, long-tailed). Samples are clamped
+    to ``[0, cap]``.
+    """
+    distribution: LatencyDistribution = LatencyDistribution.CONSTANT
+    mean: float = 0.0
+    jitter: float = 0.0
+    cap: Optional[float] = None
+    
+    def sample(self, rng: random.Random) -> float:
+        """
+        Draw one latency.
+        
+        Args:
+            rng: Random number generator
+        
+        Returns:
+            Latency in seconds
+        """
+        distribution = self.distribution
+        if distribution == LatencyDistribution.UNIFORM:
+            value = rng.uniform(self.mean - self.jitter, self.mean + self.jitter)
+        elif distribution == LatencyDistribution.NORMAL:
+            value = rng.gauss(self.mean, self.jitter)
+        elif distribution == LatencyDistribution.EXPONENTIAL:
+            value = rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        elif distribution == LatencyDistribution.LOGNORMAL:
+            value = self.mean * rng.lognormvariate(0.0, self.jitter)
+        else:
+            value = self.mean
+        value = max(0.0, value)
+        return value if self.cap is None else min(value, self.cap)
+
+
+@dataclass
+class FaultProfile:
+    """
+    Per-request fault probabilities.
+    
+    Each request draws once: with ``drop_rate`` the connection is closed
+    without a response, with ``rate_limit_rate`` it gets 429 and a
+    Retry-After of ``retry_after`` seconds, and with ``error_rate`` it gets
+    ``error_status``. Rates are checked in that order and should sum to at
+    most 1.
+    """
+    error_rate: float = 0.0
+    error_status: int = 500
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    drop_rate: float = 0.0
+
+
+@dataclass
+class SimulatorStats:
+    """Simulator counters"""
+    requests: int = 0
+    succeeded: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    dropped: int = 0
+    unauthorized: int = 0
+    webhooks_sent: int = 0
+    webhooks_failed: int = 0
+    endpoints: Dict[str, int] = field(default_factory=dict)
+
+
+def text_webhook(index: int, instance: str = "test") -> Dict[str, Any]:
+    """
+    Default webhook factory: an incoming text message.
+    
+    Args:
+        index: Sequence number of the webhook
+        instance: Instance name in the envelope
+    
+    Returns:
+        messages.upsert webhook dict
+    """
+    return {
+        "event": "messages.upsert",
+        "instance": instance,
+        "data": {
+            "key": {
+                "remoteJid": f"1555{index % 10_000_000:07d}@s.whatsapp.net",
+                "fromMe": False,
+                "id": f"SIM{index:017X}",
+            },
+            "pushName": "Simulator",
+            "message": {"conversation": f"message {index}"},
+            "messageType": "conversation",
+            "messageTimestamp": int(time.time()),
+        },
+    }
+
+
+class EvolutionSimulator:
+    """
+    Local stand-in for an Evolution API server.
+    
+    Implements the endpoints EvolutionAPIProvider uses (sendText, sendMedia,
+    connectionState, webhook/set, delete, sendReaction and
+    fetchProfilePictureUrl) with configurable latency and faults, and can
+    post webhooks back to the configured webhook URL at a fixed rate. The
+    ``latency``, ``faults`` and ``connection_state`` attributes may be
+    changed while the simulator runs, e.g. to simulate an outage mid-test.
+    
+    Example:
+        async with EvolutionSimulator(faults=FaultProfile(rate_limit_rate=0.1)) as sim:
+            provider = EvolutionAPIProvider(sim.base_url, sim.api_key, sim.instance_name)
+            await provider.send_text_message("+15550001111", "hello")
+            print(sim.stats)
+    """
+    
+    def __init__(
+        self,
+        api_key: str = "test-key",
+        instance_name: str = "test",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[Latency] = None,
+        faults: Optional[FaultProfile] = None,
+        endpoint_faults: Optional[Dict[str, FaultProfile]] = None,
+        history: int = 1000,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize simulator.
+        
+        Args:
+            api_key: Expected apikey header; other keys get 401
+            instance_name: Served instance; other instances get 404
+            host: Interface to listen on (default: 127.0.0.1)
+            port: Port to listen on (default: 0, any free port)
+            latency: Response latency (default: none)
+            faults: Faults for every endpoint (default: none)
+            endpoint_faults: Faults by endpoint name (e.g. "sendText"), overriding ``faults``
+            history: Number of recent requests kept in ``requests`` (default: 1000)
+            seed: Random seed for reproducible latency and faults
+        """
+        self.api_key = api_key
+        self.instance_name = instance_name
+        self.host = host
+        self.port = port
+        self.latency = latency or Latency()
+        self.faults = faults or FaultProfile()
+        self.endpoint_faults = endpoint_faults or {}
+        self.connection_state = "open"
+        self.webhook: Optional[Dict[str, Any]] = None
+        self.stats = SimulatorStats()
+        self.requests: Deque[Tuple[str, str, Any]] = deque(maxlen=history)
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        self.app = web.Application(client_max_size=0)
+        routes = [
+            ("POST", "/message/sendText/{instance}", "sendText", self._send_text),
+            ("POST", "/message/sendMedia/{instance}", "sendMedia", self._send_media),
+            ("POST", "/message/sendReaction/{instance}", "sendReaction", self._send_reaction),
+            ("DELETE", "/message/delete/{instance}", "delete", self._delete),
+            ("GET", "/instance/connectionState/{instance}", "connectionState", self._state),
+            ("POST", "/webhook/set/{instance}", "webhook/set", self._set_webhook),
+            (
+                "POST", "/chat/fetchProfilePictureUrl/{instance}", "fetchProfilePictureUrl",
+                self._profile_picture
+            ),
+        ]
+        for method, path, name, handler in routes:
+            self.app.router.add_route(method, path, self._endpoint(name, handler))
+    
+    @property
+    def base_url(self) -> str:
+        """URL to pass to EvolutionAPIProvider; available once started"""
+        if self._runner is None:
+            raise RuntimeError("Simulator is not running")
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+    
+    async def start(self) -> None:
+        """Start listening"""
+        if self._runner is not None:
+            return
+        runner = web.AppRunner(self.app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+        self._runner = runner
+        logger.info(f"Evolution simulator listening on {self.base_url}")
+    
+    async def stop(self) -> None:
+        """Stop listening and close the webhook client session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def __aenter__(self) -> "EvolutionSimulator":
+        await self.start()
+        return self
+    
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        await self.stop()
+    
+    def _endpoint(
+        self,
+        name: str,
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Callable[[web.Request], Awaitable[web.StreamResponse]]:
+        """Wrap an endpoint with authentication, latency, faults and bookkeeping"""
+        async def endpoint(request: web.Request) -> web.StreamResponse:
+            stats = self.stats
+            stats.requests += 1
+            stats.endpoints[name] = stats.endpoints.get(name, 0) + 1
+            
+            if request.headers.get("apikey") != self.api_key:
+                stats.unauthorized += 1
+                return _error(401, "Unauthorized")
+            if request.match_info["instance"] != self.instance_name:
+                stats.errors += 1
+                instance = request.match_info["instance"]
+                return _error(404, f'The "{instance}" instance does not exist')
+            
+            payload = await request.json() if request.can_read_body else {}
+            self.requests.append((request.method, name, payload))
+            
+            delay = self.latency.sample(self._random)
+            if delay:
+                await asyncio.sleep(delay)
+            
+            faults = self.endpoint_faults.get(name, self.faults)
+            roll = self._random.random()
+            if roll < faults.drop_rate:
+                stats.dropped += 1
+                if request.transport is not None:
+                    request.transport.close()
+                return web.Response()
+            roll -= faults.drop_rate
+            if roll < faults.rate_limit_rate:
+                stats.rate_limited += 1
+                return _error(
+                    429, "Too Many Requests", {"Retry-After": f"{faults.retry_after:g}"}
+                )
+            roll -= faults.rate_limit_rate
+            if roll < faults.error_rate:
+                stats.errors += 1
+                return _error(faults.error_status, "Internal Server Error")
+            
+            stats.succeeded += 1
+            return web.json_response(handler(payload))
+        
+        return endpoint
+    
+    def _message_key(self, number: str) -> Dict[str, Any]:
+        return {
+            "remoteJid": number if "@" in number else f"{number}@s.whatsapp.net",
+            "fromMe": True,
+            "id": f"3EB0{self._random.getrandbits(64):016X}",
+        }
+    
+    def _send_text(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "key": self._message_key(str(payload.get("number", ""))),
+            "message": {"extendedTextMessage": {"text": payload.get("text", "")}},
+            "messageTimestamp": str(int(time.time())),
+            "status": "PENDING",
+        }
+    
+    def _send_media(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        media_type = payload.get("mediatype", "image")
+        content = {"mimetype": payload.get("mimetype"), "caption": payload.get("caption")}
+        return {
+            "key": self._message_key(str(payload.get("number", ""))),
+            "message": {f"{media_type}Message": content},
+            "messageTimestamp": str(int(time.time())),
+            "status": "PENDING",
+        }
+    
+    def _send_reaction(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        key = payload.get("key", {})
+        return {
+            "key": self._message_key(str(key.get("remoteJid", ""))),
+            "message": {"reactionMessage": {"key": key, "text": payload.get("reaction", "")}},
+            "messageTimestamp": str(int(time.time())),
+            "status": "PENDING",
+        }
+    
+    def _delete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        key = {
+            "remoteJid": payload.get("remoteJid"),
+            "fromMe": True,
+            "id": payload.get("id"),
+        }
+        return {
+            "key": self._message_key(str(payload.get("remoteJid", ""))),
+            "message": {"protocolMessage": {"key": key, "type": "REVOKE"}},
+            "status": "PENDING",
+        }
+    
+    def _state(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"instance": {"instanceName": self.instance_name, "state": self.connection_state}}
+    
+    def _set_webhook(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.webhook = payload
+        return {"webhook": {"instanceName": self.instance_name, "webhook": payload}}
+    
+    def _profile_picture(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        number = str(payload.get("number", ""))
+        return {
+            "wuid": f"{number}@s.whatsapp.net",
+            "profilePictureUrl": f"https://pps.whatsapp.net/v/t61.24694-24/{number}.jpg",
+        }
+    
+    def _webhook_url(self, event: str) -> str:
+        """Destination of an event per the webhook/set configuration"""
+        if not self.webhook or not self.webhook.get("url"):
+            raise RuntimeError("No webhook URL: call webhook/set or pass url=")
+        url = str(self.webhook["url"]).rstrip("/")
+        if self.webhook.get("webhookByEvents"):
+            url += "/" + event.lower().replace(".", "-").replace("_", "-")
+        return url
+    
+    async def emit_webhooks(
+        self,
+        count: Optional[int] = None,
+        rate: float = 100.0,
+        url: Optional[str] = None,
+        factory: Optional[WebhookFactory] = None,
+        concurrency: int = 100
+    ) -> int:
+        """
+        Post webhooks at a fixed rate.
+        
+        Sends are scheduled against the start time, so a slow receiver does
+        not lower the rate until ``concurrency`` posts are in flight. Cancel
+        the calling task to stop an unbounded run.
+        
+        Args:
+            count: Number of webhooks, or None to run until cancelled
+            rate: Webhooks per second (default: 100)
+            url: Destination (default: the URL configured via webhook/set,
+                with the event path appended when webhookByEvents is set)
+            factory: Builds the webhook for a sequence number (default: text_webhook)
+            concurrency: Maximum posts in flight (default: 100)
+        
+        Returns:
+            Number of webhooks the receiver accepted with a 2xx status
+        """
+        if factory is None:
+            factory = partial(text_webhook, instance=self.instance_name)
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        session = self._session
+        slots = asyncio.Semaphore(concurrency)
+        pending = set()
+        accepted = 0
+        
+        async def post(webhook: Dict[str, Any]) -> None:
+            nonlocal accepted
+            try:
+                destination = url or self._webhook_url(webhook.get("event", ""))
+                async with session.post(destination, json=webhook) as response:
+                    await response.read()
+                    if response.status < 300:
+                        accepted += 1
+                        self.stats.webhooks_sent += 1
+                    else:
+                        self.stats.webhooks_failed += 1
+            except (aiohttp.ClientError, asyncio.TimeoutError, RuntimeError) as e:
+                self.stats.webhooks_failed += 1
+                logger.debug(f"Webhook delivery failed: {e}")
+            finally:
+                slots.release()
+        
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        index = 0
+        try:
+            while count is None or index < count:
+                delay = start + index / rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await slots.acquire()
+                task = asyncio.ensure_future(post(factory(index)))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                index += 1
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+        return accepted
+
+
+def _error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    """Evolution-style error response"""
+    return web.json_response(
+        {"status": status, "error": message, "response": {"message": [message]}},
+        status=status,
+        headers=headers
+    )
@@ -1,5 +1,49 @@
 """Webhook handling package"""
 
-from .handler import WebhookHandler
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["WebhookHandler"]
+from .._lazy import export_names, load_export
+from .handler import WebhookHandler, ParseStats
+from .dedup import Deduplicator, LRUDeduplicator, BloomDeduplicator
+from .media import MediaSpooler
+from .prefilter import Subscription, peek_event
+
+# The pipeline and dispatcher pull in asyncio, which parse-only workers do not need
+_EXPORTS = {
+    "WebhookPipeline": ".pipeline",
+    "PipelineStats": ".pipeline",
+    "Backpressure": ".pipeline",
+    "WebhookQueueFullError": ".pipeline",
+    "ChatDispatcher": ".dispatcher",
+    "DispatcherStats": ".dispatcher",
+}
+
+
+def __getattr__(name: str) -> Any:
+    return load_export(__name__, _EXPORTS, name)
+
+
+def __dir__() -> List[str]:
+    return export_names(__name__, _EXPORTS)
+
+
+if TYPE_CHECKING:
+    from .pipeline import WebhookPipeline, PipelineStats, Backpressure, WebhookQueueFullError
+    from .dispatcher import ChatDispatcher, DispatcherStats
+
+__all__ = [
+    "WebhookHandler",
+    "ParseStats",
+    "Deduplicator",
+    "LRUDeduplicator",
+    "BloomDeduplicator",
+    "WebhookPipeline",
+    "PipelineStats",
+    "Backpressure",
+    "WebhookQueueFullError",
+    "ChatDispatcher",
+    "DispatcherStats",
+    "MediaSpooler",
+    "Subscription",
+    "peek_event",
+]
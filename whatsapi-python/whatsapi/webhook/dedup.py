@@ -0,0 +1,215 @@
+"""Bounded-memory duplicate suppression for redelivered webhooks"""
+
+import hashlib
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List
+
+
+class Deduplicator(ABC):
+    """
+    Remembers recently seen message IDs.
+    
+    Implementations must use a fixed memory budget and O(1) checks.
+    """
+    
+    @abstractmethod
+    def contains(self, key: str) -> bool:
+        """
+        Check whether a key was recorded, without recording it.
+        
+        Args:
+            key: Message ID
+        
+        Returns:
+            True if the key was seen before (a duplicate), False otherwise
+        """
+        pass
+    
+    @abstractmethod
+    def add(self, key: str) -> None:
+        """
+        Record a key, e.g. once its message was handled successfully.
+        
+        Args:
+            key: Message ID
+        """
+        pass
+    
+    def seen(self, key: str) -> bool:
+        """
+        Check a key and record it.
+        
+        Args:
+            key: Message ID
+        
+        Returns:
+            True if the key was seen before (a duplicate), False otherwise
+        """
+        if self.contains(key):
+            return True
+        self.add(key)
+        return False
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget all recorded keys"""
+        pass
+
+
+class LRUDeduplicator(Deduplicator):
+    """
+    Exact duplicate detection over the most recent ``capacity`` IDs.
+    
+    No false positives; memory grows with ``capacity`` (roughly 100-150
+    bytes per remembered ID, including the ID string itself).
+    """
+    
+    def __init__(self, capacity: int = 100_000):
+        """
+        Initialize deduplicator.
+        
+        Args:
+            capacity: Number of most recent IDs remembered (default: 100000)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def contains(self, key: str) -> bool:
+        keys = self._keys
+        if key in keys:
+            keys.move_to_end(key)
+            return True
+        return False
+    
+    def add(self, key: str) -> None:
+        keys = self._keys
+        keys[key] = None
+        keys.move_to_end(key)
+        if len(keys) > self.capacity:
+            keys.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+class _BloomFilter:
+    """Plain Bloom filter over a bytearray"""
+    
+    __slots__ = ("bits", "size", "hashes", "count")
+    
+    def __init__(self, size: int, hashes: int):
+        self.bits = bytearray((size + 7) // 8)
+        self.size = size
+        self.hashes = hashes
+        self.count = 0
+    
+    def positions(self, digest: bytes) -> List[int]:
+        """Bit positions for an 8-byte digest (Kirsch-Mitzenmacher double hashing)"""
+        value = int.from_bytes(digest, "little")
+        # 32-bit halves keep the arithmetic in small ints
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        size = self.size
+        return [point % size for point in range(h1, h1 + self.hashes * h2, h2)]
+    
+    def contains(self, positions: List[int]) -> bool:
+        bits = self.bits
+        for position in positions:
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def add(self, positions: List[int]) -> None:
+        bits = self.bits
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+class BloomDeduplicator(Deduplicator):
+    """
+    Probabilistic duplicate detection with a fixed memory budget.
+    
+    Two Bloom filter generations sized for ``capacity`` IDs each are kept:
+    new IDs go into the current generation and, once it is full, the older
+    generation is discarded. At least the last ``capacity`` IDs are always
+    remembered. A new ID is wrongly reported as a duplicate with probability
+    of about ``2 * error_rate``; real duplicates are never missed within the
+    window.
+    """
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Initialize deduplicator.
+        
+        Args:
+            capacity: IDs per generation (default: 1000000)
+            error_rate: False-positive rate per generation (default: 0.001)
+        
+        Raises:
+            ValueError: If capacity or error_rate is out of range
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._current = _BloomFilter(self._size, self._hashes)
+        self._previous = _BloomFilter(self._size, self._hashes)
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes used by the bit arrays"""
+        return len(self._current.bits) + len(self._previous.bits)
+    
+    def _positions(self, key: str) -> List[int]:
+        """Bit positions of a key, shared by both generations"""
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return self._current.positions(digest)
+    
+    def _record(self, positions: List[int]) -> None:
+        """Add positions to the current generation, rotating it when full"""
+        if self._current.count >= self.capacity:
+            self._previous = self._current
+            self._current = _BloomFilter(self._size, self._hashes)
+        self._current.add(positions)
+    
+    def contains(self, key: str) -> bool:
+        positions = self._positions(key)
+        if self._current.contains(positions):
+            return True
+        if self._previous.contains(positions):
+            # Carry recurring IDs into the current generation
+            self._current.add(positions)
+            return True
+        return False
+    
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        if not self._current.contains(positions):
+            self._record(positions)
+    
+    def seen(self, key: str) -> bool:
+        # Hash once on the check-and-record path
+        positions = self._positions(key)
+        if self._current.contains(positions):
+            return True
+        if self._previous.contains(positions):
+            self._current.add(positions)
+            return True
+        self._record(positions)
+        return False
+    
+    def clear(self) -> None:
+        self._current = _BloomFilter(self._size, self._hashes)
+        self._previous = _BloomFilter(self._size, self._hashes)
@@ -0,0 +1,235 @@
+"""Concurrent message dispatch that keeps each chat in order"""
+
+import asyncio
+import inspect
+import logging
+from collections import deque
+from dataclasses import dataclass
+from types import TracebackType
+from typing import (
+    Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple, Type, Union
+)
+from ..models.message import WhatsAppMessage
+
+logger = logging.getLogger(__name__)
+
+MessageCallback = Callable[[WhatsAppMessage], Union[Awaitable[Any], Any]]
+
+
+def chat_key(message: WhatsAppMessage) -> str:
+    """Chat a message belongs to: the group for group messages, else the other party"""
+    return message.group_id or message.from_number
+
+
+@dataclass
+class DispatcherStats:
+    """Dispatch counters; a lane is the queue of pending messages of one chat"""
+    submitted: int = 0
+    dispatched: int = 0
+    handler_errors: int = 0
+    dropped: int = 0
+    max_lanes: int = 0
+    
+    @property
+    def pending(self) -> int:
+        """Messages submitted but not yet handled (queued or running)"""
+        return self.submitted - self.dispatched - self.handler_errors - self.dropped
+
+
+class ChatDispatcher:
+    """
+    Run a callback for many chats concurrently, one message at a time per chat.
+    
+    Messages of one chat (``group_id`` or ``from_number``) are handled
+    strictly in submission order, so replies never overtake each other, while
+    different chats run in parallel on ``concurrency`` workers. Workers take
+    turns across chats, so one busy chat cannot starve the others.
+    
+    A chat only holds a lane while it has pending messages; the lane is
+    removed as soon as it drains, so memory follows the number of chats
+    with work in flight, not the number of chats ever seen.
+    
+    Example:
+        dispatcher = ChatDispatcher(on_message, concurrency=32)
+        pipeline = WebhookPipeline(dispatcher.submit, workers=1)
+        async with dispatcher, pipeline:
+            ...
+    """
+    
+    def __init__(
+        self,
+        callback: MessageCallback,
+        concurrency: int = 16,
+        max_pending: int = 10000,
+        key: Callable[[WhatsAppMessage], Hashable] = chat_key
+    ):
+        """
+        Initialize dispatcher.
+        
+        Args:
+            callback: Function or coroutine function called with each WhatsAppMessage
+            concurrency: Maximum number of callbacks running at once (default: 16)
+            max_pending: Maximum number of queued or running messages; submit()
+                waits for room beyond this (default: 10000)
+            key: Function mapping a message to its ordering key (default: chat_key)
+        
+        Raises:
+            ValueError: If concurrency or max_pending is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.callback = callback
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.key = key
+        self.stats = DispatcherStats()
+        self._lanes: Dict[Hashable, Deque[WhatsAppMessage]] = {}
+        # Keys of lanes waiting for a worker; a key is here or held by a worker, never both
+        self._ready: Optional["asyncio.Queue[Hashable]"] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+    
+    async def __aenter__(self) -> "ChatDispatcher":
+        """Context manager entry"""
+        await self.start()
+        return self
+    
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        """Context manager exit"""
+        await self.stop()
+    
+    def _get_state(self) -> Tuple["asyncio.Queue[Hashable]", asyncio.Semaphore]:
+        """Create the queue and semaphore lazily so they bind to the running event loop"""
+        if self._ready is None or self._slots is None:
+            self._ready = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._ready, self._slots
+    
+    @property
+    def lanes(self) -> int:
+        """Number of chats with pending messages"""
+        return len(self._lanes)
+    
+    @property
+    def running(self) -> bool:
+        """Whether workers are running"""
+        return bool(self._tasks)
+    
+    async def start(self) -> None:
+        """
+        Start the workers. Messages submitted earlier are handled now.
+        """
+        if self._tasks:
+            return
+        ready, slots = self._get_state()
+        self._tasks = [
+            asyncio.ensure_future(self._worker(ready, slots)) for _ in range(self.concurrency)
+        ]
+        logger.info(f"Chat dispatcher started with concurrency {self.concurrency}")
+    
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the workers.
+        
+        Args:
+            drain: Handle pending messages before stopping (default: True);
+                if False, pending messages are discarded and join() returns;
+                submit() calls still waiting for room then queue their message
+                for the next start()
+        """
+        if drain and self._tasks and self._ready is not None:
+            await self._ready.join()
+        
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if not drain and self._ready is not None and self._slots is not None:
+            # Keep the queue and semaphore: join() and blocked submit() calls wait on them
+            ready, slots = self._ready, self._slots
+            while not ready.empty():
+                ready.get_nowait()
+                ready.task_done()
+            dropped = sum(len(lane) for lane in self._lanes.values())
+            self._lanes.clear()
+            self.stats.dropped += dropped
+            for _ in range(dropped):
+                slots.release()
+        logger.info("Chat dispatcher stopped")
+    
+    async def join(self) -> None:
+        """
+        Wait until every submitted message has been handled.
+        """
+        if self._ready is not None:
+            await self._ready.join()
+    
+    async def submit(self, message: WhatsAppMessage) -> None:
+        """
+        Queue a message behind earlier messages of the same chat.
+        
+        Order is defined by the order submit() calls complete, so submit
+        from a single producer (e.g. ``WebhookPipeline(..., workers=1)``)
+        when messages of one chat may arrive back to back.
+        
+        Args:
+            message: Message to hand to the callback
+        """
+        ready, slots = self._get_state()
+        await slots.acquire()
+        key = self.key(message)
+        lane = self._lanes.get(key)
+        if lane is None:
+            self._lanes[key] = deque((message,))
+            ready.put_nowait(key)
+            if len(self._lanes) > self.stats.max_lanes:
+                self.stats.max_lanes = len(self._lanes)
+        else:
+            lane.append(message)
+        self.stats.submitted += 1
+    
+    async def _worker(
+        self,
+        ready: "asyncio.Queue[Hashable]",
+        slots: asyncio.Semaphore
+    ) -> None:
+        """Take a ready chat, handle its oldest message, and requeue the chat if it has more"""
+        lanes = self._lanes
+        while True:
+            key = await ready.get()
+            try:
+                lane = lanes[key]
+                # The message stays in the lane while it runs, so new ones queue behind it
+                await self._dispatch(lane[0])
+                lane.popleft()
+                slots.release()
+                if lane:
+                    ready.put_nowait(key)
+                else:
+                    del lanes[key]
+            finally:
+                ready.task_done()
+    
+    async def _dispatch(self, message: WhatsAppMessage) -> None:
+        """Run the callback for one message, logging its errors"""
+        try:
+            result = self.callback(message)
+            if inspect.isawaitable(result):
+                await result
+            self.stats.dispatched += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats.handler_errors += 1
+            logger.error(
+                f"Message callback failed for message {message.message_id}: {e}",
+                exc_info=True
+            )
@@ -0,0 +1,189 @@
+"""Table-driven extraction of Evolution API message content"""
+
+from typing import Dict, Any, Callable, Optional, Tuple, cast
+from ..models.message import MessageType
+
+# An extractor receives the message dict and the content under its key and
+# returns the WhatsAppMessage fields it provides
+Extractor = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+def _extract_conversation(message: Dict[str, Any], content: Any) -> Dict[str, Any]:
+    """Plain text message"""
+    return {"text": content}
+
+
+def _extract_quote(
+    fields: Dict[str, Any],
+    context_info: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Add quoted message fields from a contextInfo block"""
+    if context_info:
+        fields["quoted_message_id"] = context_info.get("stanzaId")
+        quoted_msg = context_info.get("quotedMessage", {})
+        if quoted_msg:
+            fields["quoted_message_text"] = extract_text(quoted_msg)
+    return fields
+
+
+def _extract_extended_text(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """Extended text message (links, quotes, etc.)"""
+    return _extract_quote({"text": content.get("text")}, content.get("contextInfo", {}))
+
+
+def _media_extractor(with_caption: bool, with_filename: bool = False) -> Extractor:
+    """
+    Build an extractor for a media message.
+    
+    Args:
+        with_caption: Whether the media type carries a caption
+        with_filename: Whether the media type carries a file name
+    
+    Returns:
+        Extractor function
+    """
+    def extract(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+        fields = {
+            "media_url": content.get("url"),
+            "media_mime_type": content.get("mimetype"),
+            "media_size": content.get("fileLength"),
+        }
+        if with_caption:
+            fields["caption"] = content.get("caption")
+        if with_filename:
+            fields["media_filename"] = content.get("fileName")
+        return fields
+    
+    return extract
+
+
+def _extract_location(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """Location message"""
+    return {
+        "latitude": content.get("degreesLatitude"),
+        "longitude": content.get("degreesLongitude"),
+        "location_name": content.get("name"),
+        "location_address": content.get("address"),
+    }
+
+
+def _extract_contact(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """Contact (vCard) message"""
+    return {
+        "contact_vcard": content.get("vcard"),
+        "contact_name": content.get("displayName"),
+    }
+
+
+def _extract_reaction(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """Reaction: the emoji is the text, the reacted message is the quoted one"""
+    return {
+        "text": content.get("text"),
+        "quoted_message_id": content.get("key", {}).get("id"),
+    }
+
+
+def _extract_poll(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """Poll creation: the poll question is the text"""
+    return {"text": content.get("name")}
+
+
+def _extract_button_reply(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """Button reply: the selected button label is the text"""
+    return _extract_quote(
+        {"text": content.get("selectedDisplayText")},
+        content.get("contextInfo", {})
+    )
+
+
+def _extract_list_reply(message: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """List reply: the selected row title is the text"""
+    return _extract_quote({"text": content.get("title")}, content.get("contextInfo", {}))
+
+
+# Evolution message key -> (message type, extractor), in detection priority order:
+# a message carrying several of these keys gets the type of the first one
+MESSAGE_EXTRACTORS: Dict[str, Tuple[MessageType, Extractor]] = {
+    "conversation": (MessageType.TEXT, _extract_conversation),
+    "extendedTextMessage": (MessageType.TEXT, _extract_extended_text),
+    "imageMessage": (MessageType.IMAGE, _media_extractor(with_caption=True)),
+    "videoMessage": (MessageType.VIDEO, _media_extractor(with_caption=True)),
+    "audioMessage": (MessageType.AUDIO, _media_extractor(with_caption=False)),
+    "documentMessage": (
+        MessageType.DOCUMENT,
+        _media_extractor(with_caption=True, with_filename=True)
+    ),
+    "stickerMessage": (MessageType.STICKER, _media_extractor(with_caption=False)),
+    "locationMessage": (MessageType.LOCATION, _extract_location),
+    "contactMessage": (MessageType.CONTACT, _extract_contact),
+    "reactionMessage": (MessageType.REACTION, _extract_reaction),
+    "pollCreationMessage": (MessageType.POLL, _extract_poll),
+    "pollCreationMessageV3": (MessageType.POLL, _extract_poll),
+    "buttonsResponseMessage": (MessageType.BUTTON, _extract_button_reply),
+    "templateButtonReplyMessage": (MessageType.BUTTON, _extract_button_reply),
+    "listResponseMessage": (MessageType.LIST, _extract_list_reply),
+}
+
+
+def register_extractor(message_key: str, message_type: MessageType, extractor: Extractor) -> None:
+    """
+    Register (or replace) the extractor for an Evolution message key.
+    
+    New keys get the lowest detection priority; replaced keys keep theirs.
+    
+    Args:
+        message_key: Key inside the webhook "message" object (e.g., "imageMessage")
+        message_type: MessageType assigned to messages with this key
+        extractor: Callable returning the WhatsAppMessage fields for the content
+    """
+    MESSAGE_EXTRACTORS[message_key] = (message_type, extractor)
+
+
+def extract_content(message: Dict[str, Any]) -> Tuple[MessageType, Dict[str, Any]]:
+    """
+    Detect the message type and extract its fields in one pass.
+    
+    Args:
+        message: Message object from webhook
+    
+    Returns:
+        Tuple of (MessageType, fields for WhatsAppMessage)
+    """
+    extractors = MESSAGE_EXTRACTORS
+    found = None
+    for key in message:
+        if key in extractors:
+            if found is not None:
+                # Several content keys: table order decides, not the payload's key order
+                found = next(key for key in extractors if key in message)
+                break
+            found = key
+    if found is None:
+        return MessageType.UNKNOWN, {}
+    message_type, extractor = extractors[found]
+    return message_type, extractor(message, message[found])
+
+
+def extract_text(message: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract text content from message.
+    
+    Args:
+        message: Message object
+    
+    Returns:
+        Text content or None
+    """
+    # Simple text message
+    if "conversation" in message:
+        return cast(Optional[str], message["conversation"])
+    
+    # Extended text message (links, quotes, etc.)
+    if "extendedTextMessage" in message:
+        return cast(Optional[str], message["extendedTextMessage"].get("text"))
+    
+    # Text in other message types
+    if "text" in message:
+        return cast(Optional[str], message["text"])
+    
+    return None
@@ -1,12 +1,60 @@
 """Webhook handler for parsing Evolution API webhooks"""
 
 import logging
-from typing import Dict, Any, Optional
+import time
+from dataclasses import dataclass
+from typing import (
+    Dict, Any, Callable, Optional, Iterable, Iterator, AsyncIterable, AsyncIterator, Union, cast
+)
 from datetime import datetime
 from ..models.message import WhatsAppMessage, MessageType, MessageDirection
+from ..models.jid import Jid
+from ..models.events import (
+    ALL_EVENTS, EVENT_NAMES, WebhookEvent, WebhookEventModel, MessageStatus, MessageStatusUpdate,
+    ConnectionUpdate, QRCodeUpdate
+)
+from .extractors import MESSAGE_EXTRACTORS, extract_content, extract_text
+from .dedup import Deduplicator
+from .media import MediaSpooler
+from .prefilter import Subscription, as_bytes
+from ..metrics import MetricsHook, get_metrics_hook
+from ..codec import JSONCodec, get_json_codec
 
 logger = logging.getLogger(__name__)
 
+# Only messages.upsert produces messages for parse() and the batch parsers
+_UPSERT = Subscription.of(WebhookEvent.MESSAGES_UPSERT)
+
+# Event names carrying new messages (Evolution uses both spellings)
+UPSERT_EVENTS = _UPSERT.names
+
+# Events sharing the messages.upsert payload shape
+_MESSAGE_EVENTS = WebhookEvent.MESSAGES_UPSERT | WebhookEvent.SEND_MESSAGE
+
+# Items accepted by parse_many / parse_stream: decoded webhooks or NDJSON text
+WebhookSource = Union[Dict[str, Any], bytes, bytearray, memoryview, str]
+_RAW_BODY_TYPES = (bytes, bytearray, memoryview, str)
+
+
+@dataclass
+class ParseStats:
+    """
+    Counters collected by WebhookHandler.parse_many / parse_stream.
+    
+    Batch parsing does not log per event; inspect these counters instead.
+    Messages of multi-message webhooks are counted individually.
+    """
+    parsed: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    failed: int = 0
+    duplicates: int = 0
+    
+    @property
+    def total(self) -> int:
+        """Total number of events seen, counting each message of multi-message webhooks"""
+        return self.parsed + self.skipped + self.invalid + self.failed + self.duplicates
+
 
 class WebhookHandler:
     """
@@ -17,202 +65,621 @@ class WebhookHandler:
     """
     
     @staticmethod
-    def parse(webhook_data: Dict[str, Any]) -> Optional[WhatsAppMessage]:
+    def parse(
+        webhook_data: Dict[str, Any],
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None
+    ) -> Optional[WhatsAppMessage]:
         """
         Parse Evolution API webhook to WhatsAppMessage.
         
+        A messages.upsert webhook may carry several messages (e.g. history
+        sync after a reconnect); only the first is returned. Use
+        ``parse_events()`` or ``parse_many()`` to get all of them.
+        
         Args:
             webhook_data: Raw webhook JSON from Evolution API
+            deduplicator: Optional Deduplicator; redelivered messages return None
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
             
         Returns:
-            WhatsAppMessage object or None if invalid/unsupported
+            WhatsAppMessage object or None if invalid/unsupported/duplicate
         """
-        try:
-            # Validate basic structure
-            if not WebhookHandler._validate(webhook_data):
-                logger.warning("Invalid webhook structure")
-                return None
-            
-            event = webhook_data.get("event")
-            data = webhook_data.get("data", {})
-            
-            # Handle different event types
-            if event == "messages.upsert":
-                return WebhookHandler._parse_message_upsert(data)
-            elif event == "MESSAGES_UPSERT":
-                return WebhookHandler._parse_message_upsert(data)
-            else:
-                logger.debug(f"Unsupported event type: {event}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error parsing webhook: {e}", exc_info=True)
-            return None
+        return cast(Optional[WhatsAppMessage], WebhookHandler.parse_event(
+            webhook_data, WebhookEvent.MESSAGES_UPSERT, deduplicator, media_spooler
+        ))
     
     @staticmethod
-    def _validate(data: Dict[str, Any]) -> bool:
+    def parse_event(
+        webhook_data: Dict[str, Any],
+        events: WebhookEvent = ALL_EVENTS,
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None
+    ) -> Optional[WebhookEventModel]:
         """
-        Validate webhook structure.
+        Parse any subscribed Evolution API webhook to its typed model.
+        
+        messages.upsert and send.message produce WhatsAppMessage objects,
+        messages.update a MessageStatusUpdate, connection.update a
+        ConnectionUpdate and qrcode.updated a QRCodeUpdate. For webhooks
+        carrying several items only the first is returned; see
+        ``parse_events()``.
         
         Args:
-            data: Webhook data
+            webhook_data: Raw webhook JSON from Evolution API
+            events: WebhookEvent mask of events to parse; others return None
+            deduplicator: Optional Deduplicator; redelivered messages.upsert events return None
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
             
         Returns:
-            True if valid, False otherwise
+            Event model, or None if invalid/unsubscribed/duplicate
         """
-        return "event" in data and "data" in data
+        return next(
+            WebhookHandler.parse_events(webhook_data, events, deduplicator, media_spooler),
+            None
+        )
     
     @staticmethod
-    def _parse_message_upsert(data: Dict[str, Any]) -> Optional[WhatsAppMessage]:
+    def parse_events(
+        webhook: WebhookSource,
+        events: WebhookEvent = ALL_EVENTS,
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None,
+        codec: Optional[JSONCodec] = None
+    ) -> Iterator[WebhookEventModel]:
         """
-        Parse messages.upsert event.
+        Lazily parse every item of one webhook.
+        
+        ``data`` may hold a single item, a list of items, or a
+        ``{"messages": [...]}`` batch, as in messages.upsert bursts during
+        history sync. Items are built one at a time as the generator is
+        consumed, and each message keeps only its own entry as ``raw_data``,
+        so a flood of thousands of messages adds a constant overhead per
+        message on top of the decoded payload.
         
         Args:
-            data: Message data from webhook
+            webhook: Webhook dict, or a raw request body holding one JSON webhook
+            events: WebhookEvent mask of events to parse; others yield nothing
+            deduplicator: Optional Deduplicator; redelivered messages.upsert items are skipped
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
+            codec: JSONCodec for raw bodies (default: the one installed with set_json_codec)
             
-        Returns:
-            WhatsAppMessage object or None
+        Yields:
+            Event models (WhatsAppMessage for messages.upsert and send.message)
         """
-        try:
-            key = data.get("key", {})
-            message = data.get("message", {})
-            message_timestamp = data.get("messageTimestamp")
-            push_name = data.get("pushName", "")
-            
-            # Extract message ID
-            message_id = key.get("id", "")
-            if not message_id:
-                logger.warning("Message ID not found")
-                return None
-            
-            # Extract phone numbers
-            remote_jid = key.get("remoteJid", "")
-            from_me = key.get("fromMe", False)
+        if isinstance(webhook, _RAW_BODY_TYPES):
+            decoded = WebhookHandler._decode_body(webhook, events, codec)
+            if decoded is None:
+                return
+            webhook = decoded
+        
+        metrics = get_metrics_hook()
+        if metrics is not None:
+            started = time.perf_counter()
+        
+        # Validate basic structure
+        if not isinstance(webhook, dict) or not WebhookHandler._validate(webhook):
+            logger.warning("Invalid webhook structure")
+            if metrics is not None:
+                WebhookHandler._observe(metrics, None, None, "invalid", started)
+            return
+        
+        # Handle different event types
+        event = webhook.get("event")
+        if not Subscription.of(events).accepts(event):
+            logger.debug(f"Unsupported event type: {event}")
+            if metrics is not None:
+                WebhookHandler._observe(metrics, event, None, "unsupported_event", started)
+            return
+        
+        kind = EVENT_NAMES[cast(str, event)]
+        instance = webhook.get("instance")
+        for data in WebhookHandler._iter_items(webhook.get("data", {})):
+            result = None
+            reason = None
+            try:
+                if not isinstance(data, dict):
+                    logger.warning("Invalid webhook structure")
+                    reason = "invalid"
+                elif (
+                    kind is WebhookEvent.MESSAGES_UPSERT
+                    and WebhookHandler._is_duplicate(data, deduplicator)
+                ):
+                    logger.debug("Duplicate message skipped")
+                    reason = "duplicate"
+                else:
+                    result = WebhookHandler._build_event(kind, data, instance, media_spooler)
+                    if result is None:
+                        logger.warning("Message ID not found")
+                        reason = "missing_id"
+                    elif kind is WebhookEvent.MESSAGES_UPSERT:
+                        WebhookHandler._mark_seen(cast(WhatsAppMessage, result), deduplicator)
+            except Exception as e:
+                logger.error(f"Error parsing webhook: {e}", exc_info=True)
+                result = None
+                reason = "error"
             
-            from_number = WebhookHandler._extract_phone(remote_jid)
+            if metrics is not None:
+                WebhookHandler._observe(metrics, event, result, reason, started)
+            if result is not None:
+                yield result
+            if metrics is not None:
+                started = time.perf_counter()
+    
+    @staticmethod
+    def parse_bytes(
+        body: Union[bytes, bytearray, memoryview, str],
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None,
+        codec: Optional[JSONCodec] = None
+    ) -> Optional[WhatsAppMessage]:
+        """
+        Decode and parse a raw webhook request body.
+        
+        Prefer this over decoding the body yourself: it uses the configured
+        JSON codec (orjson or msgspec when installed), and decoding is
+        usually the largest cost of handling a webhook. Bodies of other
+        events are recognized by name and dropped without being decoded.
+        
+        Args:
+            body: Request body holding one JSON webhook
+            deduplicator: Optional Deduplicator; redelivered messages return None
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
+            codec: JSONCodec to decode with (default: the one installed with set_json_codec)
             
-            # Determine direction
-            direction = MessageDirection.OUTGOING if from_me else MessageDirection.INCOMING
+        Returns:
+            WhatsAppMessage object or None if undecodable/invalid/unsupported/duplicate
+        """
+        return cast(Optional[WhatsAppMessage], WebhookHandler.parse_event_bytes(
+            body, WebhookEvent.MESSAGES_UPSERT, deduplicator, media_spooler, codec
+        ))
+    
+    @staticmethod
+    def parse_event_bytes(
+        body: Union[bytes, bytearray, memoryview, str],
+        events: WebhookEvent = ALL_EVENTS,
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None,
+        codec: Optional[JSONCodec] = None
+    ) -> Optional[WebhookEventModel]:
+        """
+        Decode and parse a raw webhook request body of any subscribed event.
+        
+        The event name is read from the raw bytes first, so events outside
+        ``events`` are dropped before any JSON decoding.
+        
+        Args:
+            body: Request body holding one JSON webhook
+            events: WebhookEvent mask of events to parse; others return None
+            deduplicator: Optional Deduplicator; redelivered messages.upsert events return None
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
+            codec: JSONCodec to decode with (default: the one installed with set_json_codec)
             
-            # Check if group message
-            is_group = "@g.us" in remote_jid
-            group_id = remote_jid if is_group else None
+        Returns:
+            Event model, or None if undecodable/invalid/unsubscribed/duplicate
+        """
+        webhook_data = WebhookHandler._decode_body(body, events, codec)
+        if webhook_data is None:
+            return None
+        return WebhookHandler.parse_event(webhook_data, events, deduplicator, media_spooler)
+    
+    @staticmethod
+    def _decode_body(
+        body: Union[bytes, bytearray, memoryview, str],
+        events: WebhookEvent,
+        codec: Optional[JSONCodec]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Decode a raw webhook body unless the prefilter rejects its event.
+        
+        Args:
+            body: Request body holding one JSON webhook
+            events: WebhookEvent mask of wanted events
+            codec: JSONCodec to decode with, or None for the installed one
             
-            # Detect message type
-            message_type = WebhookHandler._detect_type(message)
+        Returns:
+            Decoded webhook dict, or None if unwanted/undecodable/not an object
+        """
+        body = as_bytes(body)
+        unwanted = Subscription.of(events).rejects(body)
+        if unwanted is not None:
+            logger.debug(f"Unsupported event type: {unwanted}")
+            metrics = get_metrics_hook()
+            if metrics is not None:
+                metrics.webhook_dropped(unwanted, "unsupported_event", 0.0)
+            return None
+        
+        try:
+            webhook_data = (codec or get_json_codec()).loads(body)
+        except (ValueError, RecursionError) as e:
+            # The stdlib decoder raises RecursionError on deeply nested bodies
+            logger.warning(f"Undecodable webhook body: {e}")
+            webhook_data = None
+        
+        if not isinstance(webhook_data, dict):
+            if webhook_data is not None:
+                logger.warning("Invalid webhook structure")
+            metrics = get_metrics_hook()
+            if metrics is not None:
+                metrics.webhook_dropped("", "invalid", 0.0)
+            return None
+        return webhook_data
+    
+    @staticmethod
+    def _observe(
+        metrics: MetricsHook,
+        event: Any,
+        result: Optional[WebhookEventModel],
+        reason: Optional[str],
+        started: float
+    ) -> None:
+        """Report one parse outcome to the metrics hook"""
+        duration = time.perf_counter() - started
+        # Only known event names become labels, so senders cannot blow up cardinality
+        if not isinstance(event, str):
+            event = ""
+        elif event not in EVENT_NAMES:
+            event = "other"
+        if isinstance(result, WhatsAppMessage):
+            metrics.webhook_parsed(event, result.message_type._value_, duration)
+        elif result is not None:
+            metrics.webhook_parsed(event, "", duration)
+        else:
+            metrics.webhook_dropped(event, reason or "error", duration)
+    
+    @staticmethod
+    def parse_many(
+        events: Union[WebhookSource, Iterable[WebhookSource]],
+        stats: Optional[ParseStats] = None,
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None
+    ) -> Iterator[WhatsAppMessage]:
+        """
+        Lazily parse a batch of webhooks.
+        
+        Accepts an iterable of decoded webhook dicts, an iterable of NDJSON
+        lines/chunks (e.g. a file opened in binary mode), or a single NDJSON
+        buffer. Messages are yielded one at a time, so arbitrarily large
+        backlogs can be drained with constant memory. Webhooks carrying
+        several messages yield each of them.
+        
+        Args:
+            events: Webhook dicts, NDJSON lines, or a raw NDJSON buffer
+            stats: Optional ParseStats updated with parsed/skipped/invalid/failed counts
+            deduplicator: Optional Deduplicator; redelivered messages are counted, not yielded
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
             
-            # Extract content based on type
-            text = None
-            caption = None
-            media_url = None
-            media_mime_type = None
-            media_size = None
-            media_filename = None
-            latitude = None
-            longitude = None
-            location_name = None
-            location_address = None
-            contact_vcard = None
-            contact_name = None
-            quoted_message_id = None
-            quoted_message_text = None
+        Yields:
+            WhatsAppMessage objects for every supported event
+        """
+        if stats is None:
+            stats = ParseStats()
+        
+        if isinstance(events, (dict, bytes, bytearray, memoryview, str)):
+            events = (events,)
+        
+        for item in events:
+            for webhook_data in WebhookHandler._iter_documents(item, stats):
+                yield from WebhookHandler._parse_quiet(
+                    webhook_data, stats, deduplicator, media_spooler
+                )
+    
+    @staticmethod
+    async def parse_stream(
+        events: AsyncIterable[WebhookSource],
+        stats: Optional[ParseStats] = None,
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None
+    ) -> AsyncIterator[WhatsAppMessage]:
+        """
+        Lazily parse webhooks from an async source.
+        
+        Items may be webhook dicts or NDJSON bytes/str. Byte items must end on
+        line boundaries, e.g. lines read from ``aiohttp.StreamReader``.
+        
+        Args:
+            events: Async iterable of webhook dicts or NDJSON lines
+            stats: Optional ParseStats updated with parsed/skipped/invalid/failed counts
+            deduplicator: Optional Deduplicator; redelivered messages are counted, not yielded
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
             
-            if message_type == MessageType.TEXT:
-                text = WebhookHandler._extract_text(message)
-                
-                # Check for quoted message
-                if "extendedTextMessage" in message:
-                    ext_msg = message["extendedTextMessage"]
-                    context_info = ext_msg.get("contextInfo", {})
-                    if context_info:
-                        quoted_message_id = context_info.get("stanzaId")
-                        quoted_msg = context_info.get("quotedMessage", {})
-                        if quoted_msg:
-                            quoted_message_text = WebhookHandler._extract_text(quoted_msg)
+        Yields:
+            WhatsAppMessage objects for every supported event
+        """
+        if stats is None:
+            stats = ParseStats()
+        
+        async for item in events:
+            for webhook_data in WebhookHandler._iter_documents(item, stats):
+                for message in WebhookHandler._parse_quiet(
+                    webhook_data, stats, deduplicator, media_spooler
+                ):
+                    yield message
+    
+    @staticmethod
+    def _iter_documents(
+        item: WebhookSource,
+        stats: ParseStats,
+        subscription: Subscription = _UPSERT
+    ) -> Iterator[Any]:
+        """
+        Yield decoded webhook documents from a dict or an NDJSON buffer.
+        
+        NDJSON lines of events outside the subscription are counted as
+        skipped without being decoded.
+        
+        Args:
+            item: Webhook dict or NDJSON bytes/str
+            stats: Counters to update for undecodable and skipped lines
+            subscription: Events worth decoding (default: messages.upsert)
             
-            elif message_type == MessageType.IMAGE:
-                img_msg = message.get("imageMessage", {})
-                media_url = img_msg.get("url")
-                media_mime_type = img_msg.get("mimetype")
-                media_size = img_msg.get("fileLength")
-                caption = img_msg.get("caption")
+        Yields:
+            Decoded JSON documents (not yet validated)
+        """
+        if isinstance(item, dict):
+            yield item
+            return
+        
+        buffer = as_bytes(item)
+        loads = get_json_codec().loads
+        start = 0
+        end = len(buffer)
+        while start < end:
+            stop = buffer.find(b"\n", start)
+            if stop == -1:
+                stop = end
+            unwanted = subscription.rejects(buffer, start, stop)
+            if unwanted is not None:
+                start = stop + 1
+                stats.skipped += 1
+                metrics = get_metrics_hook()
+                if metrics is not None:
+                    metrics.webhook_dropped(unwanted, "unsupported_event", 0.0)
+                continue
+            line = buffer[start:stop]
+            start = stop + 1
+            if not line.strip():
+                continue
+            try:
+                document = loads(line)
+            except (ValueError, RecursionError):
+                stats.invalid += 1
+                metrics = get_metrics_hook()
+                if metrics is not None:
+                    metrics.webhook_dropped("", "invalid", 0.0)
+            else:
+                yield document
+    
+    @staticmethod
+    def _parse_quiet(
+        webhook_data: Any,
+        stats: ParseStats,
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None
+    ) -> Iterator[WhatsAppMessage]:
+        """
+        Parse a single webhook, recording outcomes in stats instead of logging.
+        
+        Args:
+            webhook_data: Decoded webhook document
+            stats: Counters to update (per message for multi-message payloads)
+            deduplicator: Optional Deduplicator for redelivered messages
+            media_spooler: Optional MediaSpooler for large inline media
             
-            elif message_type == MessageType.VIDEO:
-                vid_msg = message.get("videoMessage", {})
-                media_url = vid_msg.get("url")
-                media_mime_type = vid_msg.get("mimetype")
-                media_size = vid_msg.get("fileLength")
-                caption = vid_msg.get("caption")
+        Yields:
+            WhatsAppMessage objects
+        """
+        metrics = get_metrics_hook()
+        if metrics is not None:
+            started = time.perf_counter()
+        
+        if not isinstance(webhook_data, dict) or not WebhookHandler._validate(webhook_data):
+            stats.invalid += 1
+            if metrics is not None:
+                WebhookHandler._observe(metrics, None, None, "invalid", started)
+            return
+        event = webhook_data["event"]
+        if not _UPSERT.accepts(event):
+            stats.skipped += 1
+            if metrics is not None:
+                WebhookHandler._observe(metrics, event, None, "unsupported_event", started)
+            return
+        
+        for data in WebhookHandler._iter_items(webhook_data["data"] or {}):
+            message = None
+            try:
+                if not isinstance(data, dict):
+                    stats.invalid += 1
+                    reason = "invalid"
+                elif WebhookHandler._is_duplicate(data, deduplicator):
+                    stats.duplicates += 1
+                    reason = "duplicate"
+                else:
+                    message = WebhookHandler._build_message(data, media_spooler)
+                    if message is None:
+                        stats.invalid += 1
+                        reason = "missing_id"
+                    else:
+                        WebhookHandler._mark_seen(message, deduplicator)
+                        stats.parsed += 1
+                        reason = None
+            except Exception:
+                stats.failed += 1
+                reason = "error"
             
-            elif message_type == MessageType.AUDIO:
-                aud_msg = message.get("audioMessage", {})
-                media_url = aud_msg.get("url")
-                media_mime_type = aud_msg.get("mimetype")
-                media_size = aud_msg.get("fileLength")
+            if metrics is not None:
+                WebhookHandler._observe(metrics, event, message, reason, started)
+            if message is not None:
+                yield message
+            if metrics is not None:
+                started = time.perf_counter()
+    
+    @staticmethod
+    def _iter_items(data: Any) -> Iterable[Any]:
+        """
+        Get the items of a webhook's data, which may hold one or several.
+        
+        Args:
+            data: ``data`` of a webhook: one item, a list of items, or a
+                ``{"messages": [...]}`` batch
             
-            elif message_type == MessageType.DOCUMENT:
-                doc_msg = message.get("documentMessage", {})
-                media_url = doc_msg.get("url")
-                media_mime_type = doc_msg.get("mimetype")
-                media_size = doc_msg.get("fileLength")
-                media_filename = doc_msg.get("fileName")
-                caption = doc_msg.get("caption")
+        Returns:
+            Iterable over the items, without copying them
+        """
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict) and "key" not in data:
+            messages = data.get("messages")
+            if isinstance(messages, list):
+                return messages
+        return (data,)
+    
+    @staticmethod
+    def _validate(data: Dict[str, Any]) -> bool:
+        """
+        Validate webhook structure.
+        
+        Args:
+            data: Webhook data
             
-            elif message_type == MessageType.STICKER:
-                stk_msg = message.get("stickerMessage", {})
-                media_url = stk_msg.get("url")
-                media_mime_type = stk_msg.get("mimetype")
-                media_size = stk_msg.get("fileLength")
+        Returns:
+            True if valid, False otherwise
+        """
+        return "event" in data and "data" in data
+    
+    @staticmethod
+    def _is_duplicate(data: Dict[str, Any], deduplicator: Optional[Deduplicator]) -> bool:
+        """
+        Check a messages.upsert payload against the deduplicator by key.id.
+        
+        The ID is not recorded here: _mark_seen records it once the message was
+        built, so a delivery that fails to parse is accepted when redelivered.
+        
+        Args:
+            data: Message data from webhook
+            deduplicator: Deduplicator, or None to disable the check
             
-            elif message_type == MessageType.LOCATION:
-                loc_msg = message.get("locationMessage", {})
-                latitude = loc_msg.get("degreesLatitude")
-                longitude = loc_msg.get("degreesLongitude")
-                location_name = loc_msg.get("name")
-                location_address = loc_msg.get("address")
+        Returns:
+            True if the message ID was seen before
+        """
+        if deduplicator is None:
+            return False
+        message_id = data.get("key", {}).get("id")
+        return bool(message_id) and deduplicator.contains(message_id)
+    
+    @staticmethod
+    def _mark_seen(message: WhatsAppMessage, deduplicator: Optional[Deduplicator]) -> None:
+        """
+        Record a successfully built message in the deduplicator.
+        
+        Args:
+            message: Message built from a messages.upsert payload
+            deduplicator: Deduplicator, or None to disable the check
+        """
+        if deduplicator is not None:
+            deduplicator.add(message.message_id)
+    
+    @staticmethod
+    def _build_event(
+        event: WebhookEvent,
+        data: Dict[str, Any],
+        instance: Optional[str],
+        media_spooler: Optional[MediaSpooler] = None
+    ) -> Optional[WebhookEventModel]:
+        """
+        Build the typed model for one event without logging.
+        
+        Args:
+            event: Event of the webhook
+            data: Event data from webhook
+            instance: Instance name from the webhook
+            media_spooler: Optional MediaSpooler for large inline media
             
-            elif message_type == MessageType.CONTACT:
-                cont_msg = message.get("contactMessage", {})
-                contact_vcard = cont_msg.get("vcard")
-                contact_name = cont_msg.get("displayName")
+        Returns:
+            Event model, or None if a required ID is missing
             
-            # Create timestamp
-            if message_timestamp:
-                timestamp = datetime.fromtimestamp(int(message_timestamp))
-            else:
-                timestamp = datetime.now()
+        Raises:
+            Exception: If the payload is malformed
+        """
+        if event in _MESSAGE_EVENTS:
+            return WebhookHandler._build_message(data, media_spooler)
+        return _EVENT_BUILDERS[event](data, instance)
+    
+    @staticmethod
+    def _build_message(
+        data: Dict[str, Any],
+        media_spooler: Optional[MediaSpooler] = None
+    ) -> Optional[WhatsAppMessage]:
+        """
+        Build a WhatsAppMessage from messages.upsert data without logging.
+        
+        Args:
+            data: Message data from webhook
+            media_spooler: Optional MediaSpooler; spilled media is removed from
+                data and attached as ``media_file``
             
-            # Create message object
-            return WhatsAppMessage(
-                message_id=message_id,
-                from_number=from_number,
-                to_number=None,  # Not available in incoming messages
-                message_type=message_type,
-                direction=direction,
-                timestamp=timestamp,
-                text=text,
-                caption=caption,
-                media_url=media_url,
-                media_mime_type=media_mime_type,
-                media_size=media_size,
-                media_filename=media_filename,
-                latitude=latitude,
-                longitude=longitude,
-                location_name=location_name,
-                location_address=location_address,
-                contact_vcard=contact_vcard,
-                contact_name=contact_name,
-                quoted_message_id=quoted_message_id,
-                quoted_message_text=quoted_message_text,
-                is_group=is_group,
-                group_id=group_id,
-                sender_name=push_name if push_name else None,
-                raw_data=data
-            )
+        Returns:
+            WhatsAppMessage object, or None if the message ID is missing
             
-        except Exception as e:
-            logger.error(f"Error parsing message upsert: {e}", exc_info=True)
+        Raises:
+            Exception: If the payload is malformed
+        """
+        key = data.get("key", {})
+        message = data.get("message", {})
+        message_timestamp = data.get("messageTimestamp")
+        push_name = data.get("pushName", "")
+        
+        # Extract message ID
+        message_id = key.get("id", "")
+        if not message_id:
             return None
+        
+        # Resolve chat and sender through the JID cache; in groups the sender is the participant
+        remote_jid = key.get("remoteJid", "")
+        from_me = key.get("fromMe", False)
+        chat = _parse_jid(remote_jid)
+        group_id = chat.jid if chat is not None and chat.is_group else None
+        is_group = group_id is not None
+        participant = key.get("participant") if is_group else None
+        sender = _parse_jid(participant) if participant else chat
+        if sender is not None:
+            from_number = sender.phone or sender.jid
+        else:
+            # Addresses Jid cannot normalize are kept as sent, like before the JID cache
+            from_number = participant or remote_jid or ""
+        
+        # Determine direction
+        direction = MessageDirection.OUTGOING if from_me else MessageDirection.INCOMING
+        
+        # Detect message type and extract its content in one pass
+        message_type, content = extract_content(message)
+        
+        # Inline base64 media (webhook_base64=True) is decoded to disk, not kept in raw_data
+        if media_spooler is not None and "base64" in message:
+            media_file = media_spooler.spill(message, content.get("media_mime_type"))
+            if media_file is not None:
+                content["media_file"] = media_file
+        
+        # Create timestamp
+        if message_timestamp:
+            timestamp = datetime.fromtimestamp(int(message_timestamp))
+        else:
+            timestamp = datetime.now()
+        
+        # Create message object
+        return WhatsAppMessage(
+            message_id=message_id,
+            from_number=from_number,
+            to_number=None,  # Not available in incoming messages
+            message_type=message_type,
+            direction=direction,
+            timestamp=timestamp,
+            is_group=is_group,
+            group_id=group_id,
+            sender_name=push_name if push_name else None,
+            raw_data=data,
+            **content
+        )
     
     @staticmethod
     def _extract_phone(jid: str) -> str:
@@ -223,19 +690,13 @@ class WebhookHandler:
             jid: JID string (e.g., "972501234567@s.whatsapp.net")
             
         Returns:
-            Phone number with + prefix (e.g., "+972501234567")
+            Phone number with + prefix (e.g., "+972501234567"), or the
+            normalized JID for groups, LIDs and broadcasts
         """
-        if not jid:
-            return ""
-        
-        # Split by @ to get number part
-        phone = jid.split("@")[0]
-        
-        # Add + prefix if not present
-        if not phone.startswith("+"):
-            phone = f"+{phone}"
-        
-        return phone
+        parsed = _parse_jid(jid)
+        if parsed is None:
+            return jid or ""
+        return parsed.phone or parsed.jid
     
     @staticmethod
     def _detect_type(message: Dict[str, Any]) -> MessageType:
@@ -248,27 +709,13 @@ class WebhookHandler:
         Returns:
             MessageType enum value
         """
-        if "conversation" in message:
-            return MessageType.TEXT
-        elif "extendedTextMessage" in message:
-            return MessageType.TEXT
-        elif "imageMessage" in message:
-            return MessageType.IMAGE
-        elif "videoMessage" in message:
-            return MessageType.VIDEO
-        elif "audioMessage" in message:
-            return MessageType.AUDIO
-        elif "documentMessage" in message:
-            return MessageType.DOCUMENT
-        elif "stickerMessage" in message:
-            return MessageType.STICKER
-        elif "locationMessage" in message:
-            return MessageType.LOCATION
-        elif "contactMessage" in message:
-            return MessageType.CONTACT
-        else:
-            logger.debug(f"Unknown message type: {list(message.keys())}")
-            return MessageType.UNKNOWN
+        for key in message:
+            entry = MESSAGE_EXTRACTORS.get(key)
+            if entry is not None:
+                return entry[0]
+        
+        logger.debug(f"Unknown message type: {list(message.keys())}")
+        return MessageType.UNKNOWN
     
     @staticmethod
     def _extract_text(message: Dict[str, Any]) -> Optional[str]:
@@ -281,16 +728,73 @@ class WebhookHandler:
         Returns:
             Text content or None
         """
-        # Simple text message
-        if "conversation" in message:
-            return message["conversation"]
-        
-        # Extended text message (links, quotes, etc.)
-        if "extendedTextMessage" in message:
-            return message["extendedTextMessage"].get("text")
-        
-        # Text in other message types
-        if "text" in message:
-            return message["text"]
-        
+        return extract_text(message)
+
+
+def _parse_jid(value: Any) -> Optional[Jid]:
+    """Parse a payload address, or None if it is missing or Jid cannot normalize it"""
+    if not value or not isinstance(value, str):
         return None
+    try:
+        return Jid.parse(value)
+    except ValueError:
+        logger.debug(f"Keeping unparseable JID as is: {value!r}")
+        return None
+
+
+def _build_status_update(
+    data: Dict[str, Any],
+    instance: Optional[str]
+) -> Optional[MessageStatusUpdate]:
+    """Build a MessageStatusUpdate from messages.update data (flat v2 or keyed v1 shape)"""
+    key = data.get("key") or {}
+    message_id = data.get("keyId") or key.get("id")
+    if not message_id:
+        return None
+    
+    remote_jid = data.get("remoteJid") or key.get("remoteJid")
+    parsed = _parse_jid(remote_jid)
+    status = data["status"] if "status" in data else (data.get("update") or {}).get("status")
+    return MessageStatusUpdate(
+        message_id=message_id,
+        remote_jid=parsed.jid if parsed is not None else (remote_jid or None),
+        from_me=bool(data.get("fromMe", key.get("fromMe", False))),
+        status=MessageStatus.from_value(status),
+        participant=data.get("participant") or key.get("participant"),
+        instance=instance,
+        raw_data=data
+    )
+
+
+def _build_connection_update(data: Dict[str, Any], instance: Optional[str]) -> ConnectionUpdate:
+    """Build a ConnectionUpdate from connection.update data"""
+    return ConnectionUpdate(
+        state=data.get("state") or "",
+        status_reason=data.get("statusReason"),
+        wuid=data.get("wuid"),
+        profile_name=data.get("profileName"),
+        instance=data.get("instance") or instance,
+        raw_data=data
+    )
+
+
+def _build_qrcode_update(data: Dict[str, Any], instance: Optional[str]) -> QRCodeUpdate:
+    """Build a QRCodeUpdate from qrcode.updated data"""
+    qrcode = data.get("qrcode") or data
+    return QRCodeUpdate(
+        code=qrcode.get("code"),
+        base64=qrcode.get("base64"),
+        pairing_code=qrcode.get("pairingCode"),
+        instance=qrcode.get("instance") or instance,
+        raw_data=data
+    )
+
+
+# Builders for events that do not carry messages
+_EVENT_BUILDERS: Dict[
+    WebhookEvent, Callable[[Dict[str, Any], Optional[str]], Optional[WebhookEventModel]]
+] = {
+    WebhookEvent.MESSAGES_UPDATE: _build_status_update,
+    WebhookEvent.CONNECTION_UPDATE: _build_connection_update,
+    WebhookEvent.QRCODE_UPDATED: _build_qrcode_update,
+}
@@ -0,0 +1,86 @@
+"""Spill large inline base64 webhook media to temporary files"""
+
+import binascii
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+from ..models.media import MediaHandle
+
+logger = logging.getLogger(__name__)
+
+# Base64 characters decoded per step; a multiple of 4 so chunks decode independently
+DECODE_CHUNK_CHARS = 4 * 64 * 1024
+
+
+class MediaSpooler:
+    """
+    Decodes inline base64 media (``webhook_base64=True``) to temporary files.
+    
+    Payloads whose base64 text is at least ``threshold`` characters long are
+    decoded chunk by chunk into a file and removed from the webhook data,
+    so the string can be freed as soon as parsing finishes. Smaller
+    payloads are left inline.
+    """
+    
+    def __init__(
+        self,
+        threshold: int = 1024 * 1024,
+        directory: Optional[str] = None,
+        delete: bool = True
+    ):
+        """
+        Initialize spooler.
+        
+        Args:
+            threshold: Minimum base64 length, in characters, spilled to disk (default: 1 MiB)
+            directory: Directory for temporary files (default: the system temp directory)
+            delete: Remove files when their MediaHandle is garbage collected (default: True)
+        """
+        self.threshold = threshold
+        self.directory = directory
+        self.delete = delete
+    
+    def spill(
+        self,
+        message: Dict[str, Any],
+        mime_type: Optional[str] = None
+    ) -> Optional[MediaHandle]:
+        """
+        Move a message's inline base64 media to a temporary file.
+        
+        Args:
+            message: The ``message`` dict of a messages.upsert payload; its
+                ``base64`` key is removed when the media is spilled
+            mime_type: MIME type recorded on the handle
+        
+        Returns:
+            MediaHandle, or None if there is no inline media, it is below the
+            threshold, or its base64 text is malformed (it is then left inline)
+        """
+        encoded = message.get("base64")
+        if not isinstance(encoded, str) or len(encoded) < self.threshold:
+            return None
+        
+        # Tolerate data URIs ("data:video/mp4;base64,....")
+        start = encoded.find(",", 0, 256) + 1 if encoded.startswith("data:") else 0
+        
+        fd, path = tempfile.mkstemp(prefix="whatsapi-media-", dir=self.directory)
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for offset in range(start, len(encoded), DECODE_CHUNK_CHARS):
+                    chunk = binascii.a2b_base64(encoded[offset:offset + DECODE_CHUNK_CHARS])
+                    file.write(chunk)
+                    size += len(chunk)
+        except binascii.Error as e:
+            # Keep the message; only the spooling is skipped
+            os.unlink(path)
+            logger.warning(f"Inline media left unspooled, malformed base64: {e}")
+            return None
+        except BaseException:
+            os.unlink(path)
+            raise
+        
+        del message["base64"]
+        return MediaHandle(path, size, mime_type, delete=self.delete)
@@ -0,0 +1,259 @@
+"""Asynchronous webhook ingestion with a bounded queue and worker pool"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from types import TracebackType
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Type, Union
+from ..models.message import WhatsAppMessage
+from .handler import WebhookHandler, ParseStats, WebhookSource
+from .dedup import Deduplicator
+from .media import MediaSpooler
+
+logger = logging.getLogger(__name__)
+
+MessageCallback = Callable[[WhatsAppMessage], Union[Awaitable[Any], Any]]
+
+
+class Backpressure(str, Enum):
+    """What submit() does when the queue is full"""
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    REJECT = "reject"
+
+
+class WebhookQueueFullError(Exception):
+    """Raised by submit() when the queue is full and backpressure is REJECT"""
+    pass
+
+
+@dataclass
+class PipelineStats:
+    """Ingestion counters; lag is the time from submit() until a worker picks an event up"""
+    received: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    dispatched: int = 0
+    handler_errors: int = 0
+    worker_errors: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+    dequeued: int = 0
+    
+    @property
+    def average_lag(self) -> float:
+        """Average seconds an event waited before a worker picked it up"""
+        return self.total_lag / self.dequeued if self.dequeued else 0.0
+
+
+class WebhookPipeline:
+    """
+    Fast-ack webhook intake backed by a bounded queue and a worker pool.
+    
+    The HTTP endpoint only calls ``submit()`` with the request body and
+    answers immediately; workers decode, parse and hand each message to the
+    callback. When the queue is full, ``backpressure`` decides whether
+    ``submit()`` waits (BLOCK), evicts the oldest queued event (DROP_OLDEST)
+    or raises WebhookQueueFullError (REJECT) so the endpoint can answer 503
+    and let Evolution API redeliver later.
+    
+    Example:
+        pipeline = WebhookPipeline(on_message, workers=8, maxsize=5000)
+        await pipeline.start()
+        ...
+        await pipeline.submit(await request.read())
+    """
+    
+    def __init__(
+        self,
+        callback: MessageCallback,
+        workers: int = 4,
+        maxsize: int = 1000,
+        backpressure: Union[Backpressure, str] = Backpressure.BLOCK,
+        deduplicator: Optional[Deduplicator] = None,
+        media_spooler: Optional[MediaSpooler] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize pipeline.
+        
+        Args:
+            callback: Function or coroutine function called with each WhatsAppMessage
+            workers: Number of concurrent workers (default: 4)
+            maxsize: Maximum number of queued events (default: 1000)
+            backpressure: Behavior when the queue is full (default: BLOCK)
+            deduplicator: Optional Deduplicator for redelivered messages
+            media_spooler: Optional MediaSpooler moving large inline base64 media to disk
+            clock: Monotonic clock function used for lag (default: time.monotonic)
+        
+        Raises:
+            ValueError: If workers or maxsize is less than 1, or backpressure is unknown
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.callback = callback
+        self.workers = workers
+        self.maxsize = maxsize
+        self.backpressure = Backpressure(backpressure)
+        self.deduplicator = deduplicator
+        self.media_spooler = media_spooler
+        self.stats = PipelineStats()
+        self.parse_stats = ParseStats()
+        self._clock = clock
+        self._queue: Optional["asyncio.Queue[Tuple[float, WebhookSource]]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+    
+    async def __aenter__(self) -> "WebhookPipeline":
+        """Context manager entry"""
+        await self.start()
+        return self
+    
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        """Context manager exit"""
+        await self.stop()
+    
+    def _get_queue(self) -> "asyncio.Queue[Tuple[float, WebhookSource]]":
+        """Create the queue lazily so it binds to the running event loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.maxsize)
+        return self._queue
+    
+    @property
+    def depth(self) -> int:
+        """Number of events waiting in the queue"""
+        return self._queue.qsize() if self._queue is not None else 0
+    
+    @property
+    def running(self) -> bool:
+        """Whether workers are running"""
+        return bool(self._tasks)
+    
+    async def start(self) -> None:
+        """
+        Start the worker pool. Events submitted earlier are processed now.
+        """
+        if self._tasks:
+            return
+        queue = self._get_queue()
+        self._tasks = [
+            asyncio.ensure_future(self._worker(queue)) for _ in range(self.workers)
+        ]
+        logger.info(f"Webhook pipeline started with {self.workers} workers")
+    
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the worker pool.
+        
+        Args:
+            drain: Process queued events before stopping (default: True);
+                if False, queued events are discarded and join() returns;
+                submit() calls still blocked on a full queue then enqueue
+                their event for the next start()
+        """
+        if drain and self._tasks and self._queue is not None:
+            await self._queue.join()
+        
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if not drain and self._queue is not None:
+            # Keep the queue: join() and blocked submit() calls are waiting on it
+            queue = self._queue
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+                self.stats.dropped += 1
+        logger.info("Webhook pipeline stopped")
+    
+    async def join(self) -> None:
+        """
+        Wait until every submitted event has been processed.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def submit(self, webhook: WebhookSource) -> None:
+        """
+        Enqueue a webhook for processing without parsing it.
+        
+        Args:
+            webhook: Decoded webhook dict or raw (NDJSON) request body
+        
+        Raises:
+            WebhookQueueFullError: If the queue is full and backpressure is REJECT
+        """
+        queue = self._get_queue()
+        item = (self._clock(), webhook)
+        if queue.full():
+            if self.backpressure is Backpressure.REJECT:
+                self.stats.rejected += 1
+                raise WebhookQueueFullError(
+                    f"Webhook queue full ({self.maxsize} events waiting)"
+                )
+            if self.backpressure is Backpressure.BLOCK:
+                await queue.put(item)
+                self.stats.received += 1
+                return
+            queue.get_nowait()
+            queue.task_done()
+            self.stats.dropped += 1
+            logger.debug("Webhook queue full, dropped oldest event")
+        
+        queue.put_nowait(item)
+        self.stats.received += 1
+    
+    async def _worker(self, queue: "asyncio.Queue[Tuple[float, WebhookSource]]") -> None:
+        """Take events off the queue, parse them and dispatch messages"""
+        stats = self.stats
+        while True:
+            enqueued_at, webhook = await queue.get()
+            try:
+                lag = self._clock() - enqueued_at
+                stats.dequeued += 1
+                stats.last_lag = lag
+                stats.total_lag += lag
+                if lag > stats.max_lag:
+                    stats.max_lag = lag
+                
+                for webhook_data in WebhookHandler._iter_documents(webhook, self.parse_stats):
+                    for message in WebhookHandler._parse_quiet(
+                        webhook_data, self.parse_stats, self.deduplicator, self.media_spooler
+                    ):
+                        await self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # One bad event must not take down the worker and stall submit()
+                stats.worker_errors += 1
+                logger.error(f"Webhook worker failed on an event: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+    
+    async def _dispatch(self, message: WhatsAppMessage) -> None:
+        """Run the callback for one message, logging its errors"""
+        try:
+            result = self.callback(message)
+            if inspect.isawaitable(result):
+                await result
+            self.stats.dispatched += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats.handler_errors += 1
+            logger.error(
+                f"Webhook callback failed for message {message.message_id}: {e}",
+                exc_info=True
+            )
@@ -0,0 +1,149 @@
+"""Event-name prefilter for raw webhook bodies"""
+
+import re
+from typing import Dict, FrozenSet, Optional, Union
+
+from ..models.events import EVENT_NAMES, WebhookEvent
+
+# Evolution writes "event" as the first key; only this many leading bytes are searched
+PEEK_WINDOW = 256
+
+# Evolution (compact) and json.dumps (spaced) bodies start like this; others need the regex
+_PREFIXES = (b'{"event":"', b'{"event": "')
+
+_EVENT = re.compile(rb'"event"\s*:\s*"([^"\\]{1,64})"')
+
+RawBody = Union[bytes, bytearray, memoryview, str]
+
+
+def as_bytes(body: RawBody) -> bytes:
+    """Raw body as bytes, the one type the prefilter and the decoders work on"""
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode()
+    return bytes(body)
+
+
+def peek_event(body: RawBody, start: int = 0, end: Optional[int] = None) -> Optional[str]:
+    """
+    Read the event name of a raw webhook body without decoding the JSON.
+    
+    Only the first ``PEEK_WINDOW`` bytes after ``start`` are searched, so the
+    cost does not depend on the body size (large inline media included).
+    
+    Args:
+        body: Raw webhook JSON
+        start: Byte offset where the document starts (e.g. an NDJSON line); str bodies
+            are encoded as UTF-8 first
+        end: Byte offset where the document ends (default: end of body)
+    
+    Returns:
+        Event name as written in the body (either spelling), or None if not found
+    """
+    name = _peek_raw(as_bytes(body), start, end)
+    return None if name is None else name.decode("latin-1")
+
+
+def _peek_raw(body: bytes, start: int, end: Optional[int]) -> Optional[bytes]:
+    """Event name slice of the body, not decoded and possibly containing escapes"""
+    stop = start + PEEK_WINDOW
+    if end is not None and end < stop:
+        stop = end
+    for prefix in _PREFIXES:
+        if body.startswith(prefix, start):
+            name_start = start + len(prefix)
+            name_end = body.find(b'"', name_start, stop)
+            if name_end != -1:
+                return body[name_start:name_end]
+            break
+    match = _EVENT.search(body, start, stop)
+    return match.group(1) if match else None
+
+
+class Subscription:
+    """
+    Set of accepted webhook events, checked by name.
+    
+    ``rejects()`` inspects raw bytes before any JSON decoding, so bodies of
+    unwanted events cost a prefix check instead of a full decode.
+    Use ``Subscription.of()`` to share instances per mask.
+    """
+    
+    __slots__ = ("events", "names", "_byte_names", "_byte_rejects")
+    
+    def __init__(self, events: WebhookEvent):
+        """
+        Initialize subscription.
+        
+        Args:
+            events: WebhookEvent mask to accept
+        """
+        self.events = events
+        # Both spellings of every accepted event, so names are checked without mapping them
+        self.names: FrozenSet[str] = frozenset(
+            name for name, event in EVENT_NAMES.items() if event in events
+        )
+        self._byte_names = frozenset(name.encode() for name in self.names)
+        # Known events outside the mask, the common case, are rejected with one lookup
+        self._byte_rejects = {
+            name.encode(): name for name in EVENT_NAMES if name not in self.names
+        }
+    
+    @classmethod
+    def of(cls, events: WebhookEvent) -> "Subscription":
+        """
+        Get the shared subscription for a mask.
+        
+        Args:
+            events: WebhookEvent mask to accept
+        
+        Returns:
+            Subscription instance
+        """
+        subscription = _subscriptions.get(events)
+        if subscription is None:
+            subscription = _subscriptions[events] = cls(events)
+        return subscription
+    
+    def accepts(self, name: object) -> bool:
+        """
+        Check a decoded event name.
+        
+        Args:
+            name: Value of the webhook's "event" field
+        
+        Returns:
+            True if the event is subscribed
+        """
+        return isinstance(name, str) and name in self.names
+    
+    def rejects(self, body: bytes, start: int = 0, end: Optional[int] = None) -> Optional[str]:
+        """
+        Check a raw body by its event name, without decoding it.
+        
+        Args:
+            body: Raw webhook JSON (see ``as_bytes()`` for other body types)
+            start: Offset where the document starts
+            end: Offset where the document ends (default: end of body)
+        
+        Returns:
+            The event name if the body can be dropped, or None if it must be decoded
+            (subscribed event, or no event name found up front)
+        """
+        name = _peek_raw(body, start, end)
+        if name is None:
+            return None
+        rejected = self._byte_rejects.get(name)
+        if rejected is not None:
+            return rejected
+        # Escaped names are left for the decoder to interpret
+        if name in self._byte_names or b"\\" in name:
+            return None
+        return name.decode("latin-1")
+    
+    def __repr__(self) -> str:
+        return f"Subscription({self.events!r})"
+
+
+_subscriptions: Dict[WebhookEvent, Subscription] = {}